@@ -1,17 +1,20 @@
 import re
-from langchain_openai import ChatOpenAI
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from app.schemas.evaluation_result_schemas import WholeInterviewEvaluation
+from app.services.evaluation_cache import evaluation_cache, evaluation_key
+from app.utils.llm_client import get_llm
+from app.utils.llm_metrics import llm_metrics, llm_stage
 import json
 
 load_dotenv()
 
-class TextEvaluationService:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.4)
+# Bump whenever EVALUATION_TEMPLATE changes so cached results are not reused
+EVALUATION_PROMPT_VERSION = "1"
 
-    async def evaluate_answer(self, question: str, answer: str) -> dict:
-        prompt = ChatPromptTemplate.from_template("""
+EVALUATION_TEMPLATE = ChatPromptTemplate.from_template("""
         You are an expert interviewer.
         Evaluate the candidate's answer below:
         Question: {question}
@@ -37,26 +40,100 @@ class TextEvaluationService:
             "improvements": [...]
         }}
         """)
-        chain = prompt | self.llm
-        response = await chain.ainvoke({"question": question, "answer": answer})
-        response_text = response.content.strip()
-        response_text = re.sub(r'^```json|```$', '', response_text).strip()
-        try:
-            result = json.loads(response_text)
-        except json.JSONDecodeError:
-            result = {"technical_score": 0, "feedback": "Failed to parse response"}
-
-        # Calculate overall_score from the 4 metrics (1-10 scale)
-        # Convert to 0-100 scale for frontend display
-        try:
-            avg_score = (
-                result.get("technical_score", 0) +
-                result.get("depth_score", 0) +
-                result.get("clarity_score", 0) +
-                result.get("practical_score", 0)
-            ) / 4
-            result["overall_score"] = round(avg_score * 10, 2)  # Convert 1-10 to 0-100
-        except Exception as e:
-            result["overall_score"] = 0
 
+INTERVIEW_EVALUATION_TEMPLATE = ChatPromptTemplate.from_template("""
+        You are an expert interviewer.
+        Evaluate every answer of the interview below. Questions are numbered.
+
+        {transcript}
+
+        For each question, rate the following from 1–10:
+        - Technical correctness
+        - Depth of knowledge
+        - Clarity of explanation
+        - Practical understanding
+        and give 2–3 sentences of constructive feedback with the answer's strengths and improvements.
+        Return exactly one entry per question, using the question's number.
+
+        Then summarize, across the whole interview, the candidate's strengths,
+        their improvement areas and the overall feedback, each as a short paragraph.
+        """)
+
+
+def overall_score(result: dict) -> float:
+    """Average of the 4 metrics (1-10 scale), converted to 0-100 for frontend display"""
+    try:
+        avg_score = (
+            result.get("technical_score", 0) +
+            result.get("depth_score", 0) +
+            result.get("clarity_score", 0) +
+            result.get("practical_score", 0)
+        ) / 4
+        return round(avg_score * 10, 2)
+    except Exception:
+        return 0
+
+
+class TextEvaluationService:
+    def __init__(self):
+        self.llm = get_llm("evaluator")
+
+    async def evaluate_answer(self, question: str, answer: str) -> dict:
+        # Identical question/answer pairs are served from the evaluation cache
+        key = evaluation_key(self.llm.model_name, EVALUATION_PROMPT_VERSION, question, answer)
+        cached = await evaluation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        chain = EVALUATION_TEMPLATE | self.llm
+        with llm_stage("answer_evaluation"):
+            response = await chain.ainvoke({"question": question, "answer": answer})
+            response_text = response.content.strip()
+            response_text = re.sub(r'^```json|```$', '', response_text).strip()
+            try:
+                result = json.loads(response_text)
+                parsed = True
+            except json.JSONDecodeError as e:
+                llm_metrics.record_parse_failure(self.llm.llm_role, self.llm.model_name, str(e))
+                result = {"technical_score": 0, "feedback": "Failed to parse response"}
+                parsed = False
+
+        result["overall_score"] = overall_score(result)
+        # Parse failures are retried on the next evaluation instead of cached
+        if parsed:
+            await evaluation_cache.set(key, result, self.llm.model_name, EVALUATION_PROMPT_VERSION)
         return result
+
+    async def evaluate_interview(self, qa_pairs: list) -> WholeInterviewEvaluation:
+        """
+        Evaluate all answers of an interview in a single request.
+
+        Args:
+            qa_pairs: (question, answer) tuples in interview order
+
+        Returns:
+            The validated evaluation
+
+        Raises:
+            ValueError: If the response does not cover exactly the given questions
+        """
+        transcript = "\n\n".join(
+            f"Question {i}: {question}\nAnswer {i}: {answer}"
+            for i, (question, answer) in enumerate(qa_pairs, start=1)
+        )
+        chain = INTERVIEW_EVALUATION_TEMPLATE | self.llm.with_structured_output(
+            WholeInterviewEvaluation, method="json_schema"
+        )
+        with llm_stage("interview_evaluation"):
+            try:
+                evaluation = await chain.ainvoke({"transcript": transcript})
+            except (OutputParserException, ValidationError) as e:
+                llm_metrics.record_parse_failure(self.llm.llm_role, self.llm.model_name, str(e))
+                raise
+
+            numbers = [q.question_number for q in evaluation.questions]
+            if numbers != list(range(1, len(qa_pairs) + 1)):
+                llm_metrics.record_parse_failure(self.llm.llm_role, self.llm.model_name,
+                                                 f"question numbers {numbers}")
+                raise ValueError(f"Expected {len(qa_pairs)} question evaluations in order, got {numbers}")
+        return evaluation
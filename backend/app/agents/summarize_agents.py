@@ -1,33 +1,83 @@
 import re
-from langchain_openai import ChatOpenAI
+from langchain_core.exceptions import OutputParserException
 from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from app.schemas.evaluation_result_schemas import EvaluationSummary
+from app.utils.llm_client import get_llm
+from app.utils.llm_metrics import llm_metrics, llm_stage
 import json
 
+# Bump whenever a summary template changes so stored summaries are not reused
+SUMMARY_PROMPT_VERSION = "1"
+
+NO_STRENGTHS = "No specific strengths identified."
+NO_IMPROVEMENTS = "No major improvement areas noted."
+NO_FEEDBACK = "No specific feedback provided."
+
+STRENGTHS_TEMPLATE = ChatPromptTemplate.from_template(
+    "Summarize the following candidate strengths into a short paragraph:\n\n{points}"
+)
+IMPROVEMENTS_TEMPLATE = ChatPromptTemplate.from_template(
+    "Summarize the following improvement areas into a short paragraph:\n\n{points}"
+)
+FEEDBACK_TEMPLATE = ChatPromptTemplate.from_template(
+    "Summarize the following detailed feedback into a concise evaluation summary:\n\n{feedbacks}"
+)
+COMBINED_TEMPLATE = ChatPromptTemplate.from_template(
+    "Summarize an interview evaluation.\n"
+    "strengths: the candidate strengths below, as a short paragraph.\n"
+    "improvement_areas: the improvement areas below, as a short paragraph.\n"
+    "combined_feedback: the detailed feedback below, as a concise evaluation summary.\n\n"
+    "Strengths:\n{strengths}\n\nImprovement areas:\n{improvements}\n\nFeedback:\n{feedbacks}"
+)
+
 class SummaryService:
-    def __init__(self, model="gpt-4o-mini"):
-        self.llm = ChatOpenAI(model=model, temperature=0.5)
+    def __init__(self, model=None):
+        self.llm = get_llm("summarizer", model)
 
     async def summarize_strengths(self, strengths: list) -> str:
         if not strengths:
-            return "No specific strengths identified."
-        prompt = ChatPromptTemplate.from_template(
-            "Summarize the following candidate strengths into a short paragraph:\n\n{points}"
-        )
-        return (await self.llm.ainvoke(prompt.format(points='\n'.join(strengths)))).content
+            return NO_STRENGTHS
+        with llm_stage("strengths_summary"):
+            return (await self.llm.ainvoke(STRENGTHS_TEMPLATE.format(points='\n'.join(strengths)))).content
 
     async def summarize_improvements(self, improvements: list) -> str:
         if not improvements:
-            return "No major improvement areas noted."
-        prompt = ChatPromptTemplate.from_template(
-            "Summarize the following improvement areas into a short paragraph:\n\n{points}"
-        )
-        return (await self.llm.ainvoke(prompt.format(points='\n'.join(improvements)))).content
+            return NO_IMPROVEMENTS
+        with llm_stage("improvements_summary"):
+            return (await self.llm.ainvoke(IMPROVEMENTS_TEMPLATE.format(points='\n'.join(improvements)))).content
 
     async def summarize_feedback(self, feedbacks: str) -> str:
         if not feedbacks:
-            return "No specific feedback provided."
-        prompt = ChatPromptTemplate.from_template(
-            "Summarize the following detailed feedback into a concise evaluation summary:\n\n{feedbacks}"
-        )
-        return (await self.llm.ainvoke(prompt.format(feedbacks=feedbacks))).content
+            return NO_FEEDBACK
+        with llm_stage("feedback_summary"):
+            return (await self.llm.ainvoke(FEEDBACK_TEMPLATE.format(feedbacks=feedbacks))).content
+
+    async def summarize_all(self, strengths: list, improvements: list, feedbacks: str) -> dict:
+        """
+        Produce all three summaries in one structured call.
+
+        Returns:
+            Dict with strengths, improvement_areas and combined_feedback
+        """
+        chain = COMBINED_TEMPLATE | self.llm.with_structured_output(EvaluationSummary, method="json_schema")
+        with llm_stage("combined_summary"):
+            try:
+                summary = await chain.ainvoke({
+                    "strengths": '\n'.join(strengths) or "(none)",
+                    "improvements": '\n'.join(improvements) or "(none)",
+                    "feedbacks": feedbacks or "(none)"
+                })
+            except (OutputParserException, ValidationError) as e:
+                llm_metrics.record_parse_failure(self.llm.llm_role, self.llm.model_name, str(e))
+                raise
+        result = summary.model_dump()
+        # Empty inputs get the same fixed text as the per-summary methods
+        if not strengths:
+            result["strengths"] = NO_STRENGTHS
+        if not improvements:
+            result["improvement_areas"] = NO_IMPROVEMENTS
+        if not feedbacks:
+            result["combined_feedback"] = NO_FEEDBACK
+        return result
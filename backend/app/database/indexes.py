@@ -0,0 +1,168 @@
+"""
+Index registry and query-plan check.
+
+INDEXES declares every index the application relies on. ensure_indexes()
+applies it at startup (connect_to_mongo); creating an index that already
+exists with the same options is a no-op, so this is safe on every start and
+from every process. A changed TTL (expireAfterSeconds) is applied to the
+existing index with collMod. Each index is created on its own, so one that
+cannot be built (e.g. a unique index over existing duplicates) does not
+prevent the others; it is logged and reported as missing by
+check_query_plans().
+
+CANONICAL_QUERIES are the filters of the service layer's hot queries.
+check_query_plans() runs `explain` on each and reports the ones whose winning
+plan scans a whole collection, along with registry indexes that are missing
+or differ in their options (GET /debug/query-plans,
+scripts/check_query_plans.py).
+"""
+
+import logging
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from app.models.evaluation_job_model import EvaluationJobModel
+from app.services.evaluation_cache import EVALUATION_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Server error code for an existing index with the same name and other options
+INDEX_OPTIONS_CONFLICT = 85
+# Options compared between the registry and the existing indexes
+CHECKED_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression")
+
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING)]),
+        IndexModel([("role", ASCENDING)]),
+    ],
+    "interviews": [
+        IndexModel([("employee_ids", ASCENDING)]),
+        IndexModel([("manager_id", ASCENDING)]),
+        IndexModel([("interview_id", ASCENDING)]),
+    ],
+    "conversations": [
+        # Also serves the positional turn updates, which filter on these first
+        IndexModel([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+    ],
+    "evaluation_results": [
+        IndexModel([("interview_id", ASCENDING)], unique=True),
+    ],
+    EvaluationJobModel.collection_name: [
+        IndexModel([("status", ASCENDING), ("available_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+        # One active (queued or leased) job per interview and user
+        IndexModel([("interview_id", ASCENDING), ("user_id", ASCENDING)], unique=True,
+                   partialFilterExpression={"active": True}, name="interview_id_user_id_active_unique"),
+    ],
+    "evaluation_cache": [
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=EVALUATION_CACHE_TTL_SECONDS),
+        IndexModel([("last_used_at", ASCENDING)]),
+    ],
+}
+
+# (name, collection, filter) of the hot queries; values are placeholders
+CANONICAL_QUERIES = [
+    ("login_user", "users", {"email": "user@example.com"}),
+    ("create_user", "users", {"$or": [{"user_id": "user"}, {"email": "user@example.com"}]}),
+    ("get_all_employees", "users", {"role": "employee"}),
+    ("get_employee_interviews", "interviews", {"employee_ids": ObjectId()}),
+    ("get_manager_interviews", "interviews", {"manager_id": ObjectId()}),
+    ("interview_by_interview_id", "interviews", {"interview_id": "interview"}),
+    ("conversation", "conversations", {"interview_id": "interview", "user_id": "user"}),
+    ("conversation_by_interview", "conversations", {"interview_id": "interview"}),
+    ("pending_turn_update", "conversations",
+     {"interview_id": "interview", "user_id": "user", "conversation.answer_transcript": ""}),
+    ("turn_result_update", "conversations",
+     {"interview_id": "interview", "user_id": "user", "conversation.turn_id": "turn"}),
+    ("evaluation_result", "evaluation_results", {"interview_id": "interview"}),
+    ("enqueue_evaluation_job", EvaluationJobModel.collection_name,
+     {"interview_id": "interview", "user_id": "user", "active": True}),
+    ("acquire_evaluation_job", EvaluationJobModel.collection_name,
+     {"$or": [{"status": EvaluationJobModel.QUEUED, "available_at": {"$lte": datetime.utcnow()}},
+              {"status": EvaluationJobModel.LEASED, "lease_expires_at": {"$lte": datetime.utcnow()}}]}),
+]
+
+
+async def ensure_indexes(db):
+    """Create every index in INDEXES that does not exist yet."""
+    for collection_name, indexes in INDEXES.items():
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                await db[collection_name].create_indexes([index])
+            except OperationFailure as e:
+                if e.code == INDEX_OPTIONS_CONFLICT and "expireAfterSeconds" in index.document:
+                    await _update_ttl(db, collection_name, name, index.document["expireAfterSeconds"])
+                else:
+                    logger.error(f"Could not create index {name} on {collection_name}: {e}")
+    logger.info("MongoDB indexes ensured")
+
+
+async def _update_ttl(db, collection_name: str, name: str, seconds: int):
+    """Change the expiry of an existing TTL index in place."""
+    try:
+        await db.command({"collMod": collection_name, "index": {"name": name, "expireAfterSeconds": seconds}})
+        logger.info(f"Updated TTL of index {name} on {collection_name} to {seconds}s")
+    except OperationFailure as e:
+        logger.error(f"Could not update TTL of index {name} on {collection_name}: {e}")
+
+
+def _index_differs(existing: dict | None, spec: dict) -> bool:
+    """Whether an existing index (index_information() entry) does not match its registry spec."""
+    return existing is None or any(existing.get(option) != spec.get(option) for option in CHECKED_OPTIONS)
+
+
+async def missing_indexes(db) -> list:
+    """Registry indexes that do not exist, or exist with other unique, TTL or partial options."""
+    missing = []
+    for collection_name, indexes in INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for index in indexes:
+            if _index_differs(existing.get(index.document["name"]), index.document):
+                missing.append(f"{collection_name}.{index.document['name']}")
+    return missing
+
+
+def _plan_stages(plan) -> list:
+    """Every stage name in an explain plan tree, including per-shard plans."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def check_query_plans(db) -> dict:
+    """
+    Explain every canonical query.
+
+    Returns:
+        Dict with one entry per query (collection, winning plan stages and
+        whether it scans the whole collection), the names of the queries
+        that do, and the registry indexes that are missing or differ
+    """
+    queries = []
+    for name, collection_name, query in CANONICAL_QUERIES:
+        explain = await db.command(
+            {"explain": {"find": collection_name, "filter": query}, "verbosity": "queryPlanner"}
+        )
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        queries.append({
+            "name": name,
+            "collection": collection_name,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages
+        })
+    return {
+        "queries": queries,
+        "collscans": [query["name"] for query in queries if query["collscan"]],
+        "missing_indexes": await missing_indexes(db)
+    }
@@ -16,6 +16,10 @@ async def connect_to_mongo():
 
         logger.info(f"Successfully connected to MongoDB")
 
+        # Imported here: the registry pulls in modules that import this one
+        from app.database.indexes import ensure_indexes
+        await ensure_indexes(get_database())
+
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {str(e)}")
         raise
@@ -7,6 +7,9 @@ from app.routers.interview_eval import eval_router
 from app.routers.interview_router import router as interview_router
 from app.database.mongo_db import connect_to_mongo, close_mongo_connection
 from app.core.config import settings
+from app.utils.executors import shutdown_executors
+from app.utils.llm_client import warm_up_llm_clients, close_llm_clients
+from app.tasks.evaluation_worker import start_in_process_worker, stop_in_process_worker
 import logging
 import os
 
@@ -34,10 +37,15 @@ if os.path.exists("audios"):
 @app.on_event("startup")
 async def startup_db_client():
     await connect_to_mongo()
+    await warm_up_llm_clients()
+    await start_in_process_worker()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await stop_in_process_worker()
     await close_mongo_connection()
+    shutdown_executors()
+    await close_llm_clients()
 
 app.include_router(user_router, prefix="/users", tags=["Users"])
 app.include_router(interview_routes_router, prefix="/interviews", tags=["Interviews"])
@@ -74,6 +82,18 @@ async def health():
             "error": str(e)
         }
 
+@app.get("/metrics/llm")
+async def llm_call_metrics():
+    """LLM call latency, tokens, cost and failures, scheduler queues and evaluation cache of this process"""
+    from app.services.evaluation_cache import evaluation_cache
+    from app.utils.llm_metrics import llm_metrics
+    from app.utils.llm_scheduler import llm_scheduler
+    return {
+        "calls": llm_metrics.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "evaluation_cache": evaluation_cache.stats()
+    }
+
 @app.get("/debug/all-interviews")
 async def debug_all_interviews():
     """Debug endpoint to list all interviews"""
@@ -97,4 +117,11 @@ async def debug_all_interviews():
         return {
             "error": str(e),
             "type": type(e).__name__
-        }
\ No newline at end of file
+        }
+
+@app.get("/debug/query-plans")
+async def debug_query_plans():
+    """Explain the service layer's hot queries and list any that scan a whole collection"""
+    from app.database.indexes import check_query_plans
+    from app.database.mongo_db import get_database
+    return await check_query_plans(get_database())
@@ -0,0 +1,76 @@
+"""
+Evaluation Job Model
+
+A queued request to evaluate one interview of one user. Jobs live in the
+`evaluation_jobs` collection and are leased by evaluation workers, so they
+survive API restarts and can be processed outside the API process.
+"""
+
+from datetime import datetime
+from typing import Dict, Any
+
+
+class EvaluationJobModel:
+    """
+    Represents an evaluation job stored in the database.
+
+    Structure:
+    {
+        "_id": ObjectId,
+        "interview_id": str,
+        "user_id": str,
+        "status": "queued" | "leased" | "completed" | "dead",
+        "active": True,              # only while queued or leased; unique per
+                                     # (interview_id, user_id) via a partial index
+        "attempts": int,             # leases taken so far
+        "max_attempts": int,
+        "reuse_turn_results": bool,  # False re-scores turns scored during the interview
+        "available_at": datetime,    # not leased before this time (backoff)
+        "lease_expires_at": datetime | None,
+        "worker_id": str | None,     # holder of the current lease
+        "last_error": str | None,
+        "created_at": datetime,
+        "updated_at": datetime
+    }
+
+    A leased job whose lease expires (the worker crashed or hung) is picked up
+    again by another worker. A job that fails max_attempts times is moved to
+    the "dead" status (dead-lettered) and no longer retried.
+    """
+
+    collection_name = "evaluation_jobs"
+
+    QUEUED = "queued"
+    LEASED = "leased"
+    COMPLETED = "completed"
+    DEAD = "dead"
+
+    @staticmethod
+    def create_document(interview_id: str, user_id: str, max_attempts: int) -> Dict[str, Any]:
+        """
+        Create a queued evaluation job document.
+
+        Args:
+            interview_id: The interview ID
+            user_id: The user ID
+            max_attempts: Attempts before the job is dead-lettered
+
+        Returns:
+            Dictionary ready for MongoDB insertion
+        """
+        now = datetime.utcnow()
+
+        return {
+            "interview_id": interview_id,
+            "user_id": user_id,
+            "status": EvaluationJobModel.QUEUED,
+            "active": True,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "available_at": now,
+            "lease_expires_at": None,
+            "worker_id": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now
+        }
@@ -58,8 +58,13 @@ class EvaluationResultModel:
                 "combined_feedback": "..."
             }
         },
-        "error": None | str  # If evaluation failed
+        "error": None | str,  # If evaluation failed
+        "lease_owner": None | str,  # Evaluation currently computing this result
+        "lease_expires_at": None | datetime
     }
+
+    There is one document per interview; concurrent evaluations coordinate
+    through the lease fields (see app.services.evaluation_runner).
     """
 
     collection_name = "evaluation_results"
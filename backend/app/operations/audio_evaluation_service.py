@@ -1,13 +1,46 @@
+"""
+Audio analysis of interview answers.
+
+Features are computed with NumPy on 20 ms frames of 16 kHz mono audio: RMS
+energy, zero-crossing rate, the fraction of voiced frames, the share of the
+answer spent pausing, and a speech rate estimated from syllable-like peaks of
+the energy envelope. Long answers are processed in fixed-size blocks, so
+memory stays bounded no matter how long the recording is (the int16 sidecar
+is memory-mapped and only one block is converted to float at a time).
+
+Analysis is CPU-bound and runs in the background analysis process pool; use
+analyze_audio_file / analyze_audio_files as the worker entry points.
+"""
+
 import librosa
 import numpy as np
 import os
 import logging
+from app.utils.audio_ingest import SAMPLE_RATE, load_sidecar, pcm16_to_float
+from app.utils.vad import FRAME_SECONDS, HANGOVER_SECONDS, speech_threshold
 
 logger = logging.getLogger(__name__)
 
+BLOCK_SECONDS = 30
+# Voiced speech has a low zero-crossing rate; fricatives and noise a high one
+VOICED_MAX_ZCR = 0.25
+# Syllable nuclei are at least this far apart
+MIN_SYLLABLE_GAP_SECONDS = 0.1
+SYLLABLES_PER_WORD = 1.5
+# Conversational pace, in words per minute
+NORMAL_PACE_WPM = (110.0, 170.0)
+# RMS level treated as fully confident loudness
+FULL_ENERGY_RMS = 0.1
+
+
 class AudioEvaluationService:
     def analyze_audio(self, file_path: str) -> dict:
         try:
+            # Prefer the PCM sidecar written at ingest: no second ffmpeg decode
+            pcm = load_sidecar(file_path)
+            if pcm is not None:
+                return self.analyze_samples(pcm, SAMPLE_RATE)
+
             # Check if file exists
             if not os.path.exists(file_path):
                 logger.warning(f"Audio file not found: {file_path}")
@@ -17,30 +50,116 @@ class AudioEvaluationService:
                     "status": "file_not_found"
                 }
 
-            # Load audio
-            y, sr = librosa.load(file_path, sr=None)
+            # Load audio (older answers without a sidecar)
+            y, sr = librosa.load(file_path, sr=SAMPLE_RATE)
+            return self.analyze_samples(y, sr)
 
-            # Compute tempo (speech rate)
-            tempo_data = librosa.beat.beat_track(y=y, sr=sr)
-            tempo = float(tempo_data[0]) if isinstance(tempo_data, tuple) else float(tempo_data)
+        except Exception as e:
+            logger.error(f"Error analyzing audio {file_path}: {e}")
+            return {
+                "confidence_score": 0.0,
+                "speech_rate": 0.0,
+                "status": f"error: {str(e)}"
+            }
 
-            # Compute energy (RMS)
-            rms = librosa.feature.rms(y=y)
-            energy = float(np.mean(rms))
+    def frame_features(self, samples: np.ndarray, sr: int) -> tuple:
+        """
+        Per-frame RMS and zero-crossing rate, computed block by block.
 
-            # Simple heuristic for confidence
-            confidence_score = min(10.0, (energy * 20) + (tempo / 30.0))
+        Args:
+            samples: Mono int16 or float32 samples (may be memory-mapped)
+            sr: Sample rate
 
-            return {
-                "confidence_score": round(confidence_score, 2),
-                "speech_rate": round(tempo, 2),
-                "status": "success"
-            }
+        Returns:
+            (rms, zcr) arrays with one value per FRAME_SECONDS frame
+        """
+        frame = int(FRAME_SECONDS * sr)
+        block = frame * int(BLOCK_SECONDS / FRAME_SECONDS)
+        n_frames = len(samples) // frame
+        rms = np.empty(n_frames, dtype=np.float32)
+        zcr = np.empty(n_frames, dtype=np.float32)
 
-        except Exception as e:
-            logger.error(f"Error analyzing audio {file_path}: {e}")
+        for start in range(0, n_frames * frame, block):
+            chunk = np.asarray(samples[start:min(start + block, n_frames * frame)])
+            if chunk.dtype == np.int16:
+                chunk = pcm16_to_float(chunk)
+            frames = chunk.astype(np.float32, copy=False).reshape(-1, frame)
+            first = start // frame
+            rms[first:first + len(frames)] = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+            signs = np.signbit(frames)
+            zcr[first:first + len(frames)] = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame
+
+        return rms, zcr
+
+    def analyze_samples(self, samples: np.ndarray, sr: int) -> dict:
+        """Analyze mono samples already held in memory (or memory-mapped)."""
+        rms, zcr = self.frame_features(samples, sr)
+        if len(rms) == 0:
+            return {"confidence_score": 0.0, "speech_rate": 0.0, "status": "no_audio"}
+
+        # Speech frames: same adaptive threshold as the VAD
+        db = 20.0 * np.log10(rms + 1e-10)
+        speech = db > speech_threshold(db)
+        speech_frames = int(np.count_nonzero(speech))
+        if speech_frames == 0:
             return {
                 "confidence_score": 0.0,
                 "speech_rate": 0.0,
-                "status": f"error: {str(e)}"
+                "energy": 0.0,
+                "pause_ratio": 1.0,
+                "voiced_fraction": 0.0,
+                "zero_crossing_rate": round(float(np.mean(zcr)), 4),
+                "status": "no_speech"
             }
+
+        # Pauses between the first and the last speech frame; gaps shorter
+        # than the VAD hangover are part of fluent speech, not pauses
+        hangover = int(HANGOVER_SECONDS / FRAME_SECONDS)
+        fluent = np.convolve(speech, np.ones(2 * hangover + 1), mode="same") > 0
+        first, last = np.flatnonzero(speech)[[0, -1]]
+        span_frames = last - first + 1
+        pause_ratio = 1.0 - np.count_nonzero(fluent[first:last + 1]) / span_frames
+        voiced_fraction = float(np.count_nonzero(speech & (zcr < VOICED_MAX_ZCR))) / speech_frames
+        energy = float(np.mean(rms[speech]))
+
+        # Speech rate: local maxima of the smoothed envelope inside speech
+        gap = max(1, int(MIN_SYLLABLE_GAP_SECONDS / FRAME_SECONDS))
+        envelope = np.convolve(db, np.ones(gap) / gap, mode="same")
+        peaks = (
+            (envelope[1:-1] > envelope[:-2]) &
+            (envelope[1:-1] >= envelope[2:]) &
+            speech[1:-1]
+        )
+        speaking_minutes = span_frames * FRAME_SECONDS / 60.0
+        speech_rate = np.count_nonzero(peaks) / SYLLABLES_PER_WORD / speaking_minutes
+
+        # Simple heuristic for confidence (0-10): loud, fluent, normally paced
+        low, high = NORMAL_PACE_WPM
+        off_pace = max(low - speech_rate, speech_rate - high, 0.0)
+        pace = max(0.0, 1.0 - off_pace / low)
+        confidence_score = 10.0 * (
+            0.3 * min(1.0, energy / FULL_ENERGY_RMS) +
+            0.4 * (1.0 - pause_ratio) +
+            0.3 * pace
+        )
+
+        return {
+            "confidence_score": round(float(confidence_score), 2),
+            "speech_rate": round(float(speech_rate), 2),
+            "energy": round(energy, 4),
+            "pause_ratio": round(float(pause_ratio), 4),
+            "voiced_fraction": round(voiced_fraction, 4),
+            "zero_crossing_rate": round(float(np.mean(zcr[speech])), 4),
+            "status": "success"
+        }
+
+
+def analyze_audio_file(file_path: str) -> dict:
+    """Module-level entry point for running analysis in a worker process."""
+    return AudioEvaluationService().analyze_audio(file_path)
+
+
+def analyze_audio_files(file_paths: list) -> list:
+    """Analyze several answers in one worker call; results keep the input order."""
+    service = AudioEvaluationService()
+    return [service.analyze_audio(path) for path in file_paths]
@@ -0,0 +1,331 @@
+"""
+Bulk re-evaluation of stored interviews.
+
+Used after an evaluation prompt or model change to re-score many interviews
+(scripts/bulk_reevaluate.py, POST /interview-eval/bulk-re-evaluate).
+Conversations are streamed in _id-ordered batches; when the run is
+restricted to interviews matching a date range, manager or status, the
+matching interviews are streamed in _id-ordered batches instead and their
+conversations fetched per batch. Each interview is evaluated with
+InterviewEvaluationService from scratch (turn results are not reused).
+
+Evaluations are scheduled under a global requests-per-minute and
+tokens-per-minute budget with adaptive concurrency: rate-limit errors halve
+the number of interviews in flight and successes grow it back. Its LLM calls
+also run in the lowest priority class of the process-wide llm_scheduler, so
+live interviews on the same process always go first.
+
+Each interview is evaluated under the evaluation_runner lease of its
+evaluation_results document, so bulk never races a live evaluation: an
+interview leased elsewhere is skipped (that evaluation stores a fresh
+result itself). Results are written with one bulk_write per batch, each
+write conditional on still holding the lease and releasing it. Every
+finished batch is checkpointed in bulk_reevaluation_runs. The run itself
+holds a lease kept alive by a heartbeat, so a run whose process died can be
+resumed after its last completed batch once the lease has expired.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import ReturnDocument, UpdateOne
+from app.operations.evaluation_service import InterviewEvaluationService
+from app.services.evaluation_runner import acquire_lease, keep_lease_alive, lease_active, release_update
+from app.utils.llm_scheduler import BULK, llm_priority
+from app.utils.rate_limit import AdaptiveLimiter, RateBudget
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BULK_REQUESTS_PER_MINUTE = float(os.getenv("BULK_REQUESTS_PER_MINUTE", "300"))
+BULK_TOKENS_PER_MINUTE = float(os.getenv("BULK_TOKENS_PER_MINUTE", "150000"))
+BULK_MAX_CONCURRENCY = int(os.getenv("BULK_MAX_CONCURRENCY", "8"))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "50"))
+BULK_MAX_ATTEMPTS = int(os.getenv("BULK_MAX_ATTEMPTS", "3"))
+BULK_RUN_LEASE_SECONDS = int(os.getenv("BULK_RUN_LEASE_SECONDS", "300"))
+
+RUNS_COLLECTION = "bulk_reevaluation_runs"
+# Failed interview ids kept on the run document
+MAX_RECORDED_FAILURES = 200
+
+# Rough per-call token costs: evaluator prompt and JSON answer, summaries
+PROMPT_OVERHEAD_TOKENS = 350
+EVALUATION_OUTPUT_TOKENS = 300
+SUMMARY_TOKENS_PER_QUESTION = 150
+CHARS_PER_TOKEN = 4
+
+
+def estimate_usage(conversation: list) -> tuple:
+    """
+    Estimated (requests, tokens) to evaluate one interview.
+
+    One evaluator call per question plus three summary calls.
+    """
+    text_chars = sum(len(turn.get("question") or "") + len(turn.get("answer_transcript") or "")
+                     for turn in conversation)
+    questions = len(conversation)
+    tokens = (text_chars / CHARS_PER_TOKEN
+              + questions * (PROMPT_OVERHEAD_TOKENS + EVALUATION_OUTPUT_TOKENS + SUMMARY_TOKENS_PER_QUESTION))
+    return questions + 3, tokens
+
+
+def is_rate_limited(error: str) -> bool:
+    error = (error or "").lower()
+    return "429" in error or "rate limit" in error or "ratelimit" in error
+
+
+def run_active(run: dict | None) -> bool:
+    """Whether a run document is being processed by a live process."""
+    return (run or {}).get("status") == "running" and lease_active(run)
+
+
+def interview_query(filters: dict) -> dict | None:
+    """Interviews collection query for the interview-level filters, or None for all."""
+    query = {}
+    if filters.get("since") or filters.get("until"):
+        # created_at is stored as an ISO string, which sorts chronologically
+        query["created_at"] = {}
+        if filters.get("since"):
+            query["created_at"]["$gte"] = filters["since"].isoformat()
+        if filters.get("until"):
+            query["created_at"]["$lt"] = filters["until"].isoformat()
+    if filters.get("manager_id"):
+        query["manager_id"] = ObjectId(filters["manager_id"])
+    if filters.get("status"):
+        query["status"] = filters["status"]
+    return query or None
+
+
+class BulkReevaluationService:
+    """Re-evaluates every interview matching a filter, resumably."""
+
+    def __init__(self, db, requests_per_minute: float = BULK_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = BULK_TOKENS_PER_MINUTE,
+                 max_concurrency: int = BULK_MAX_CONCURRENCY, batch_size: int = BULK_BATCH_SIZE):
+        self.db = db
+        self.runs = db[RUNS_COLLECTION]
+        self.budget = RateBudget(requests_per_minute, tokens_per_minute)
+        self.limiter = AdaptiveLimiter(initial=max(1, max_concurrency // 2), maximum=max_concurrency)
+        self.batch_size = batch_size
+        self.evaluation_service = InterviewEvaluationService(db)
+
+    async def create_run(self, filters: dict) -> str:
+        """
+        Record a new run and return its id.
+
+        Args:
+            filters: since / until (datetime), manager_id, status; all optional
+        """
+        run_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        await self.runs.insert_one({
+            "_id": run_id,
+            "filters": {key: value for key, value in filters.items() if value is not None},
+            "status": "pending",
+            "last_id": None,
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "skipped": 0,
+            "failed_interviews": [],
+            "created_at": now,
+            "updated_at": now
+        })
+        return run_id
+
+    async def _batches(self, filters: dict, last_id: ObjectId | None):
+        """
+        Yield (conversations, checkpoint id) batches after the last_id checkpoint.
+
+        Without interview-level filters the checkpoint is a conversations _id,
+        otherwise an interviews _id. Each batch is a fresh range query on _id,
+        so no server cursor idles while a batch runs.
+        """
+        projection = {"interview_id": 1, "user_id": 1, "conversation.question": 1,
+                      "conversation.answer_transcript": 1}
+        has_answers = {"conversation.0": {"$exists": True}}
+        query = interview_query(filters)
+        while True:
+            after = {"_id": {"$gt": last_id}} if last_id else {}
+            if query is None:
+                batch = await self.db["conversations"].find(
+                    {**has_answers, **after}, projection
+                ).sort("_id", 1).limit(self.batch_size).to_list(None)
+                if not batch:
+                    return
+                last_id = batch[-1]["_id"]
+            else:
+                interviews = await self.db["interviews"].find(
+                    {**query, **after}, {"interview_id": 1}
+                ).sort("_id", 1).limit(self.batch_size).to_list(None)
+                if not interviews:
+                    return
+                # Conversations reference an interview by _id or by its interview_id field
+                ids = [str(interview["_id"]) for interview in interviews]
+                ids += [interview["interview_id"] for interview in interviews if interview.get("interview_id")]
+                batch = await self.db["conversations"].find(
+                    {**has_answers, "interview_id": {"$in": ids}}, projection
+                ).to_list(None)
+                last_id = interviews[-1]["_id"]
+            yield batch, last_id
+
+    async def run(self, run_id: str) -> dict:
+        """
+        Process a run from its checkpoint to the end.
+
+        Returns:
+            The final run document
+
+        Raises:
+            ValueError: The run does not exist or another live process is running it
+        """
+        owner = uuid.uuid4().hex
+        now = datetime.utcnow()
+        run = await self.runs.find_one_and_update(
+            {"_id": run_id,
+             "$or": [{"status": {"$ne": "running"}}, {"lease_expires_at": None},
+                     {"lease_expires_at": {"$lte": now}}]},
+            {"$set": {"status": "running", "started_at": now, "updated_at": now, "lease_owner": owner,
+                      "lease_expires_at": now + timedelta(seconds=BULK_RUN_LEASE_SECONDS)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if run is None:
+            if await self.runs.find_one({"_id": run_id}) is None:
+                raise ValueError(f"Bulk re-evaluation run {run_id} not found")
+            raise ValueError(f"Bulk re-evaluation run {run_id} is already running")
+
+        heartbeat = asyncio.create_task(self._heartbeat(run_id, owner))
+        try:
+            # Resume after the last checkpointed batch
+            last_id = ObjectId(run["last_id"]) if run.get("last_id") else None
+            async for batch, last_id in self._batches(run["filters"], last_id):
+                await self._process_batch(run_id, owner, batch, last_id)
+
+            await self._update_run(run_id, owner, {"status": "completed", "finished_at": datetime.utcnow()})
+        except asyncio.CancelledError:
+            await self._update_run(run_id, owner, {"status": "interrupted"})
+            raise
+        except Exception as e:
+            logger.error(f"Bulk re-evaluation run {run_id} failed: {e}", exc_info=True)
+            await self._update_run(run_id, owner, {"status": "failed", "error": str(e)})
+        finally:
+            heartbeat.cancel()
+
+        return await self.runs.find_one({"_id": run_id})
+
+    async def _heartbeat(self, run_id: str, owner: str):
+        while True:
+            await asyncio.sleep(max(1.0, BULK_RUN_LEASE_SECONDS / 3))
+            await self.runs.update_one(
+                {"_id": run_id, "lease_owner": owner},
+                {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=BULK_RUN_LEASE_SECONDS)}}
+            )
+
+    async def _process_batch(self, run_id: str, owner: str, batch: list, last_id: ObjectId):
+        outcomes = await asyncio.gather(*(self._evaluate_leased(doc) for doc in batch))
+
+        operations = [operation for _, operation in outcomes if operation is not None]
+        if operations:
+            await self.db["evaluation_results"].bulk_write(operations, ordered=False)
+
+        counts = {outcome: sum(1 for o, _ in outcomes if o == outcome) for outcome in ("succeeded", "failed", "skipped")}
+        failures = [doc["interview_id"] for doc, (outcome, _) in zip(batch, outcomes) if outcome == "failed"]
+        # Checkpoint only after the batch's results are stored
+        checkpoint = await self.runs.update_one(
+            {"_id": run_id, "lease_owner": owner},
+            {"$set": {"last_id": str(last_id), "updated_at": datetime.utcnow(),
+                      "concurrency": self.limiter.limit},
+             "$inc": {"processed": len(batch), **counts},
+             "$push": {"failed_interviews": {"$each": failures, "$slice": -MAX_RECORDED_FAILURES}}}
+        )
+        if checkpoint.matched_count == 0:
+            raise RuntimeError(f"Lost the lease of bulk re-evaluation run {run_id} to another process")
+        logger.info(f"Bulk run {run_id}: batch of {len(batch)} done, {counts['failed']} failed, "
+                    f"{counts['skipped']} skipped, concurrency {self.limiter.limit}")
+
+    async def _evaluate_leased(self, doc: dict) -> tuple:
+        """
+        Evaluate one interview while holding its evaluation lease, retrying
+        throttled attempts.
+
+        The lease is taken only once the limiter and the budget let the
+        first attempt start, so queued interviews don't show up as in
+        progress. A failed re-evaluation keeps a previously completed result.
+
+        Returns:
+            ("succeeded" | "failed" | "skipped", UpdateOne storing the outcome
+            and releasing the lease, or None when skipped)
+        """
+        interview_id = doc["interview_id"]
+        requests, tokens = estimate_usage(doc.get("conversation", []))
+        owner = uuid.uuid4().hex
+        previous = None
+        heartbeat = None
+        result, error = None, None
+        try:
+            for attempt in range(1, BULK_MAX_ATTEMPTS + 1):
+                async with self.limiter:
+                    await self.budget.acquire(requests, tokens)
+                    if previous is None:
+                        previous = await acquire_lease(interview_id, doc.get("user_id"), owner)
+                        if previous is None:
+                            logger.info(f"Interview {interview_id} is being evaluated elsewhere; skipped")
+                            return "skipped", None
+                        heartbeat = asyncio.create_task(keep_lease_alive(interview_id, owner))
+                    result, error = await self._evaluate(interview_id)
+
+                if error is None:
+                    await self.limiter.on_success()
+                    break
+                result = None
+                if not is_rate_limited(error):
+                    break
+                await self.limiter.on_throttle()
+                logger.warning(f"Rate limited evaluating interview {interview_id} (attempt {attempt}); "
+                               f"concurrency now {self.limiter.limit}")
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+        if result is not None:
+            outcome = "succeeded"
+            fields = {"status": "completed", "interview_result": result["interview_result"], "error": None}
+        else:
+            logger.error(f"Bulk re-evaluation of interview {interview_id} failed: {error}")
+            outcome = "failed"
+            if previous.get("status") == "completed":
+                fields = {"status": "completed", "error": None}
+            else:
+                fields = {"status": "failed", "error": error}
+        return outcome, UpdateOne({"interview_id": interview_id, "lease_owner": owner}, release_update(fields))
+
+    async def _evaluate(self, interview_id: str) -> tuple:
+        """
+        One evaluation attempt from scratch.
+
+        Returns:
+            (evaluation result, error or None)
+        """
+        try:
+            with llm_priority(BULK):
+                result = await self.evaluation_service.evaluate(interview_id, reuse_turn_results=False)
+        except Exception as e:
+            return None, str(e)
+        if result.get("status") != "success":
+            return None, result.get("message") or "Evaluation returned non-success status"
+        # Per-question failures are isolated by evaluate(); don't store them as results
+        errors = [score.get("error") for score in result["interview_result"]["technical_scores"].values()
+                  if score.get("error")]
+        return result, errors[0] if errors else None
+
+    async def _update_run(self, run_id: str, owner: str, fields: dict):
+        """Record the final status of a run and give up its lease."""
+        await self.runs.update_one(
+            {"_id": run_id, "lease_owner": owner},
+            {"$set": {**fields, "updated_at": datetime.utcnow(), "lease_owner": None, "lease_expires_at": None}}
+        )
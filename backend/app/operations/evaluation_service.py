@@ -1,13 +1,26 @@
 from app.schemas.interview_model_eval import InterviewData
+import asyncio
 import logging
-from app.agents.evaluater_agent import TextEvaluationService
-from app.operations.audio_evaluation_service import AudioEvaluationService
+import os
+from dotenv import load_dotenv
+from app.agents.evaluater_agent import TextEvaluationService, overall_score
+from app.operations.audio_evaluation_service import AudioEvaluationService, analyze_audio_files
 from app.operations.score_evaluation_service import ScoringService
+from app.schemas.evaluation_result_schemas import AggregatedScores, TechnicalScoreDetail
+from app.utils.executors import run_in_analysis_process
 from bson import ObjectId
 
+load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of answers scored by the LLM at the same time
+EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "4"))
+# "per_question": one LLM call per answer plus summaries
+# "single_request": the whole interview in one structured call, falling back
+# to per_question when the response does not validate
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "per_question").lower()
+
 class InterviewEvaluationService:
 
     def __init__(self, db):
@@ -17,7 +30,20 @@ class InterviewEvaluationService:
         self.audio_service = AudioEvaluationService()
         self.scoring_service = ScoringService()
 
-    async def evaluate(self, interview_id: str):
+    async def evaluate(self, interview_id: str, reuse_turn_results: bool = True, on_progress=None):
+        """
+        Evaluate every turn of an interview and aggregate the scores.
+
+        Args:
+            interview_id: The interview ID
+            reuse_turn_results: Use text/audio results already computed per turn
+                during the interview; only turns without one are evaluated here
+            on_progress: Optional async callback receiving progress events:
+                {"stage": ..., "total": ...} on stage changes and
+                {"question": n, "result": ...} whenever a question is scored (in
+                single_request mode, for every question once the combined
+                call returns)
+        """
         # Simulate some evaluation logic
         logger.info(f"Evaluating interview data for interview_id: {interview_id}")
         interview_data = await self.collection.find_one({"interview_id": interview_id})
@@ -27,28 +53,47 @@ class InterviewEvaluationService:
         
         logger.info(f"Interview data found: {interview_id}")
 
-        technical_scores = {}
-        audio_results = {}
-        qs_count = 1
-        for convo in interview_data["conversation"]:
-            question = convo["question"]
-            answer = convo["answer_transcript"]
-            result = await self.evaluation_service.evaluate_answer(question, answer)
-            logger.info(f"Evaluation result for question {qs_count}")
-            # Use string keys for MongoDB compatibility
-            technical_scores[str(qs_count)] = result
-            qs_count += 1
-
-        qs_count = 1
-        for convo in interview_data["conversation"]:
-            audio_file_path = convo["answer_audio_path"]
-            result = self.audio_service.analyze_audio(audio_file_path)
-            logger.info(f"Audio analysis result for file '{audio_file_path}'")
-            # Use string keys for MongoDB compatibility
-            audio_results[str(qs_count)] = result
-            qs_count += 1
-
-        aggregated_scores = await self.scoring_service.aggregate(technical_scores)
+        conversation = interview_data["conversation"]
+        await self._report(on_progress, {"stage": "scoring", "total": len(conversation)})
+
+        if EVALUATION_MODE == "single_request" and self._needs_text_evaluation(conversation, reuse_turn_results):
+            interview_result, audio = await asyncio.gather(
+                self._evaluate_single_request(interview_id, conversation, on_progress),
+                self._evaluate_audio(conversation, reuse_turn_results)
+            )
+            if interview_result is not None:
+                interview_result["audio_results"] = {str(i): result for i, result in enumerate(audio, start=1)}
+                return {"status": "success", "interview_result": interview_result}
+            logger.info(f"Falling back to per-question evaluation for interview_id {interview_id}")
+            # Audio is already analyzed; don't repeat it on the fallback path
+            for convo, result in zip(conversation, audio):
+                convo["audio_result"] = result
+            reuse_audio = True
+        else:
+            reuse_audio = reuse_turn_results
+
+        semaphore = asyncio.Semaphore(EVALUATION_CONCURRENCY)
+
+        # Text scoring of every turn and audio analysis of the whole interview
+        # run concurrently; gather keeps results in question order
+        text_tasks = [
+            self._evaluate_text(convo, qs_count, semaphore, reuse_turn_results, on_progress)
+            for qs_count, convo in enumerate(conversation, start=1)
+        ]
+        text, audio = await asyncio.gather(asyncio.gather(*text_tasks), self._evaluate_audio(conversation, reuse_audio))
+
+        # Use string keys for MongoDB compatibility
+        technical_scores = {str(i): result for i, result in enumerate(text, start=1)}
+        audio_results = {str(i): result for i, result in enumerate(audio, start=1)}
+
+        await self._report(on_progress, {"stage": "summarizing"})
+
+        # Summaries of an earlier evaluation are reused if their inputs are unchanged
+        previous = await self.db["evaluation_results"].find_one(
+            {"interview_id": interview_id}, {"interview_result.aggregated_scores": 1}
+        )
+        previous_scores = ((previous or {}).get("interview_result") or {}).get("aggregated_scores")
+        aggregated_scores = await self.scoring_service.aggregate(technical_scores, previous_scores)
         logger.info(f"Aggregated scores computed for interview_id {interview_id}")
 
         return {"status": "success",
@@ -57,4 +102,92 @@ class InterviewEvaluationService:
                     "aggregated_scores": aggregated_scores,
                     "audio_results": audio_results
                 }
-        }
\ No newline at end of file
+        }
+
+    async def _evaluate_text(self, convo: dict, qs_count: int, semaphore: asyncio.Semaphore,
+                             reuse_turn_results: bool, on_progress=None) -> dict:
+        """Score one answer; a failure only affects this question."""
+        if reuse_turn_results and convo.get("text_result"):
+            result = convo["text_result"]
+        else:
+            try:
+                async with semaphore:
+                    result = await self.evaluation_service.evaluate_answer(convo["question"], convo["answer_transcript"])
+                logger.info(f"Evaluation result for question {qs_count}")
+            except Exception as e:
+                logger.error(f"Evaluation failed for question {qs_count}: {e}", exc_info=True)
+                result = {"technical_score": 0, "overall_score": 0, "feedback": "Evaluation failed", "error": str(e)}
+
+        await self._report(on_progress, {"question": qs_count, "result": result})
+        return result
+
+    @staticmethod
+    async def _report(on_progress, event: dict):
+        """Deliver a progress event; reporting never fails the evaluation."""
+        if on_progress is None:
+            return
+        try:
+            await on_progress(event)
+        except Exception as e:
+            logger.warning(f"Progress report failed: {e}")
+
+    async def _evaluate_audio(self, conversation: list, reuse_turn_results: bool) -> list:
+        """Analyze the audio of all turns in one worker call, off the event loop."""
+        # Use the results computed at answer ingest when available
+        results = [convo.get("audio_result") if reuse_turn_results else None for convo in conversation]
+        pending = [i for i, result in enumerate(results) if not result]
+        if not pending:
+            return results
+
+        paths = [conversation[i]["answer_audio_path"] for i in pending]
+        try:
+            analyzed = await run_in_analysis_process(analyze_audio_files, paths)
+        except Exception as e:
+            logger.error(f"Audio analysis failed for {len(paths)} answers: {e}", exc_info=True)
+            analyzed = [{"confidence_score": 0.0, "speech_rate": 0.0, "status": f"error: {str(e)}"}] * len(paths)
+
+        for i, result in zip(pending, analyzed):
+            results[i] = result
+        logger.info(f"Audio analysis results computed for {len(paths)} answers")
+        return results
+
+    @staticmethod
+    def _needs_text_evaluation(conversation: list, reuse_turn_results: bool) -> bool:
+        """Whether any turn still has to be scored by the LLM."""
+        return not reuse_turn_results or any(not convo.get("text_result") for convo in conversation)
+
+    async def _evaluate_single_request(self, interview_id: str, conversation: list, on_progress=None) -> dict | None:
+        """
+        Score all turns and summarize the interview in one LLM call.
+
+        Returns:
+            technical_scores and aggregated_scores, or None if the response
+            could not be validated
+        """
+        try:
+            evaluation = await self.evaluation_service.evaluate_interview(
+                [(convo["question"], convo["answer_transcript"]) for convo in conversation]
+            )
+            technical_scores = {}
+            for question in evaluation.questions:
+                result = question.model_dump(exclude={"question_number"})
+                result["overall_score"] = overall_score(result)
+                # Use string keys for MongoDB compatibility
+                technical_scores[str(question.question_number)] = TechnicalScoreDetail.model_validate(result).model_dump()
+
+            overall, averages = self.scoring_service.average_scores(technical_scores)
+            aggregated_scores = AggregatedScores(
+                overall_score=overall,
+                criteria_scores=averages,
+                strengths=evaluation.strengths,
+                improvement_areas=evaluation.improvement_areas,
+                combined_feedback=evaluation.combined_feedback
+            ).model_dump()
+        except Exception as e:
+            logger.warning(f"Single-request evaluation failed for interview_id {interview_id}: {e}")
+            return None
+
+        logger.info(f"Single-request evaluation completed for interview_id {interview_id}")
+        for question, result in technical_scores.items():
+            await self._report(on_progress, {"question": int(question), "result": result})
+        return {"technical_scores": technical_scores, "aggregated_scores": aggregated_scores}
@@ -1,35 +1,70 @@
-import statistics
-from app.agents.summarize_agents import SummaryService
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+from dotenv import load_dotenv
+from app.agents.summarize_agents import (
+    SummaryService, NO_STRENGTHS, NO_IMPROVEMENTS, NO_FEEDBACK, SUMMARY_PROMPT_VERSION
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "concurrent": three summary calls in parallel
+# "single_request": one structured call returning all three summaries
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "concurrent").lower()
+
+# Metrics to average
+METRICS = ["technical_score", "depth_score", "clarity_score", "practical_score"]
+
+
+def _score(value) -> float:
+    """A numeric score, or 0 when a question result lacks it."""
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
 
 class ScoringService:
     def __init__(self):
         self.summary_service = SummaryService()
 
-    async def aggregate(self, technical_scores: dict) -> dict:
+    def average_scores(self, technical_scores: dict) -> tuple:
         """
-        Aggregate all question results into an overall evaluation summary.
+        Average the per-question scores.
+
+        Returns:
+            (overall score, criteria averages), both on a 0-100 scale
         """
         # Convert the dict values (each question result) into a list
         question_results = list(technical_scores.values())
+        if not question_results:
+            return 0.0, {m: 0.0 for m in METRICS}
+
+        # One row per question: the 4 metrics followed by overall_score
+        matrix = np.array(
+            [[_score(q.get(m)) for m in METRICS] + [_score(q.get("overall_score"))] for q in question_results],
+            dtype=np.float64
+        )
+        means = matrix.mean(axis=0)
 
-        # Metrics to average
-        metrics = ["technical_score", "depth_score", "clarity_score", "practical_score"]
-
-        # Calculate averages for each metric
-        averages = {}
-        for m in metrics:
-            try:
-                avg = statistics.mean(q[m] for q in question_results)
-                # Scale from 1-10 to 0-100 for frontend display
-                averages[m] = round(avg * 10, 2)
-            except Exception:
-                averages[m] = 0.0
-
-        # Calculate overall average (scale to 0-100)
-        try:
-            overall = round(statistics.mean(q.get("overall_score", 0) for q in question_results), 2)
-        except Exception:
-            overall = 0.0
+        # Scale metrics from 1-10 to 0-100 for frontend display
+        averages = {m: round(float(v) * 10, 2) for m, v in zip(METRICS, means[:-1])}
+        overall = round(float(means[-1]), 2)
+        return overall, averages
+
+    async def aggregate(self, technical_scores: dict, previous: dict | None = None) -> dict:
+        """
+        Aggregate all question results into an overall evaluation summary.
+
+        Args:
+            technical_scores: Per-question results keyed by question number
+            previous: The aggregated scores of an earlier evaluation, if any;
+                its summaries are reused when the inputs have not changed
+        """
+        question_results = list(technical_scores.values())
+        overall, averages = self.average_scores(technical_scores)
 
         # Collect all strengths and improvements across questions
         strengths = []
@@ -37,31 +72,52 @@ class ScoringService:
         feedbacks = []
 
         for q in question_results:
-            strengths.extend(q.get("strengths", []))
-            improvements.extend(q.get("improvements", []))
-            feedbacks.append(q.get("feedback", ""))
-
-        # Deduplicate and clean
-        strengths = list(set(strengths))
-        improvements = list(set(improvements))
-
-        summarized_strengths = await self.summary_service.summarize_strengths(strengths)
-        summarized_improvements = await self.summary_service.summarize_improvements(improvements)
-        summarized_feedback = await self.summary_service.summarize_feedback(" ".join(feedbacks))
-
-        # summary_feedback = (
-        #     f"Overall, the candidate achieved an average technical score of {averages['technical_score']}/10 "
-        #     f"and an overall score of {overall}/10. "
-        #     f"{summarized_feedback}\n\n"
-        #     f"**Strengths Summary:** {summarized_strengths}\n\n"
-        #     f"**Improvement Summary:** {summarized_improvements}"
-        # )
+            strengths.extend(q.get("strengths") or [])
+            improvements.extend(q.get("improvements") or [])
+            if q.get("feedback"):
+                feedbacks.append(q["feedback"])
+
+        # Deduplicate, keeping the order stable so the input hash is too
+        strengths = list(dict.fromkeys(strengths))
+        improvements = list(dict.fromkeys(improvements))
+        feedback = " ".join(feedbacks)
+
+        # Summaries depend on the model, prompts and mode as much as on the inputs
+        input_hash = hashlib.sha256(json.dumps([
+            self.summary_service.llm.model_name, SUMMARY_PROMPT_VERSION, SUMMARY_MODE,
+            strengths, improvements, feedback
+        ]).encode("utf-8")).hexdigest()
+
+        if previous and previous.get("summary_input_hash") == input_hash:
+            logger.info("Summary inputs unchanged; reusing previous summaries")
+            summaries = {
+                "strengths": previous.get("strengths"),
+                "improvement_areas": previous.get("improvement_areas"),
+                "combined_feedback": previous.get("combined_feedback")
+            }
+        elif not (strengths or improvements or feedback):
+            summaries = {
+                "strengths": NO_STRENGTHS,
+                "improvement_areas": NO_IMPROVEMENTS,
+                "combined_feedback": NO_FEEDBACK
+            }
+        elif SUMMARY_MODE == "single_request":
+            summaries = await self.summary_service.summarize_all(strengths, improvements, feedback)
+        else:
+            summarized_strengths, summarized_improvements, summarized_feedback = await asyncio.gather(
+                self.summary_service.summarize_strengths(strengths),
+                self.summary_service.summarize_improvements(improvements),
+                self.summary_service.summarize_feedback(feedback)
+            )
+            summaries = {
+                "strengths": summarized_strengths,
+                "improvement_areas": summarized_improvements,
+                "combined_feedback": summarized_feedback
+            }
 
         return {
             "overall_score": overall,
             "criteria_scores": averages,
-            "strengths": summarized_strengths,
-            "improvement_areas": summarized_improvements,
-            "combined_feedback": summarized_feedback,
-            #"summary": summary_feedback
+            **summaries,
+            "summary_input_hash": input_hash
         }
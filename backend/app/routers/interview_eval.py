@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from app.operations.evaluation_service import InterviewEvaluationService
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.schemas.interview_model_eval import InterviewData
+from app.schemas.evaluation_result_schemas import BulkReevaluationRequest
+from app.operations.bulk_reevaluation_service import BulkReevaluationService, RUNS_COLLECTION, run_active
+import asyncio
+import json
 import logging
 from fastapi import logger
 from app.database.mongo_db import get_database
+from app.services.evaluation_cache import evaluation_cache
+from app.services.evaluation_runner import lease_active
+from app.services.evaluation_progress import job_handle, job_snapshot, wait_for_change, watch_job
+from app.tasks.job_queue import evaluation_queue
 
 
 logger = logging.getLogger(__name__)
 eval_router = APIRouter()
 
+# Keep references so bulk runs are not garbage collected mid-flight
+_bulk_runs = set()
+
 
 @eval_router.get("/evaluate/{interview_id}")
 async def evaluate_interview(interview_id: str, db=Depends(get_database), force_refresh: bool = False):
@@ -21,7 +32,8 @@ async def evaluate_interview(interview_id: str, db=Depends(get_database), force_
         force_refresh: If True, ignore cache and recalculate evaluation
 
     Returns:
-        Evaluation results (from cache if available, otherwise calculated)
+        Evaluation results if already computed; otherwise 202 Accepted with a
+        job handle whose status_url / events_url report progress
     """
     logger.info(f"Received evaluation request for interview_id: {interview_id}, force_refresh={force_refresh}")
 
@@ -43,13 +55,11 @@ async def evaluate_interview(interview_id: str, db=Depends(get_database), force_
                 cached_result["updated_at"] = cached_result["updated_at"].isoformat()
             return cached_result
 
-        if cached_result and cached_result.get("status") == "in_progress":
+        # A running evaluation (queued job or not) is joined below: the queue
+        # hands back its active job, and a new job waits for the lease holder
+        if cached_result and cached_result.get("status") == "in_progress" and lease_active(cached_result):
             logger.info(f"Evaluation in progress for interview {interview_id}")
-            return {
-                "status": "in_progress",
-                "message": "Evaluation is currently in progress. Please try again in a few moments.",
-                "interview_id": interview_id
-            }
+            return await _queue_evaluation(db, interview_id, reuse_turn_results=True)
 
         if cached_result and cached_result.get("status") == "failed":
             logger.warning(f"Previous evaluation failed for interview {interview_id}: {cached_result.get('error')}")
@@ -59,63 +69,20 @@ async def evaluate_interview(interview_id: str, db=Depends(get_database), force_
                 "interview_id": interview_id
             }
 
-    logger.info(f"Computing/recalculating evaluation for interview {interview_id}")
+    logger.info(f"Queueing evaluation for interview {interview_id}")
+    # A forced refresh re-scores every turn, including ones scored during the interview
+    return await _queue_evaluation(db, interview_id, reuse_turn_results=not force_refresh)
 
-    # Mark as in-progress
-    evaluation_results_collection = db["evaluation_results"]
-    await evaluation_results_collection.update_one(
-        {"interview_id": interview_id},
-        {
-            "$set": {
-                "status": "in_progress",
-                "error": None
-            }
-        },
-        upsert=True
-    )
 
-    try:
-        result = await InterviewEvaluationService(db).evaluate(interview_id)
-        logger.info(f"Evaluation completed for interview_id {interview_id}")
-
-        # Store the results in the database
-        if result.get("status") == "success":
-            from datetime import datetime
-            await evaluation_results_collection.update_one(
-                {"interview_id": interview_id},
-                {
-                    "$set": {
-                        "status": "completed",
-                        "interview_result": result.get("interview_result"),
-                        "error": None,
-                        "updated_at": datetime.utcnow()
-                    },
-                    "$setOnInsert": {
-                        "created_at": datetime.utcnow()
-                    }
-                },
-                upsert=True
-            )
-            logger.info(f"Evaluation results stored in database for interview {interview_id}")
-
-        return result
-    except Exception as e:
-        error_msg = f"Evaluation failed: {str(e)}"
-        logger.error(f"Evaluation failed for interview {interview_id}: {str(e)}", exc_info=True)
-
-        # Store error in database
-        await evaluation_results_collection.update_one(
-            {"interview_id": interview_id},
-            {
-                "$set": {
-                    "status": "failed",
-                    "error": error_msg
-                }
-            },
-            upsert=True
-        )
+async def _queue_evaluation(db, interview_id: str, reuse_turn_results: bool):
+    """Queue an evaluation (or join the one already queued) and answer 202 Accepted."""
+    conversation = await db["conversations"].find_one({"interview_id": interview_id}, {"user_id": 1})
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Interview data not found")
 
-        raise HTTPException(status_code=500, detail=error_msg)
+    job = await evaluation_queue.enqueue(interview_id, conversation["user_id"], reuse_turn_results)
+    logger.info(f"Evaluation job {job['_id']} queued for interview {interview_id}")
+    return JSONResponse(status_code=202, content=job_handle(job))
 
 
 @eval_router.post("/re-evaluate/{interview_id}")
@@ -123,63 +90,126 @@ async def re_evaluate_interview(interview_id: str, db=Depends(get_database)):
     """
     Force re-evaluation of an interview, ignoring cached results.
 
-    This endpoint recalculates the evaluation from scratch and updates the cache.
+    This endpoint queues a recalculation from scratch, which updates the cache.
 
     Args:
         interview_id: The interview ID
         db: Database connection
 
     Returns:
-        Fresh evaluation results
+        202 Accepted with a job handle whose status_url / events_url report progress
     """
     logger.info(f"Received re-evaluation request for interview_id: {interview_id}")
+    return await _queue_evaluation(db, interview_id, reuse_turn_results=False)
 
-    # Mark evaluation as in-progress
-    evaluation_results_collection = db["evaluation_results"]
-    await evaluation_results_collection.update_one(
-        {"interview_id": interview_id},
-        {
-            "$set": {
-                "status": "in_progress",
-                "error": None
-            }
-        },
-        upsert=True
+
+@eval_router.get("/jobs/{job_id}")
+async def evaluation_job_status(job_id: str, since: str | None = None, wait: float = 0):
+    """
+    Status of a queued evaluation; long-polls when `wait` is given.
+
+    Args:
+        job_id: The job handle returned with 202 Accepted
+        since: The `version` of the last snapshot seen; the request returns as
+            soon as the status differs from it
+        wait: Seconds to hold the request while nothing changes (max 30)
+
+    Returns:
+        Job snapshot: status, stage, progress counts, per-question results
+        scored so far and, once done, the evaluation result or error
+    """
+    snapshot = await wait_for_change(job_id, since, min(max(wait, 0), 30))
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return snapshot
+
+
+@eval_router.get("/jobs/{job_id}/events")
+async def evaluation_job_events(job_id: str, request: Request):
+    """
+    Progress of a queued evaluation over Server-Sent Events.
+
+    Emits `status` on every transition, `question` as each question's result
+    becomes available, and a final `done` with the result or error.
+    """
+    if await job_snapshot(job_id) is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+
+    async def event_stream():
+        async for event, data in watch_job(job_id):
+            if await request.is_disconnected():
+                return
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-    try:
-        # Recalculate evaluation
-        result = await InterviewEvaluationService(db).evaluate(interview_id)
-        logger.info(f"Re-evaluation completed for interview_id {interview_id}")
-
-        # Update cache with new results
-        if result.get("status") == "success":
-            await evaluation_results_collection.update_one(
-                {"interview_id": interview_id},
-                {
-                    "$set": {
-                        "status": "completed",
-                        "interview_result": result.get("interview_result"),
-                        "error": None
-                    }
-                }
-            )
-
-        return result
-
-    except Exception as e:
-        error_msg = f"Re-evaluation failed: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-
-        # Update cache with error
-        await evaluation_results_collection.update_one(
-            {"interview_id": interview_id},
-            {
-                "$set": {
-                    "status": "failed",
-                    "error": error_msg
-                }
-            }
-        )
 
-        raise HTTPException(status_code=500, detail=error_msg)
+@eval_router.get("/cache-stats")
+async def evaluation_cache_stats():
+    """Hit/miss counters of the per-answer evaluation cache in this process."""
+    return evaluation_cache.stats()
+
+
+@eval_router.post("/bulk-re-evaluate")
+async def bulk_re_evaluate(request: BulkReevaluationRequest, db=Depends(get_database)):
+    """
+    Start (or resume) a bulk re-evaluation run in the background.
+
+    For large runs prefer scripts/bulk_reevaluate.py, which keeps the work
+    off the API process.
+
+    Returns:
+        202 Accepted with the run id and its status URL
+    """
+    options = {key: value for key, value in {
+        "requests_per_minute": request.requests_per_minute,
+        "tokens_per_minute": request.tokens_per_minute,
+        "max_concurrency": request.max_concurrency
+    }.items() if value is not None}
+    service = BulkReevaluationService(db, **options)
+
+    if request.resume_run_id:
+        run = await db[RUNS_COLLECTION].find_one({"_id": request.resume_run_id})
+        if not run:
+            raise HTTPException(status_code=404, detail="Bulk re-evaluation run not found")
+        # A "running" run whose lease expired lost its process and can be resumed
+        if run_active(run):
+            raise HTTPException(status_code=409, detail="Bulk re-evaluation run is already running")
+        run_id = request.resume_run_id
+    else:
+        run_id = await service.create_run({
+            "since": request.since,
+            "until": request.until,
+            "manager_id": request.manager_id,
+            "status": request.status
+        })
+
+    task = asyncio.create_task(service.run(run_id))
+    _bulk_runs.add(task)
+    task.add_done_callback(_bulk_runs.discard)
+    logger.info(f"Bulk re-evaluation run {run_id} started")
+
+    return JSONResponse(status_code=202, content={
+        "run_id": run_id,
+        "status": "running",
+        "status_url": f"/interview-eval/bulk-re-evaluate/{run_id}"
+    })
+
+
+@eval_router.get("/bulk-re-evaluate/{run_id}")
+async def bulk_re_evaluate_status(run_id: str, db=Depends(get_database)):
+    """Checkpoint and counters of a bulk re-evaluation run."""
+    run = await db[RUNS_COLLECTION].find_one({"_id": run_id})
+    if not run:
+        raise HTTPException(status_code=404, detail="Bulk re-evaluation run not found")
+    for key in ("created_at", "updated_at", "started_at", "finished_at", "lease_expires_at"):
+        if run.get(key):
+            run[key] = run[key].isoformat()
+    for key in ("since", "until"):
+        if run["filters"].get(key):
+            run["filters"][key] = run["filters"][key].isoformat()
+    return run
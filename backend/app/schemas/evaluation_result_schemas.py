@@ -41,6 +41,34 @@ class AggregatedScores(BaseModel):
     strengths: Optional[str] = None
     improvement_areas: Optional[str] = None
     combined_feedback: Optional[str] = None
+    summary_input_hash: Optional[str] = None  # inputs the summaries were made from
+
+
+class QuestionEvaluation(BaseModel):
+    """Model output for one question in a whole-interview evaluation."""
+    question_number: int = Field(..., ge=1)
+    technical_score: float = Field(..., ge=0, le=10)
+    depth_score: float = Field(..., ge=0, le=10)
+    clarity_score: float = Field(..., ge=0, le=10)
+    practical_score: float = Field(..., ge=0, le=10)
+    feedback: str
+    strengths: List[str]
+    improvements: List[str]
+
+
+class EvaluationSummary(BaseModel):
+    """Model output summarizing an interview's per-question feedback."""
+    strengths: str
+    improvement_areas: str
+    combined_feedback: str
+
+
+class WholeInterviewEvaluation(BaseModel):
+    """Model output for a whole interview evaluated in one request."""
+    questions: List[QuestionEvaluation]
+    strengths: str
+    improvement_areas: str
+    combined_feedback: str
 
 
 class InterviewEvaluationResult(BaseModel):
@@ -90,3 +118,15 @@ class EvaluationResultUpdateRequest(BaseModel):
     status: Optional[str] = None
     interview_result: Optional[InterviewEvaluationResult] = None
     error: Optional[str] = None
+
+
+class BulkReevaluationRequest(BaseModel):
+    """Request model for a bulk re-evaluation run."""
+    since: Optional[datetime] = None  # interviews created at or after
+    until: Optional[datetime] = None  # interviews created before
+    manager_id: Optional[str] = None
+    status: Optional[str] = None  # interview status, e.g. "completed"
+    requests_per_minute: Optional[float] = Field(None, gt=0)
+    tokens_per_minute: Optional[float] = Field(None, gt=0)
+    max_concurrency: Optional[int] = Field(None, ge=1)
+    resume_run_id: Optional[str] = None  # continue an interrupted run instead
@@ -0,0 +1,567 @@
+"""
+Interview attend pipeline.
+
+Each turn of a live interview goes through the same stages: resolve the
+interview, rebuild the conversation history, transcribe the answer, generate
+the next question and synthesize it. Blocking stages run on the bounded
+executors in app.utils.executors, and independent stages overlap:
+
+    - the interview lookup and the conversation fetch run together
+    - the transcript $set runs alongside next-question generation
+    - TTS runs alongside the conversation $push
+
+Per-session state (interview, instructions, history) is kept in the session
+cache, so a turn costs the same regardless of how long the interview is.
+With CONTEXT_MODE=rolling the prompt is bounded too: older turns are folded
+into a summary persisted on the conversation document.
+
+The streaming variant emits question tokens as the model produces them and
+synthesizes each finished sentence as soon as it is complete.
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import re
+import uuid
+from contextlib import asynccontextmanager
+from bson import ObjectId
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from langchain_community.chat_message_histories import ChatMessageHistory
+from app.database.mongo_db import get_database
+from app.services.session_cache import session_cache
+from app.services.turn_evaluation_service import trigger_turn_evaluation
+from app.utils.executors import run_in_thread, run_in_process
+from app.utils.llm_utils import get_next_question, stream_next_question, summarize_conversation
+from app.utils.audio_ingest import decode_audio_bytes, pcm16_to_float, write_sidecar
+from app.utils.speech_utils import transcribe_speech
+from app.services.audio_service import TTS_LAZY_AUDIO, audio_file_path, render_audio, schedule_audio, synthesize_phrase
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "full" sends every prior turn to the interviewer model; "rolling" keeps the
+# last CONTEXT_RECENT_TURNS turns verbatim and folds older ones into a summary
+CONTEXT_MODE = os.getenv("CONTEXT_MODE", "full")
+CONTEXT_RECENT_TURNS = int(os.getenv("CONTEXT_RECENT_TURNS", "4"))
+# Turns folded per summary update, so the summarizer is not called every turn
+SUMMARY_BATCH_TURNS = int(os.getenv("SUMMARY_BATCH_TURNS", "2"))
+
+AUDIO_DIR = "audios"
+os.makedirs(AUDIO_DIR, exist_ok=True)
+
+SKIP_ANSWER = "[Skipped due to silence]"
+SKIP_TRANSITION = "That's completely fine if you're not sure about that. Let me ask you something else."
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+async def resolve_interview(interview_id: str):
+    """Find an interview by MongoDB _id, falling back to the interview_id field."""
+    interviews_collection = get_database()["interviews"]
+
+    # First try to find by MongoDB _id (since frontend sends the _id)
+    try:
+        interview_oid = ObjectId(interview_id)
+        interview = await interviews_collection.find_one({"_id": interview_oid})
+        if interview:
+            logger.info(f"Found interview by _id: {interview_id}")
+        else:
+            # Fallback to interview_id field if _id search fails
+            logger.info(f"Not found by _id, trying interview_id field")
+            interview = await interviews_collection.find_one({"interview_id": interview_id})
+    except Exception as e:
+        logger.error(f"Error searching by _id: {e}, trying interview_id field")
+        interview = await interviews_collection.find_one({"interview_id": interview_id})
+    return interview
+
+
+def build_instructions_text(interview: dict) -> str:
+    """Format the manager's interview_instructions for the interviewer prompt."""
+    instructions = interview.get("interview_instructions", {})
+    if isinstance(instructions, dict):
+        notes = instructions.get('notes', '')
+        tech_stacks = ', '.join(instructions.get('tech_stacks', []))
+        time = instructions.get('time', 'N/A')
+
+        # Build instructions with special emphasis on question count if mentioned
+        instructions_text = f"Time: {time}\nTech Stacks: {tech_stacks}\n"
+        if notes:
+            instructions_text += f"Special Instructions: {notes}"
+        else:
+            instructions_text += "No special instructions."
+    else:
+        instructions_text = "Conduct a professional interview."
+
+    # Adapt the plan drafted at assignment time instead of starting from scratch
+    planned = (interview.get("plan") or {}).get("questions") or []
+    if planned:
+        instructions_text += "\n\nPlanned Questions (adapt them to the candidate's answers):\n"
+        instructions_text += "\n".join(f"{i}. {q}" for i, q in enumerate(planned, 1))
+    return instructions_text
+
+
+def get_precomputed_opening(ctx):
+    """Return the pre-rendered (question, audio_path) for a fresh session, if ready."""
+    if ctx.history.messages or ctx.current_question:
+        return None
+    plan = ctx.interview.get("plan") or {}
+    if plan.get("status") != "ready" or not plan.get("opening_question") or not plan.get("opening_audio_path"):
+        return None
+    return plan["opening_question"], plan["opening_audio_path"]
+
+
+def build_history(convo_doc: dict | None):
+    """
+    Rebuild the chat history from a conversation document.
+
+    Returns:
+        (history, current_question, current_turn_id) where current_question is
+        the pending question that has not been answered yet, if any.
+    """
+    history = ChatMessageHistory()
+    current_question = None
+    current_turn_id = None
+
+    if convo_doc:
+        for turn in convo_doc.get("conversation", []):
+            # Skip incomplete turns (questions without answers yet) but save the current one
+            if not turn.get("answer_transcript"):
+                current_question = turn.get("question", "")
+                current_turn_id = turn.get("turn_id")
+                continue
+            # Add in correct order: AI question first, then user answer
+            history.add_ai_message(turn.get("question", ""))
+            history.add_user_message(turn.get("answer_transcript", ""))
+
+    return history, current_question, current_turn_id
+
+
+def question_phrases(question: str, skipped: bool = False) -> list:
+    """Phrases making up an interviewer turn; the skip transition is rendered once and reused."""
+    return [SKIP_TRANSITION, question] if skipped else [question]
+
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def save_answer_audio(interview_id: str, data: bytes) -> str:
+    """Persist an uploaded answer off the event loop and return its absolute path."""
+    audio_filename = f"{interview_id}_answer_{uuid.uuid4()}.wav"
+    audio_path = os.path.join(AUDIO_DIR, audio_filename)
+    audio_abs_path = os.path.abspath(audio_path)  # Store absolute path for reliable access
+    await run_in_thread(_write_bytes, audio_abs_path, data)
+    return audio_abs_path
+
+
+async def record_answer(interview_id: str, user_id: str, user_answer: str, audio_abs_path: str,
+                        skipped: bool = False, answered_turn: tuple | None = None):
+    """
+    Fill in the answer of the pending turn.
+
+    Args:
+        answered_turn: (question, turn_id) of the turn being answered, used to
+            evaluate it in the background
+    """
+    conversations_collection = get_database()["conversations"]
+    update = {"conversation.$.answer_transcript": user_answer,
+              "conversation.$.answer_audio_path": audio_abs_path}
+    if skipped:
+        update["conversation.$.skipped"] = True
+
+    await conversations_collection.update_one(
+        {"interview_id": interview_id, "user_id": user_id, "conversation.answer_transcript": ""},
+        {"$set": update}
+    )
+
+    # Evaluate the answer in the background while the interview continues
+    question, turn_id = answered_turn or (None, None)
+    trigger_turn_evaluation(interview_id, user_id, audio_abs_path, question, user_answer, turn_id)
+
+
+async def push_question(interview_id: str, user_id: str, question: str, turn_id: str):
+    """Append a new, unanswered turn to the conversation."""
+    conversations_collection = get_database()["conversations"]
+    await conversations_collection.update_one(
+        {"interview_id": interview_id, "user_id": user_id},
+        {"$push": {"conversation": {
+            "turn_id": turn_id,
+            "question": question,
+            "answer_transcript": "",
+            "answer_audio_path": ""
+        }}},
+        upsert=True
+    )
+
+
+class TurnContext:
+    """
+    State needed to run one turn: the instructions and the history.
+
+    Contexts are cached per session (see app.services.session_cache) and
+    updated in place as turns are recorded; `lock` serializes turns of the
+    same session and `size` approximates the memory held, in characters.
+    """
+
+    def __init__(self, interview_id: str, user_id: str, interview: dict, instructions_text: str,
+                 history: ChatMessageHistory, current_question: str | None, current_turn_id: str | None = None):
+        self.interview_id = interview_id
+        self.user_id = user_id
+        self.interview = interview
+        self.instructions_text = instructions_text
+        self.history = history
+        self.current_question = current_question
+        self.current_turn_id = current_turn_id
+        # Rolling summary of history.messages[:summarized_messages]
+        self.summary_text = None
+        self.summarized_messages = 0
+        self.summary_task = None
+        self.lock = asyncio.Lock()
+        self.size = len(instructions_text) + len(current_question or "") + sum(
+            len(m.content) for m in history.messages
+        )
+
+    @property
+    def key(self):
+        return (self.interview_id, self.user_id)
+
+
+async def load_turn_context(interview_id: str, user_id: str) -> TurnContext:
+    """Return the cached session context, or resolve the interview and rebuild the history."""
+    key = (interview_id, user_id)
+    ctx = session_cache.get(key)
+    if ctx is not None:
+        return ctx
+
+    conversations_collection = get_database()["conversations"]
+
+    interview, convo_doc = await asyncio.gather(
+        resolve_interview(interview_id),
+        conversations_collection.find_one({"interview_id": interview_id, "user_id": user_id})
+    )
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    history, current_question, current_turn_id = build_history(convo_doc)
+    ctx = TurnContext(interview_id, user_id, interview, build_instructions_text(interview),
+                      history, current_question, current_turn_id)
+    context_summary = (convo_doc or {}).get("context_summary") or {}
+    if context_summary.get("messages", 0) <= len(history.messages):
+        ctx.summary_text = context_summary.get("text")
+        ctx.summarized_messages = context_summary.get("messages", 0)
+    return session_cache.setdefault(key, ctx)
+
+
+@asynccontextmanager
+async def locked_turn(ctx: TurnContext):
+    """
+    Run a turn with exclusive access to the session context.
+
+    If the turn fails part way, the cached context may no longer match what
+    was written to Mongo, so it is dropped and rebuilt on the next turn.
+    """
+    async with ctx.lock:
+        try:
+            yield
+        except BaseException:
+            session_cache.invalidate(ctx.key)
+            raise
+        session_cache.touch(ctx.key, ctx)
+        schedule_summary_update(ctx)
+
+
+def question_context(ctx: TurnContext):
+    """
+    History and summary to send to the interviewer model.
+
+    In rolling mode only turns not yet folded into the summary are sent
+    verbatim; the background update keeps that window at about
+    CONTEXT_RECENT_TURNS turns, so prompt size stays flat.
+
+    Returns:
+        (history, summary)
+    """
+    if CONTEXT_MODE != "rolling" or not ctx.summarized_messages:
+        return ctx.history, None
+    recent = ChatMessageHistory(messages=ctx.history.messages[ctx.summarized_messages:])
+    return recent, ctx.summary_text
+
+
+def schedule_summary_update(ctx: TurnContext):
+    """Fold older turns into the rolling summary in the background when enough have accumulated."""
+    if CONTEXT_MODE != "rolling" or ctx.summary_task is not None:
+        return
+    fold_until = len(ctx.history.messages) - 2 * CONTEXT_RECENT_TURNS
+    if fold_until - ctx.summarized_messages < 2 * SUMMARY_BATCH_TURNS:
+        return
+    ctx.summary_task = asyncio.create_task(update_summary(ctx, fold_until))
+
+
+async def update_summary(ctx: TurnContext, fold_until: int):
+    """Summarize history up to fold_until and persist it on the conversation document."""
+    try:
+        messages = ctx.history.messages[ctx.summarized_messages:fold_until]
+        summary_text = await summarize_conversation(ctx.summary_text, messages)
+        await get_database()["conversations"].update_one(
+            {"interview_id": ctx.interview_id, "user_id": ctx.user_id},
+            {"$set": {"context_summary": {"text": summary_text, "messages": fold_until}}}
+        )
+        ctx.summary_text = summary_text
+        ctx.summarized_messages = fold_until
+        logger.info(f"Context summary updated for interview {ctx.interview_id} ({fold_until} messages folded)")
+    except Exception as e:
+        # Until the summary catches up, the unsummarized turns are sent verbatim
+        logger.error(f"Context summary update failed for interview {ctx.interview_id}: {e}", exc_info=True)
+    finally:
+        ctx.summary_task = None
+
+
+async def transcribe_answer(interview_id: str, audio_bytes: bytes | None, silence_skip: bool):
+    """
+    Persist and transcribe the candidate's answer.
+
+    The upload is decoded once in memory; the samples feed Whisper directly
+    and are saved as a PCM sidecar for evaluation. Voice activity detection
+    trims silence before Whisper, and an answer without speech goes through
+    the skipped-answer flow just like a client-side silence skip.
+
+    Returns:
+        (user_answer, audio_abs_path, skipped)
+    """
+    if silence_skip:
+        # Handle silence skip - no audio provided
+        return SKIP_ANSWER, "", True
+
+    # Normal flow with audio transcription
+    audio_abs_path, pcm = await asyncio.gather(
+        save_answer_audio(interview_id, audio_bytes),
+        run_in_thread(decode_audio_bytes, audio_bytes)
+    )
+    # Keep the audio file for evaluation analysis (don't delete)
+    _, user_answer = await asyncio.gather(
+        run_in_thread(write_sidecar, audio_abs_path, pcm),
+        run_in_process(transcribe_speech, pcm16_to_float(pcm))
+    )
+    if user_answer is None:
+        logger.info(f"No speech detected in answer for interview {interview_id}, treating as skipped")
+        return SKIP_ANSWER, audio_abs_path, True
+    return user_answer, audio_abs_path, False
+
+
+def add_answer_to_history(ctx: TurnContext, user_answer: str):
+    """
+    Append the pending question and its answer to the history.
+
+    Returns:
+        (question, turn_id) of the turn that was answered
+    """
+    answered_turn = (ctx.current_question, ctx.current_turn_id)
+    # Add current question to history first (critical for context)
+    if ctx.current_question:
+        ctx.history.add_ai_message(ctx.current_question)
+    ctx.history.add_user_message(user_answer)
+    ctx.current_question = None
+    ctx.current_turn_id = None
+    ctx.size += len(user_answer)
+    return answered_turn
+
+
+async def ask_question(ctx: TurnContext, question: str):
+    """Persist a new question and remember it as waiting for an answer."""
+    turn_id = uuid.uuid4().hex
+    await push_question(ctx.interview_id, ctx.user_id, question, turn_id)
+    ctx.current_question = question
+    ctx.current_turn_id = turn_id
+    ctx.size += len(question)
+
+
+async def ingest_answer(ctx: TurnContext, interview_id: str, audio_bytes: bytes | None, silence_skip: bool):
+    """
+    Transcribe the candidate's answer and append it to the history.
+
+    Returns:
+        (user_answer, audio_abs_path, skipped, answered_turn)
+    """
+    user_answer, audio_abs_path, skipped = await transcribe_answer(interview_id, audio_bytes, silence_skip)
+    answered_turn = add_answer_to_history(ctx, user_answer)
+    return user_answer, audio_abs_path, skipped, answered_turn
+
+
+def is_answer_turn(audio_bytes: bytes | None, silence_skip: bool) -> bool:
+    """The opening call carries neither audio nor a skip."""
+    return audio_bytes is not None or silence_skip
+
+
+async def attend_interview_service(user_id: str, interview_id: str, audio_bytes: bytes | None, silence_skip: bool):
+    """Run one interview turn and return the next question with its audio path."""
+    logger.info(f"attend_interview called with interview_id: {interview_id}")
+
+    ctx = await load_turn_context(interview_id, user_id)
+    async with locked_turn(ctx):
+        return await _attend_turn(ctx, user_id, interview_id, audio_bytes, silence_skip)
+
+
+async def _attend_turn(ctx: TurnContext, user_id: str, interview_id: str, audio_bytes: bytes | None, silence_skip: bool):
+    opening = None if is_answer_turn(audio_bytes, silence_skip) else get_precomputed_opening(ctx)
+    if opening:
+        # Opening question and audio were rendered when the interview was assigned
+        full_response, audio_path = opening
+        await ask_question(ctx, full_response)
+        return {"ai_question": full_response, "audio_path": audio_path}
+
+    skipped = False
+    if not is_answer_turn(audio_bytes, silence_skip):
+        history, summary = question_context(ctx)
+        ai_question = await get_next_question(history, ctx.instructions_text, summary)
+    else:
+        user_answer, audio_abs_path, skipped, answered_turn = await ingest_answer(ctx, interview_id, audio_bytes, silence_skip)
+
+        # The transcript write and the next question are independent
+        history, summary = question_context(ctx)
+        _, ai_question = await asyncio.gather(
+            record_answer(interview_id, user_id, user_answer, audio_abs_path,
+                          skipped=skipped, answered_turn=answered_turn),
+            get_next_question(history, ctx.instructions_text, summary)
+        )
+
+    # Prepend an empathetic transition message after a skip
+    phrases = question_phrases(ai_question, skipped=skipped)
+    full_response = " ".join(phrases)
+
+    if TTS_LAZY_AUDIO:
+        # Audio renders in the background and is served on GET
+        audio_path = schedule_audio(phrases)
+        await ask_question(ctx, full_response)
+    else:
+        audio_path, _ = await asyncio.gather(
+            render_audio(phrases),
+            ask_question(ctx, full_response)
+        )
+
+    return {"ai_question": full_response, "audio_path": audio_path}
+
+
+def split_sentences(buffer: str):
+    """
+    Split streamed text into finished sentences and the unfinished remainder.
+
+    Returns:
+        (sentences, remainder)
+    """
+    parts = SENTENCE_BOUNDARY.split(buffer)
+    return [p for p in parts[:-1] if p.strip()], parts[-1]
+
+
+async def stream_attend_interview_service(ctx: TurnContext, user_id: str, interview_id: str, audio_bytes: bytes | None, silence_skip: bool):
+    """
+    Run one interview turn, streaming the interviewer's reply.
+
+    Yields (event, data) pairs:
+        transcript - the candidate's transcribed answer (answer turns only)
+        token      - a text delta of the next question
+        audio      - base64 audio for one finished sentence, in order
+        done       - the full question once it has been persisted
+    """
+    answer = None
+    if is_answer_turn(audio_bytes, silence_skip):
+        answer = await transcribe_answer(interview_id, audio_bytes, silence_skip)
+
+    async for event, data in stream_turn(ctx, user_id, interview_id, answer):
+        yield event, data
+
+
+async def stream_turn(ctx: TurnContext, user_id: str, interview_id: str, answer: tuple | None):
+    """
+    Record an already transcribed answer and stream the next question.
+
+    Args:
+        answer: (user_answer, audio_abs_path, skipped), or None for the opening question
+    """
+    async with locked_turn(ctx):
+        async for event, data in _stream_turn(ctx, user_id, interview_id, answer):
+            yield event, data
+
+
+async def _stream_turn(ctx: TurnContext, user_id: str, interview_id: str, answer: tuple | None):
+    opening = None if answer else get_precomputed_opening(ctx)
+    if opening:
+        full_response, audio_path = opening
+        yield "token", {"text": full_response}
+        data = await run_in_thread(_read_bytes, audio_file_path(audio_path))
+        yield "audio", {"index": 0, "audio": base64.b64encode(data).decode("ascii")}
+        await ask_question(ctx, full_response)
+        yield "done", {"ai_question": full_response}
+        return
+
+    record_task = None
+    prefix = ""
+
+    if answer:
+        user_answer, audio_abs_path, skipped = answer
+        answered_turn = add_answer_to_history(ctx, user_answer)
+        yield "transcript", {"answer_transcript": user_answer, "skipped": skipped}
+        record_task = asyncio.create_task(
+            record_answer(interview_id, user_id, user_answer, audio_abs_path,
+                          skipped=skipped, answered_turn=answered_turn)
+        )
+        if skipped:
+            prefix = f"{SKIP_TRANSITION} "
+
+    # Sentences are synthesized concurrently but emitted in order
+    pending_audio = []
+    sentence_index = 0
+
+    def schedule(sentence: str):
+        nonlocal sentence_index
+        pending_audio.append((sentence_index, asyncio.create_task(synthesize_phrase(sentence))))
+        sentence_index += 1
+
+    def ready_audio():
+        while pending_audio and pending_audio[0][1].done():
+            index, task = pending_audio.pop(0)
+            yield index, task.result()
+
+    if prefix:
+        schedule(SKIP_TRANSITION)
+        yield "token", {"text": prefix}
+
+    ai_question = ""
+    buffer = ""
+    try:
+        history, summary = question_context(ctx)
+        async for delta in stream_next_question(history, ctx.instructions_text, summary):
+            ai_question += delta
+            buffer += delta
+            yield "token", {"text": delta}
+
+            sentences, buffer = split_sentences(buffer)
+            for sentence in sentences:
+                schedule(sentence)
+            for index, data in ready_audio():
+                yield "audio", {"index": index, "audio": base64.b64encode(data).decode("ascii")}
+
+        if buffer.strip():
+            schedule(buffer)
+        while pending_audio:
+            index, task = pending_audio.pop(0)
+            yield "audio", {"index": index, "audio": base64.b64encode(await task).decode("ascii")}
+    finally:
+        for _, task in pending_audio:
+            task.cancel()
+
+    full_response = f"{prefix}{ai_question}"
+    if record_task:
+        await record_task
+    await ask_question(ctx, full_response)
+
+    yield "done", {"ai_question": full_response}
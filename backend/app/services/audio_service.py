@@ -0,0 +1,110 @@
+"""
+Interviewer audio rendering.
+
+Question audio is served from /interview/audio/{filename}, where the file name
+is the content address of the rendered phrases (see app.utils.tts). With
+TTS_LAZY_AUDIO enabled, /interview/attend returns that URL together with the
+question text right away and rendering continues in the background; a GET
+that arrives before rendering finishes waits for it, and a GET for a known
+but not yet rendered file renders it on demand. The phrases of every
+scheduled file are persisted next to it in the audio cache, so the render
+can happen in any process sharing the cache directory, even after a restart.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from dotenv import load_dotenv
+from app.utils.executors import run_in_thread
+from app.utils.tts import get_audio_cache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TTS_LAZY_AUDIO = os.getenv("TTS_LAZY_AUDIO", "true").lower() == "true"
+AUDIO_URL_PREFIX = "/interview/audio"
+
+# Phrases of recently scheduled renders; saves reading the persisted manifest
+MAX_KNOWN_RENDERS = 2000
+_known_phrases = OrderedDict()
+_pending_renders = {}
+
+
+def audio_url(filename: str) -> str:
+    return f"{AUDIO_URL_PREFIX}/{filename}"
+
+
+def audio_file_path(url_or_filename: str) -> str:
+    """Local path of a rendered audio file given its URL or file name."""
+    return get_audio_cache().path(os.path.basename(url_or_filename))
+
+
+def _remember(filename: str, phrases: list):
+    if filename not in _known_phrases:
+        get_audio_cache().remember(phrases)
+    _known_phrases[filename] = phrases
+    _known_phrases.move_to_end(filename)
+    while len(_known_phrases) > MAX_KNOWN_RENDERS:
+        _known_phrases.popitem(last=False)
+
+
+def _start_render(filename: str, phrases: list) -> asyncio.Task:
+    """Start rendering unless a render of the same file is already in flight."""
+    task = _pending_renders.get(filename)
+    if task is None:
+        task = asyncio.create_task(run_in_thread(get_audio_cache().render, phrases))
+        _pending_renders[filename] = task
+        task.add_done_callback(lambda _: _pending_renders.pop(filename, None))
+    return task
+
+
+async def render_audio(phrases: list) -> str:
+    """Render phrases now and return the audio URL."""
+    filename = get_audio_cache().filename(phrases)
+    _remember(filename, phrases)
+    await _start_render(filename, phrases)
+    return audio_url(filename)
+
+
+def schedule_audio(phrases: list) -> str:
+    """Return the audio URL immediately and render in the background."""
+    filename = get_audio_cache().filename(phrases)
+    _remember(filename, phrases)
+    if not os.path.exists(audio_file_path(filename)):
+        task = _start_render(filename, phrases)
+        task.add_done_callback(_log_render_failure)
+    return audio_url(filename)
+
+
+def _log_render_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background audio render failed: {task.exception()}")
+
+
+async def get_rendered_audio(filename: str) -> str | None:
+    """
+    Path of a rendered audio file, waiting for or performing the render.
+
+    Returns:
+        The local file path, or None if the file is unknown.
+    """
+    path = audio_file_path(filename)
+    if os.path.exists(path):
+        return path
+
+    phrases = _known_phrases.get(filename)
+    if phrases is None:
+        # Scheduled by another process or before a restart
+        phrases = await run_in_thread(get_audio_cache().phrases, filename)
+    if phrases is None:
+        return None
+
+    await _start_render(filename, phrases)
+    return path
+
+
+async def synthesize_phrase(text: str) -> bytes:
+    """Audio bytes for one phrase, from the cache when possible."""
+    return await run_in_thread(get_audio_cache().synthesize, text)
@@ -0,0 +1,120 @@
+"""
+Persistent cache of per-answer LLM evaluations.
+
+Results of TextEvaluationService.evaluate_answer are stored in the
+`evaluation_cache` collection under a content address: the SHA-256 of
+(model, prompt version, question, answer). Re-evaluating an interview whose
+transcripts have not changed, or scoring the same skipped answer again, is
+then a single indexed read instead of an LLM round trip. Bumping the
+evaluator's prompt version changes every key, so stale results are never
+served after a prompt change.
+
+Entries expire EVALUATION_CACHE_TTL_SECONDS after they were written (a Mongo
+TTL index on `created_at`, declared with the other indexes in
+app.database.indexes), and the collection is bounded to
+EVALUATION_CACHE_MAX_ENTRIES; the least recently used entries are evicted
+first. Hits and misses are counted per process.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from pymongo import ASCENDING
+from app.database.mongo_db import get_database
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_CACHE_ENABLED = os.getenv("EVALUATION_CACHE_ENABLED", "true").lower() == "true"
+EVALUATION_CACHE_TTL_SECONDS = int(os.getenv("EVALUATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EVALUATION_CACHE_MAX_ENTRIES = int(os.getenv("EVALUATION_CACHE_MAX_ENTRIES", "100000"))
+
+COLLECTION = "evaluation_cache"
+
+
+def evaluation_key(model: str, prompt_version: str, question: str, answer: str) -> str:
+    """Content address of one evaluation."""
+    payload = json.dumps([model, prompt_version, question or "", answer or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """Mongo-backed cache of evaluation results with TTL and LRU size bound."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled and ttl_seconds > 0 and max_entries > 0
+        self.hits = 0
+        self.misses = 0
+
+    def collection(self):
+        return get_database()[COLLECTION]
+
+    async def get(self, key: str) -> dict | None:
+        """Cached result for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            # The TTL monitor runs periodically; don't serve entries it hasn't removed yet
+            fresh_after = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+            doc = await self.collection().find_one_and_update(
+                {"_id": key, "created_at": {"$gt": fresh_after}},
+                {"$set": {"last_used_at": datetime.utcnow()}},
+                projection={"result": 1}
+            )
+        except Exception as e:
+            logger.warning(f"Evaluation cache read failed: {e}")
+            return None
+
+        if doc is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return doc["result"]
+
+    async def set(self, key: str, result: dict, model: str, prompt_version: str):
+        """Store a result and evict the least recently used entries beyond the bound."""
+        if not self.enabled:
+            return
+        try:
+            now = datetime.utcnow()
+            await self.collection().replace_one(
+                {"_id": key},
+                {"result": result, "model": model, "prompt_version": prompt_version,
+                 "created_at": now, "last_used_at": now},
+                upsert=True
+            )
+            await self._evict()
+        except Exception as e:
+            logger.warning(f"Evaluation cache write failed: {e}")
+
+    async def _evict(self):
+        collection = self.collection()
+        excess = await collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        stale = await collection.find({}, {"_id": 1}).sort("last_used_at", ASCENDING).limit(excess).to_list(None)
+        await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in stale]}})
+        logger.info(f"Evicted {len(stale)} entries from the evaluation cache")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global evaluation cache instance
+evaluation_cache = EvaluationCache(
+    ttl_seconds=EVALUATION_CACHE_TTL_SECONDS,
+    max_entries=EVALUATION_CACHE_MAX_ENTRIES,
+    enabled=EVALUATION_CACHE_ENABLED
+)
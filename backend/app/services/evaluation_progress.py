@@ -0,0 +1,146 @@
+"""
+Progress of queued evaluations, for the non-blocking evaluation API.
+
+A job handle (the evaluation job id) resolves to a snapshot combining the job
+document and the interview's evaluation_results document. Clients follow it
+either over Server-Sent Events (watch_job) or by long-polling (wait_for_change).
+Both read the documents workers write, so progress is visible from any API
+node no matter where the job runs.
+"""
+
+import asyncio
+import logging
+import os
+from bson import ObjectId
+from bson.errors import InvalidId
+from dotenv import load_dotenv
+from app.database.mongo_db import get_database
+from app.models.evaluation_job_model import EvaluationJobModel
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_PROGRESS_POLL_SECONDS = float(os.getenv("EVALUATION_PROGRESS_POLL_SECONDS", "1"))
+
+FINISHED_JOB_STATUSES = (EvaluationJobModel.COMPLETED, EvaluationJobModel.DEAD)
+
+
+async def get_job(job_id: str) -> dict | None:
+    try:
+        oid = ObjectId(job_id)
+    except (InvalidId, TypeError):
+        return None
+    return await get_database()[EvaluationJobModel.collection_name].find_one({"_id": oid})
+
+
+def job_handle(job: dict) -> dict:
+    """Body of the 202 response that hands a queued evaluation to the client."""
+    job_id = str(job["_id"])
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "interview_id": job["interview_id"],
+        "status_url": f"/interview-eval/jobs/{job_id}",
+        "events_url": f"/interview-eval/jobs/{job_id}/events"
+    }
+
+
+async def job_snapshot(job_id: str) -> dict | None:
+    """
+    Current state of an evaluation job.
+
+    Returns:
+        Dict with the job and evaluation status, progress, the per-question
+        results scored so far and, once finished, the result or error; None
+        if the job does not exist
+    """
+    job = await get_job(job_id)
+    if job is None:
+        return None
+
+    result = await get_database()["evaluation_results"].find_one({"interview_id": job["interview_id"]}) or {}
+    progress = result.get("progress") or {}
+
+    # The job only finishes after the runner has stored the outcome
+    done = job["status"] in FINISHED_JOB_STATUSES
+    if job["status"] == EvaluationJobModel.QUEUED:
+        status = "queued"
+    elif job["status"] == EvaluationJobModel.LEASED:
+        status = "in_progress"
+    elif job["status"] == EvaluationJobModel.COMPLETED and result.get("status") == "completed":
+        status = "completed"
+    else:
+        status = "failed"
+    if status == "queued":
+        # Progress left over from an earlier evaluation of the interview
+        progress = {}
+
+    snapshot = {
+        "job_id": job_id,
+        "interview_id": job["interview_id"],
+        "job_status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "status": status,
+        "stage": progress.get("stage"),
+        "completed": progress.get("completed", 0),
+        "total": progress.get("total"),
+        "partial_results": (result.get("partial_results") or {}) if status == "in_progress" else {},
+        "done": done,
+        "interview_result": result.get("interview_result") if status == "completed" else None,
+        "error": (result.get("error") or job.get("last_error")) if status == "failed" else None
+    }
+    snapshot["version"] = _version(snapshot)
+    return snapshot
+
+
+def _version(snapshot: dict) -> str:
+    """Changes whenever anything a client displays changes."""
+    return ":".join(str(snapshot[key]) for key in ("job_status", "status", "stage", "completed", "attempts", "done"))
+
+
+async def wait_for_change(job_id: str, since: str | None, timeout: float) -> dict | None:
+    """
+    Long-poll: return the snapshot as soon as its version differs from `since`,
+    or the current snapshot once `timeout` seconds have passed.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        snapshot = await job_snapshot(job_id)
+        if snapshot is None or snapshot["version"] != since or snapshot["done"] or loop.time() >= deadline:
+            return snapshot
+        await asyncio.sleep(EVALUATION_PROGRESS_POLL_SECONDS)
+
+
+async def watch_job(job_id: str):
+    """
+    Yield (event, data) pairs until the job finishes.
+
+    Events: `status` on every status/stage transition, `question` when a
+    question's result becomes available, and a final `done` with the
+    evaluation result or error.
+    """
+    version = None
+    sent_questions = set()
+    while True:
+        snapshot = await job_snapshot(job_id)
+        if snapshot is None:
+            yield "error", {"detail": "Evaluation job not found"}
+            return
+
+        if snapshot["version"] != version:
+            version = snapshot["version"]
+            yield "status", {key: snapshot[key] for key in
+                             ("job_id", "job_status", "status", "stage", "completed", "total", "attempts")}
+
+        for question, result in sorted(snapshot["partial_results"].items(), key=lambda item: int(item[0])):
+            if question not in sent_questions:
+                sent_questions.add(question)
+                yield "question", {"question": int(question), "result": result}
+
+        if snapshot["done"]:
+            yield "done", {key: snapshot[key] for key in ("job_id", "status", "interview_result", "error")}
+            return
+
+        await asyncio.sleep(EVALUATION_PROGRESS_POLL_SECONDS)
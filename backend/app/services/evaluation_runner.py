@@ -0,0 +1,214 @@
+"""
+Single-flight interview evaluation.
+
+The completion trigger, GET /interview-eval/evaluate and /re-evaluate can all
+ask for the same interview's evaluation at the same moment. evaluate_once()
+makes them share one computation:
+
+- Within a process, concurrent callers for an interview await the same task
+  (an in-flight map keyed by interview_id).
+- Across processes (API nodes, evaluation workers), the evaluation_results
+  document carries a lease taken with an atomic find_one_and_update. Only the
+  lease holder evaluates; everyone else waits for the stored result. A lease
+  is kept alive while the evaluation runs, so if its holder dies it expires
+  and a waiter takes over.
+
+Results are always written to the single evaluation_results document of the
+interview. While an evaluation runs, the document also carries its progress
+(`progress.stage`, `progress.completed`, `progress.total`) and the results of
+questions already scored (`partial_results`), which the progress endpoints
+stream to clients.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.database.mongo_db import get_database
+from app.operations.evaluation_service import InterviewEvaluationService
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_LEASE_SECONDS = int(os.getenv("EVALUATION_LEASE_SECONDS", "300"))
+EVALUATION_WAIT_SECONDS = float(os.getenv("EVALUATION_WAIT_SECONDS", "900"))
+EVALUATION_WAIT_POLL_SECONDS = float(os.getenv("EVALUATION_WAIT_POLL_SECONDS", "2"))
+
+# interview_id -> task computing (or waiting for) its evaluation
+_in_flight = {}
+
+
+def _results():
+    return get_database()["evaluation_results"]
+
+
+def lease_active(doc: dict | None) -> bool:
+    """Whether an evaluation_results document is leased by a live evaluation."""
+    expires = (doc or {}).get("lease_expires_at")
+    return expires is not None and expires > datetime.utcnow()
+
+
+async def evaluate_once(interview_id: str, user_id: str | None = None, reuse_turn_results: bool = True) -> dict:
+    """
+    Evaluate an interview, sharing the computation with concurrent callers.
+
+    A caller that joins an evaluation already in flight gets that
+    evaluation's result, whatever its reuse_turn_results setting was.
+
+    Args:
+        interview_id: The interview ID
+        user_id: The candidate's user ID, stored on the result if given
+        reuse_turn_results: Use text/audio results computed during the interview
+
+    Returns:
+        The InterviewEvaluationService.evaluate result
+    """
+    task = _in_flight.get(interview_id)
+    if task is None:
+        task = asyncio.create_task(_evaluate_or_wait(interview_id, user_id, reuse_turn_results))
+        _in_flight[interview_id] = task
+        task.add_done_callback(lambda t: _in_flight.pop(interview_id, None) if _in_flight.get(interview_id) is t else None)
+    else:
+        logger.info(f"Joining evaluation already in flight for interview {interview_id}")
+
+    # A caller going away (client disconnect) must not cancel the shared evaluation
+    return await asyncio.shield(task)
+
+
+async def cancel_in_flight():
+    """
+    Cancel the evaluations running in this process and wait until they have
+    unwound. Called on shutdown; their leases expire and waiters take over.
+    """
+    tasks = list(_in_flight.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def acquire_lease(interview_id: str, user_id: str | None, owner: str) -> dict | None:
+    """
+    Take the evaluation lease of an interview if no live evaluation holds it.
+
+    Other writers of evaluation results (bulk re-evaluation) take the same
+    lease, so they never overwrite an evaluation in flight.
+
+    Args:
+        interview_id: The interview ID
+        user_id: The candidate's user ID, stored on the result if given
+        owner: Unique id of the lease holder
+
+    Returns:
+        The result document as it was before the lease was taken, or None if
+        the lease is held elsewhere
+    """
+    now = datetime.utcnow()
+    identity = {"user_id": user_id} if user_id else {}
+    await _results().update_one(
+        {"interview_id": interview_id},
+        {"$setOnInsert": {"interview_id": interview_id, "status": "in_progress", "interview_result": {},
+                          "error": None, "created_at": now, "updated_at": now}},
+        upsert=True
+    )
+    return await _results().find_one_and_update(
+        {"interview_id": interview_id,
+         "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": now}}]},
+        {"$set": {"status": "in_progress", "error": None, "lease_owner": owner,
+                  "lease_expires_at": now + timedelta(seconds=EVALUATION_LEASE_SECONDS), **identity}}
+    )
+
+
+async def _evaluate_or_wait(interview_id: str, user_id: str | None, reuse_turn_results: bool) -> dict:
+    owner = uuid.uuid4().hex
+    deadline = asyncio.get_running_loop().time() + EVALUATION_WAIT_SECONDS
+    while True:
+        if await acquire_lease(interview_id, user_id, owner) is not None:
+            return await _run(interview_id, reuse_turn_results, owner)
+
+        logger.info(f"Evaluation of interview {interview_id} is leased elsewhere; waiting for its result")
+        while True:
+            await asyncio.sleep(EVALUATION_WAIT_POLL_SECONDS)
+            doc = await _results().find_one({"interview_id": interview_id})
+            if doc is not None and lease_active(doc):
+                if asyncio.get_running_loop().time() > deadline:
+                    return {"status": "error", "message": "Timed out waiting for the evaluation in progress"}
+                continue
+            if doc is not None and doc.get("lease_owner") is None:
+                if doc.get("status") == "completed":
+                    return {"status": "success", "interview_result": doc.get("interview_result", {})}
+                if doc.get("status") == "failed":
+                    return {"status": "error", "message": doc.get("error") or "Evaluation failed"}
+            # The lease holder died without a result: take over
+            break
+
+
+async def keep_lease_alive(interview_id: str, owner: str):
+    """Extend a held lease until cancelled."""
+    while True:
+        await asyncio.sleep(max(1.0, EVALUATION_LEASE_SECONDS / 3))
+        await _results().update_one(
+            {"interview_id": interview_id, "lease_owner": owner},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=EVALUATION_LEASE_SECONDS)}}
+        )
+
+
+async def _report_progress(interview_id: str, owner: str, event: dict):
+    """Record one evaluation progress event on the result document."""
+    if "question" in event:
+        update = {"$set": {f"partial_results.{event['question']}": event["result"]},
+                  "$inc": {"progress.completed": 1}}
+    else:
+        update = {"$set": {f"progress.{key}": value for key, value in event.items()}}
+    await _results().update_one({"interview_id": interview_id, "lease_owner": owner}, update)
+
+
+async def _run(interview_id: str, reuse_turn_results: bool, owner: str) -> dict:
+    await _results().update_one(
+        {"interview_id": interview_id, "lease_owner": owner},
+        {"$set": {"progress": {"stage": "starting", "completed": 0, "total": None}},
+         "$unset": {"partial_results": ""}}
+    )
+    heartbeat = asyncio.create_task(keep_lease_alive(interview_id, owner))
+    try:
+        result = await InterviewEvaluationService(get_database()).evaluate(
+            interview_id, reuse_turn_results=reuse_turn_results,
+            on_progress=lambda event: _report_progress(interview_id, owner, event)
+        )
+    except Exception as e:
+        await _release(interview_id, owner, {"status": "failed", "error": f"Evaluation failed: {str(e)}"})
+        raise
+    finally:
+        heartbeat.cancel()
+
+    if result.get("status") == "success":
+        await _release(interview_id, owner, {"status": "completed",
+                                             "interview_result": result.get("interview_result"),
+                                             "error": None})
+        logger.info(f"Evaluation results stored in database for interview {interview_id}")
+    else:
+        await _release(interview_id, owner, {"status": "failed",
+                                             "error": result.get("message", "Evaluation returned non-success status")})
+    return result
+
+
+def release_update(fields: dict) -> dict:
+    """
+    Update storing an evaluation outcome and giving up its lease.
+
+    Apply it with a filter on lease_owner, so a holder that lost its lease
+    cannot overwrite the result of the evaluation that took over.
+
+    Args:
+        fields: Outcome fields to set; must include status
+    """
+    return {"$set": {**fields, "progress.stage": fields["status"], "updated_at": datetime.utcnow(),
+                     "lease_owner": None, "lease_expires_at": None},
+            "$unset": {"partial_results": ""}}
+
+
+async def _release(interview_id: str, owner: str, fields: dict):
+    """Store the outcome and give up the lease in one write."""
+    await _results().update_one({"interview_id": interview_id, "lease_owner": owner}, release_update(fields))
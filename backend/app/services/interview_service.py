@@ -3,6 +3,8 @@ from fastapi import HTTPException
 from app.database.mongo_db import get_database
 from app.core.email_service import send_email
 from app.tasks.evaluation_tasks import trigger_evaluation
+from app.tasks.plan_tasks import trigger_plan_precompute
+from app.services.session_cache import session_cache
 from datetime import datetime
 import logging
 
@@ -54,6 +56,9 @@ async def assign_interview_service(interview):
     result = await interviews_collection.insert_one(interview_doc)
     interview_doc["_id"] = str(result.inserted_id)
 
+    # Generate the question plan and opening turn before the candidate joins
+    await trigger_plan_precompute(str(result.inserted_id))
+
     # Send emails to employees
     employees = await users_collection.find({"_id": {"$in": employee_oids}}).to_list(None)
     for emp in employees:
@@ -163,6 +168,7 @@ async def update_interview_status_service(interview_id: str, status: str, user_i
 
     # Trigger automatic evaluation if status is being set to "completed"
     if status.lower() == "completed":
+        session_cache.invalidate_interview(interview_id)
         logger.info(f"Interview {interview_id} marked as completed. Triggering evaluation...")
         await trigger_evaluation(interview_id, user_id)
 
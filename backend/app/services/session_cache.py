@@ -0,0 +1,110 @@
+"""
+In-process cache of live interview sessions.
+
+Keyed by (interview_id, user_id), it holds each session's TurnContext: the
+resolved interview, the compiled instructions and the chat history, which is
+appended to turn by turn instead of being rebuilt from the conversations
+collection. Every change is still written to Mongo by the attend pipeline
+(write-through), so an evicted entry is simply reloaded on its next turn.
+
+Entries expire after SESSION_CACHE_TTL_SECONDS of inactivity, and the cache is
+bounded both by entry count and by an approximate size in characters; the
+least recently used sessions are evicted first. The cache is per process, so
+multi-worker deployments should route a candidate to the same worker.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "1800"))
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "500"))
+SESSION_CACHE_MAX_CHARS = int(os.getenv("SESSION_CACHE_MAX_CHARS", "20000000"))
+
+
+class SessionCache:
+    """LRU cache with TTL expiry and a size bound. Values expose a `size` attribute."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_chars: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()  # key -> (value, size, last_access)
+        self._total_chars = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, size, last_access = entry
+        if time.monotonic() - last_access > self.ttl_seconds:
+            self.invalidate(key)
+            return None
+
+        self._entries[key] = (value, size, time.monotonic())
+        self._entries.move_to_end(key)
+        return value
+
+    def setdefault(self, key, value):
+        """Insert value unless a live entry exists; return the cached value."""
+        if not self.enabled:
+            return value
+
+        existing = self.get(key)
+        if existing is not None:
+            return existing
+
+        self._entries[key] = (value, value.size, time.monotonic())
+        self._total_chars += value.size
+        self._evict()
+        return value
+
+    def touch(self, key, value):
+        """Refresh an entry's size and access time after it changed."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not value:
+            return
+
+        self._total_chars += value.size - entry[1]
+        self._entries[key] = (value, value.size, time.monotonic())
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_chars -= entry[1]
+
+    def invalidate_interview(self, interview_id: str):
+        """Drop every session of an interview."""
+        for key in [k for k in self._entries if k[0] == interview_id]:
+            self.invalidate(key)
+
+    def _evict(self):
+        now = time.monotonic()
+        # Expired entries first, then least recently used until within bounds
+        for key in [k for k, (_, _, last) in self._entries.items() if now - last > self.ttl_seconds]:
+            self.invalidate(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total_chars > self.max_chars):
+            key = next(iter(self._entries))
+            logger.info(f"Evicting interview session {key} from cache")
+            self.invalidate(key)
+
+
+# Global session cache instance
+session_cache = SessionCache(
+    ttl_seconds=SESSION_CACHE_TTL_SECONDS,
+    max_entries=SESSION_CACHE_MAX_ENTRIES,
+    max_chars=SESSION_CACHE_MAX_CHARS
+)
@@ -0,0 +1,217 @@
+"""
+WebSocket interview sessions with incremental transcription.
+
+The client streams the candidate's answer as raw PCM while they speak
+(16-bit little-endian, mono, 16 kHz). Whenever enough untranscribed audio has
+accumulated, the session cuts a window at the quietest point near its end and
+transcribes it in the background, so partial transcripts build up during the
+answer. When the answer ends only the remaining tail is decoded before the
+turn continues through the regular streaming pipeline.
+
+Client messages:
+    binary frames           - PCM chunks of the current answer
+    {"type": "begin"}       - ask the opening question
+    {"type": "end_answer"}  - the candidate finished answering
+    {"type": "skip"}        - the candidate skipped the question (silence)
+
+Server messages are JSON objects {"event": ..., "data": ...} using the events
+of the streaming attend endpoint plus `partial_transcript`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+import wave
+import numpy as np
+from app.services.attend_service import AUDIO_DIR, SKIP_ANSWER, TurnContext, load_turn_context, stream_turn
+from app.utils.audio_ingest import SAMPLE_RATE, pcm_bytes_to_float, write_sidecar
+from app.utils.executors import run_in_thread, run_in_process
+from app.utils.speech_utils import transcribe_speech
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_WIDTH = 2  # int16
+
+# Untranscribed audio needed before a partial window is decoded
+PARTIAL_WINDOW_SECONDS = float(os.getenv("PARTIAL_WINDOW_SECONDS", "8"))
+# How far back from the window end to look for a quiet cut point
+CUT_SEARCH_SECONDS = 1.0
+CUT_FRAME_SECONDS = 0.02
+# Tails shorter than this are not worth decoding
+MIN_TAIL_SECONDS = 0.2
+# Audio beyond this length is dropped, so one answer cannot grow without bound
+MAX_ANSWER_SECONDS = float(os.getenv("MAX_ANSWER_SECONDS", "600"))
+
+
+def find_cut(samples: np.ndarray) -> int:
+    """Return the index of the quietest frame start within the last CUT_SEARCH_SECONDS."""
+    frame = int(CUT_FRAME_SECONDS * SAMPLE_RATE)
+    search = min(len(samples), int(CUT_SEARCH_SECONDS * SAMPLE_RATE))
+    n_frames = search // frame
+    if n_frames == 0:
+        return len(samples)
+
+    start = len(samples) - n_frames * frame
+    frames = samples[start:].reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    return start + int(np.argmin(energy)) * frame
+
+
+def write_wav(path: str, pcm: bytes):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    # The stream is already 16 kHz PCM, so the sidecar needs no decoding
+    pcm = pcm[:len(pcm) - len(pcm) % SAMPLE_WIDTH]
+    write_sidecar(path, np.frombuffer(pcm, dtype=np.int16))
+
+
+class AnswerBuffer:
+    """Accumulates one answer's PCM and transcribes it window by window."""
+
+    def __init__(self):
+        self.pcm = bytearray()
+        self.committed = 0  # byte offset up to which audio has been transcribed
+        self.partials = []
+        self.truncated = False
+        self._failed = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(p.strip() for p in self.partials if p.strip())
+
+    def append(self, chunk: bytes):
+        room = int(MAX_ANSWER_SECONDS * SAMPLE_RATE) * SAMPLE_WIDTH - len(self.pcm)
+        if len(chunk) > room:
+            if not self.truncated:
+                logger.warning(f"Answer longer than {MAX_ANSWER_SECONDS:.0f}s; dropping further audio")
+                self.truncated = True
+            chunk = chunk[:max(0, room)]
+        self.pcm.extend(chunk)
+
+    def window_ready(self) -> bool:
+        # After a failed window, the rest of the answer is decoded by finish()
+        if self._task is not None or self._failed:
+            return False
+        pending = (len(self.pcm) - self.committed) // SAMPLE_WIDTH
+        return pending >= PARTIAL_WINDOW_SECONDS * SAMPLE_RATE
+
+    async def _transcribe(self, start: int, end: int) -> str:
+        end -= (end - start) % SAMPLE_WIDTH  # ignore a trailing half sample
+        samples = pcm_bytes_to_float(bytes(self.pcm[start:end]))
+        # Silent windows come back as None and add nothing to the transcript
+        return await run_in_process(transcribe_speech, samples, self.transcript or None) or ""
+
+    def start_window(self, on_partial):
+        """Transcribe the pending window in the background."""
+        pending = len(self.pcm) - (len(self.pcm) - self.committed) % SAMPLE_WIDTH
+        samples = pcm_bytes_to_float(bytes(self.pcm[self.committed:pending]))
+        start = self.committed
+        end = start + find_cut(samples) * SAMPLE_WIDTH
+
+        async def run():
+            try:
+                text = await self._transcribe(start, end)
+            except Exception as e:
+                # The window stays uncommitted, so finish() decodes it with the tail
+                logger.error(f"Partial transcription failed: {e}", exc_info=True)
+                self._failed = True
+                return
+            finally:
+                self._task = None
+            # Committed only once its text is in the transcript
+            self.partials.append(text)
+            self.committed = end
+            try:
+                await on_partial(self.transcript)
+            except Exception as e:
+                logger.warning(f"Could not send partial transcript: {e}")
+
+        self._task = asyncio.create_task(run())
+
+    async def finish(self) -> str:
+        """Wait for the in-flight window and decode everything not yet transcribed."""
+        if self._task:
+            await self._task
+        tail = (len(self.pcm) - self.committed) // SAMPLE_WIDTH
+        if tail >= MIN_TAIL_SECONDS * SAMPLE_RATE:
+            self.partials.append(await self._transcribe(self.committed, len(self.pcm)))
+            self.committed = len(self.pcm)
+        return self.transcript
+
+    def cancel(self):
+        if self._task:
+            self._task.cancel()
+
+
+class InterviewSession:
+    """One candidate's live interview over a WebSocket."""
+
+    def __init__(self, websocket, ctx: TurnContext, interview_id: str, user_id: str):
+        self.websocket = websocket
+        self.ctx = ctx
+        self.interview_id = interview_id
+        self.user_id = user_id
+        self.answer = AnswerBuffer()
+
+    async def send(self, event: str, data: dict):
+        await self.websocket.send_json({"event": event, "data": data})
+
+    async def on_audio(self, chunk: bytes):
+        self.answer.append(chunk)
+        if self.answer.window_ready():
+            self.answer.start_window(lambda text: self.send("partial_transcript", {"text": text}))
+
+    async def run_turn(self, answer: tuple | None):
+        # The cached context may have been evicted or replaced since the last turn
+        self.ctx = await load_turn_context(self.interview_id, self.user_id)
+        async for event, data in stream_turn(self.ctx, self.user_id, self.interview_id, answer):
+            await self.send(event, data)
+
+    async def end_answer(self):
+        buffer, self.answer = self.answer, AnswerBuffer()
+        user_answer = await buffer.finish()
+
+        audio_filename = f"{self.interview_id}_answer_{uuid.uuid4()}.wav"
+        audio_abs_path = os.path.abspath(os.path.join(AUDIO_DIR, audio_filename))
+        # Keep the audio file for evaluation analysis
+        await run_in_thread(write_wav, audio_abs_path, bytes(buffer.pcm))
+
+        if not user_answer:
+            # No speech anywhere in the answer: same flow as a silence skip
+            await self.run_turn((SKIP_ANSWER, audio_abs_path, True))
+            return
+        await self.run_turn((user_answer, audio_abs_path, False))
+
+    async def skip(self):
+        self.answer.cancel()
+        self.answer = AnswerBuffer()
+        await self.run_turn((SKIP_ANSWER, "", True))
+
+    async def handle(self, message: dict):
+        """Dispatch one raw ASGI websocket.receive message."""
+        if message.get("bytes") is not None:
+            await self.on_audio(message["bytes"])
+            return
+
+        try:
+            msg_type = json.loads(message.get("text") or "{}").get("type")
+        except (json.JSONDecodeError, AttributeError):
+            msg_type = None
+
+        if msg_type == "begin":
+            await self.run_turn(None)
+        elif msg_type == "end_answer":
+            await self.end_answer()
+        elif msg_type == "skip":
+            await self.skip()
+        else:
+            await self.send("error", {"detail": f"Unknown message type: {msg_type}"})
+
+    def close(self):
+        self.answer.cancel()
@@ -0,0 +1,88 @@
+"""
+Incremental per-turn evaluation while the interview is running.
+
+As soon as an answer has been recorded, its audio metrics are computed in the
+background analysis process pool and stored on the conversation turn as
+`audio_result`. With INCREMENTAL_TEXT_EVALUATION enabled (opt-in), the
+answer is also scored by the text evaluator and stored as `text_result`. The
+final evaluation then reads these precomputed results instead of evaluating
+every answer after the interview ends.
+
+Audio results address a turn by its answer_audio_path and text results by its
+turn_id, both unique per turn, so background writes never race with the
+positional updates of later turns.
+"""
+
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+from app.agents.evaluater_agent import TextEvaluationService
+from app.database.mongo_db import get_database
+from app.operations.audio_evaluation_service import analyze_audio_file
+from app.utils.executors import run_in_analysis_process
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_TEXT_EVALUATION = os.getenv("INCREMENTAL_TEXT_EVALUATION", "false").lower() == "true"
+
+# Keep references so background tasks are not garbage collected mid-flight
+_background_tasks = set()
+
+
+async def analyze_turn_audio(interview_id: str, user_id: str, audio_abs_path: str):
+    """Analyze one answer's audio and store the result on its turn."""
+    try:
+        result = await run_in_analysis_process(analyze_audio_file, audio_abs_path)
+        await get_database()["conversations"].update_one(
+            {"interview_id": interview_id, "user_id": user_id,
+             "conversation.answer_audio_path": audio_abs_path},
+            {"$set": {"conversation.$.audio_result": result}}
+        )
+        logger.info(f"Audio analysis stored for turn of interview {interview_id}")
+    except Exception as e:
+        # The final evaluation analyzes any turn without a stored result
+        logger.error(f"Turn audio analysis failed for interview {interview_id}: {e}", exc_info=True)
+
+
+_text_evaluator = None
+
+def get_text_evaluator() -> TextEvaluationService:
+    """Get or initialize the text evaluator used for turns (singleton pattern)"""
+    global _text_evaluator
+    if _text_evaluator is None:
+        _text_evaluator = TextEvaluationService()
+    return _text_evaluator
+
+
+async def evaluate_turn_text(interview_id: str, user_id: str, turn_id: str, question: str, answer: str):
+    """Score one answered turn and store the result on it."""
+    try:
+        result = await get_text_evaluator().evaluate_answer(question, answer)
+        await get_database()["conversations"].update_one(
+            {"interview_id": interview_id, "user_id": user_id, "conversation.turn_id": turn_id},
+            {"$set": {"conversation.$.text_result": result}}
+        )
+        logger.info(f"Text evaluation stored for turn {turn_id} of interview {interview_id}")
+    except Exception as e:
+        # The final evaluation scores any turn without a stored result
+        logger.error(f"Turn text evaluation failed for interview {interview_id}: {e}", exc_info=True)
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def trigger_turn_evaluation(interview_id: str, user_id: str, audio_abs_path: str,
+                            question: str | None = None, answer: str | None = None, turn_id: str | None = None):
+    """Start background evaluation of a freshly recorded answer."""
+    if audio_abs_path:
+        _spawn(analyze_turn_audio(interview_id, user_id, audio_abs_path))
+
+    # Turns created before turn ids existed are left to the final evaluation
+    if INCREMENTAL_TEXT_EVALUATION and turn_id and question:
+        _spawn(evaluate_turn_text(interview_id, user_id, turn_id, question, answer))
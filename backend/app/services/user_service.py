@@ -1,4 +1,5 @@
 from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError
 from app.database.mongo_db import get_database
 from app.schemas.user_schema import User, UserCreate, LoginRequest
 from fastapi import HTTPException
@@ -32,7 +33,11 @@ async def create_user(user_data: UserCreate):
     user_dict["password"] = hashed_password
     user_dict["created_at"] = datetime.utcnow().isoformat()
 
-    result = await user_collection.insert_one(user_dict)
+    try:
+        result = await user_collection.insert_one(user_dict)
+    except DuplicateKeyError:
+        # A concurrent registration with the same email won the unique index
+        raise HTTPException(status_code=400, detail="User ID or Email already exists")
     new_user = await user_collection.find_one({"_id": result.inserted_id})
     new_user["_id"] = str(new_user["_id"])
     new_user.pop("password", None)
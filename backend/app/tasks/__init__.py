@@ -3,8 +3,15 @@ Tasks module for background job processing.
 """
 
 from app.tasks.evaluation_tasks import trigger_evaluation, evaluation_task
+from app.tasks.plan_tasks import trigger_plan_precompute, plan_task
+from app.tasks.job_queue import evaluation_queue
+from app.tasks.evaluation_worker import EvaluationWorker
 
 __all__ = [
     "trigger_evaluation",
     "evaluation_task",
+    "trigger_plan_precompute",
+    "plan_task",
+    "evaluation_queue",
+    "EvaluationWorker",
 ]
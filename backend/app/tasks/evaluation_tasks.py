@@ -3,15 +3,15 @@ Background tasks for interview evaluation.
 
 This module handles automatic evaluation of interviews when they are marked as completed.
 Results are stored in the database to avoid recalculation.
+
+Completed interviews are put on the durable evaluation job queue
+(app.tasks.job_queue); evaluation workers (app.tasks.evaluation_worker) lease
+the jobs and run EvaluationTask.evaluate_interview.
 """
 
-import asyncio
 import logging
-from datetime import datetime
-from app.database.mongo_db import get_database
-from app.operations.evaluation_service import InterviewEvaluationService
-from app.operations.score_evaluation_service import ScoringService
-from app.models.evaluation_result_model import EvaluationResultModel
+from app.services.evaluation_runner import evaluate_once
+from app.tasks.job_queue import evaluation_queue
 
 logger = logging.getLogger(__name__)
 
@@ -23,88 +23,36 @@ class EvaluationTask:
         # Services will be initialized per-evaluation with database instance
         pass
 
-    async def evaluate_interview(self, interview_id: str, user_id: str) -> bool:
+    async def evaluate_interview(self, interview_id: str, user_id: str, reuse_turn_results: bool = True) -> bool:
         """
         Evaluate a completed interview and store results in database.
 
+        Runs through evaluate_once, so an evaluation of the same interview
+        already started by an API request is joined instead of repeated; the
+        single-flight runner stores the completed or failed result.
+
         Args:
             interview_id: The interview ID
             user_id: The user ID
+            reuse_turn_results: Use text/audio results computed during the interview
 
         Returns:
             True if evaluation succeeded, False otherwise
         """
-        db = get_database()
-        evaluation_results_collection = db["evaluation_results"]
-
         try:
             logger.info(f"Starting evaluation for interview {interview_id} by user {user_id}")
-
-            # Mark evaluation as in-progress
-            in_progress_doc = EvaluationResultModel.create_in_progress_document(
-                interview_id=interview_id,
-                user_id=user_id
-            )
-
-            await evaluation_results_collection.update_one(
-                {"interview_id": interview_id, "user_id": user_id},
-                {"$set": in_progress_doc},
-                upsert=True
-            )
-
-            # Perform evaluation using InterviewEvaluationService
-            logger.info(f"Evaluating interview {interview_id}...")
-            evaluation_service = InterviewEvaluationService(db)
-            evaluation_result = await evaluation_service.evaluate(interview_id)
+            evaluation_result = await evaluate_once(interview_id, user_id, reuse_turn_results)
 
             # Check if evaluation was successful
             if evaluation_result.get("status") != "success":
                 error_msg = evaluation_result.get("message", "Evaluation returned non-success status")
                 raise Exception(error_msg)
 
-            # Extract interview result
-            interview_result = evaluation_result.get("interview_result", {})
-
-            # Store successful evaluation
-            success_doc = EvaluationResultModel.create_document(
-                interview_id=interview_id,
-                user_id=user_id,
-                interview_result=interview_result,
-                status="completed",
-                error=None
-            )
-
-            await evaluation_results_collection.update_one(
-                {"interview_id": interview_id, "user_id": user_id},
-                {"$set": success_doc},
-                upsert=True
-            )
-
             logger.info(f"✅ Evaluation completed for interview {interview_id}")
             return True
 
         except Exception as e:
-            error_msg = f"Evaluation failed: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-
-            # Store failed evaluation
-            failed_doc = EvaluationResultModel.create_document(
-                interview_id=interview_id,
-                user_id=user_id,
-                interview_result={},
-                status="failed",
-                error=error_msg
-            )
-
-            try:
-                await evaluation_results_collection.update_one(
-                    {"interview_id": interview_id, "user_id": user_id},
-                    {"$set": failed_doc},
-                    upsert=True
-                )
-            except Exception as db_error:
-                logger.error(f"Failed to store error result: {db_error}")
-
+            logger.error(f"Evaluation failed: {str(e)}", exc_info=True)
             return False
 
     async def evaluate_interview_async(self, interview_id: str, user_id: str) -> None:
@@ -131,16 +79,13 @@ async def trigger_evaluation(interview_id: str, user_id: str) -> None:
     """
     Trigger automatic evaluation for a completed interview.
 
-    This function creates a background task that evaluates the interview
-    without blocking the response.
+    This function queues a durable evaluation job; an evaluation worker runs
+    it without blocking the response.
 
     Args:
         interview_id: The interview ID
         user_id: The user ID
     """
-    # Create background task (non-blocking)
-    asyncio.create_task(
-        evaluation_task.evaluate_interview_async(interview_id, user_id)
-    )
+    job = await evaluation_queue.enqueue(interview_id, user_id)
 
-    logger.info(f"Evaluation task queued for interview {interview_id}")
+    logger.info(f"Evaluation job {job['_id']} queued for interview {interview_id}")
@@ -0,0 +1,176 @@
+"""
+Evaluation worker.
+
+Leases jobs from the evaluation job queue and runs
+EvaluationTask.evaluate_interview for each, with EVALUATION_WORKER_CONCURRENCY
+jobs in flight. Workers normally run as separate processes
+(scripts/evaluation_worker.py), so evaluation never competes with API
+requests for the API event loop and scales independently of the API nodes.
+EVALUATION_WORKER_IN_PROCESS=true additionally runs one inside the API
+process; it is off by default and only meant for local development.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime
+from dotenv import load_dotenv
+from app.database.mongo_db import get_database
+from app.services.evaluation_runner import cancel_in_flight
+from app.tasks.evaluation_tasks import evaluation_task
+from app.tasks.job_queue import JobQueue, evaluation_queue
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_WORKER_CONCURRENCY = int(os.getenv("EVALUATION_WORKER_CONCURRENCY", "2"))
+EVALUATION_WORKER_POLL_SECONDS = float(os.getenv("EVALUATION_WORKER_POLL_SECONDS", "2"))
+EVALUATION_WORKER_IN_PROCESS = os.getenv("EVALUATION_WORKER_IN_PROCESS", "false").lower() == "true"
+# Queued jobs left waiting this long mean no worker is running
+EVALUATION_WORKER_STALL_SECONDS = float(os.getenv("EVALUATION_WORKER_STALL_SECONDS", "120"))
+
+
+class EvaluationWorker:
+    """Runs queued evaluation jobs until stopped."""
+
+    def __init__(self, queue: JobQueue = evaluation_queue, concurrency: int = EVALUATION_WORKER_CONCURRENCY,
+                 poll_seconds: float = EVALUATION_WORKER_POLL_SECONDS):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stopping = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._tasks = []
+
+    def start(self):
+        """Start the worker slots on the running event loop."""
+        self._tasks = [asyncio.create_task(self._slot(i)) for i in range(self.concurrency)]
+        logger.info(f"Evaluation worker {self.worker_id} started with {self.concurrency} slots")
+
+    async def stop(self):
+        """
+        Stop taking new jobs and cancel jobs in flight; their leases expire and
+        they are retried. Returns once the cancelled jobs have unwound, so the
+        caller may close the database afterwards.
+        """
+        self._stopping.set()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Evaluations are shielded from their callers and would keep writing
+        await cancel_in_flight()
+        self._stopped.set()
+        logger.info(f"Evaluation worker {self.worker_id} stopped")
+
+    async def run(self):
+        """Run until stop() is called and has finished."""
+        self.start()
+        await self._stopped.wait()
+
+    async def _slot(self, slot: int):
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.acquire(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to lease an evaluation job: {e}", exc_info=True)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(job)
+
+    async def _process(self, job: dict):
+        interview_id, user_id = job["interview_id"], job["user_id"]
+
+        # A lease that expired on its last attempt: the job keeps crashing its worker
+        if job["attempts"] > job["max_attempts"]:
+            await self.queue.fail(job, "Lease expired on the final attempt")
+            await self._mark_dead(job, "Lease expired on the final attempt")
+            return
+
+        logger.info(f"Running evaluation job {job['_id']} for interview {interview_id} (attempt {job['attempts']})")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            succeeded = await evaluation_task.evaluate_interview(
+                interview_id, user_id, job.get("reuse_turn_results", True)
+            )
+            error = None if succeeded else "Evaluation failed"
+        except Exception as e:
+            logger.error(f"Evaluation job {job['_id']} crashed: {e}", exc_info=True)
+            error = str(e)
+        finally:
+            heartbeat.cancel()
+
+        if error is None:
+            await self.queue.complete(job)
+            logger.info(f"Evaluation job {job['_id']} completed")
+        elif await self.queue.fail(job, error):
+            await self._mark_dead(job, error)
+        else:
+            logger.warning(f"Evaluation job {job['_id']} failed, will retry: {error}")
+
+    async def _heartbeat(self, job: dict):
+        interval = max(1.0, self.queue.visibility_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not await self.queue.extend_lease(job):
+                logger.warning(f"Lost the lease on evaluation job {job['_id']}")
+                return
+
+    async def _mark_dead(self, job: dict, error: str):
+        """Leave the evaluation result failed instead of stuck in progress."""
+        logger.error(f"Evaluation job {job['_id']} dead-lettered after {job['attempts']} attempts: {error}")
+        await get_database()["evaluation_results"].update_one(
+            # Only when no live evaluation holds the result's lease
+            {"interview_id": job["interview_id"],
+             "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": datetime.utcnow()}}]},
+            {"$set": {"status": "failed", "error": f"Evaluation failed: {error}",
+                      "lease_owner": None, "lease_expires_at": None}}
+        )
+
+
+_in_process_worker: EvaluationWorker | None = None
+
+
+async def start_in_process_worker():
+    """Start an evaluation worker inside the API process if configured."""
+    global _in_process_worker
+    if not EVALUATION_WORKER_IN_PROCESS:
+        logger.info("Evaluation jobs are processed by scripts/evaluation_worker.py")
+        await warn_if_no_worker()
+        return
+    if _in_process_worker is None:
+        _in_process_worker = EvaluationWorker()
+        _in_process_worker.start()
+
+
+async def warn_if_no_worker(queue: JobQueue = evaluation_queue):
+    """Log a warning when queued jobs are not being picked up by any worker."""
+    try:
+        stalled = await queue.stalled_jobs(EVALUATION_WORKER_STALL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not check the evaluation job queue: {e}")
+        return
+    if stalled:
+        logger.warning(
+            f"{stalled} evaluation jobs have waited over {EVALUATION_WORKER_STALL_SECONDS:.0f}s; "
+            f"is scripts/evaluation_worker.py running? Evaluations stay pending (202) without a worker. "
+            f"Set EVALUATION_WORKER_IN_PROCESS=true to run one inside the API for local development."
+        )
+
+
+async def stop_in_process_worker():
+    global _in_process_worker
+    if _in_process_worker is not None:
+        await _in_process_worker.stop()
+        _in_process_worker = None
@@ -0,0 +1,160 @@
+"""
+Durable evaluation job queue backed by MongoDB.
+
+Workers take jobs with an atomic find_one_and_update that flips a job to
+"leased" and sets a visibility timeout (`lease_expires_at`). While a job runs
+its worker keeps extending the lease; if the worker dies the lease expires and
+the job becomes visible to other workers again. Failed jobs are retried with
+exponential backoff, and after EVALUATION_JOB_MAX_ATTEMPTS they are
+dead-lettered (status "dead") instead of being retried forever.
+
+At most one job per (interview_id, user_id) is active (queued or leased):
+active jobs carry `active: true`, which a partial unique index constrains, so
+concurrent enqueues join the same job instead of creating duplicates.
+"""
+
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.database.mongo_db import get_database
+from app.models.evaluation_job_model import EvaluationJobModel
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_JOB_VISIBILITY_SECONDS = int(os.getenv("EVALUATION_JOB_VISIBILITY_SECONDS", "300"))
+EVALUATION_JOB_MAX_ATTEMPTS = int(os.getenv("EVALUATION_JOB_MAX_ATTEMPTS", "3"))
+EVALUATION_JOB_BACKOFF_SECONDS = float(os.getenv("EVALUATION_JOB_BACKOFF_SECONDS", "30"))
+EVALUATION_JOB_MAX_BACKOFF_SECONDS = float(os.getenv("EVALUATION_JOB_MAX_BACKOFF_SECONDS", "1800"))
+# Upserts that lose an insert race retry and then find the winner's job
+ENQUEUE_ATTEMPTS = 3
+
+
+class JobQueue:
+    """Lease-based job queue on one Mongo collection."""
+
+    def __init__(self, collection_name: str = EvaluationJobModel.collection_name,
+                 visibility_seconds: int = EVALUATION_JOB_VISIBILITY_SECONDS,
+                 max_attempts: int = EVALUATION_JOB_MAX_ATTEMPTS):
+        self.collection_name = collection_name
+        self.visibility_seconds = visibility_seconds
+        self.max_attempts = max_attempts
+
+    def collection(self):
+        return get_database()[self.collection_name]
+
+    async def enqueue(self, interview_id: str, user_id: str, reuse_turn_results: bool = True) -> dict:
+        """
+        Queue an evaluation unless one is already queued or running.
+
+        Args:
+            interview_id: The interview ID
+            user_id: The user ID
+            reuse_turn_results: False re-scores every turn; a queued job
+                asked for by both kinds of caller does the full re-score
+
+        Returns:
+            The queued or already active job
+        """
+        document = EvaluationJobModel.create_document(interview_id, user_id, self.max_attempts)
+        for attempt in range(1, ENQUEUE_ATTEMPTS + 1):
+            try:
+                return await self.collection().find_one_and_update(
+                    {"interview_id": interview_id, "user_id": user_id, "active": True},
+                    {"$setOnInsert": document,
+                     # False wins over True, on insert and when joining a queued job
+                     "$min": {"reuse_turn_results": reuse_turn_results}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # A concurrent enqueue inserted the active job first
+                if attempt == ENQUEUE_ATTEMPTS:
+                    raise
+                logger.info(f"Concurrent enqueue for interview {interview_id}; joining the active job")
+
+    async def acquire(self, worker_id: str) -> dict | None:
+        """
+        Lease the next available job.
+
+        Returns:
+            The leased job, or None if nothing is available
+        """
+        now = datetime.utcnow()
+        return await self.collection().find_one_and_update(
+            {"$or": [
+                {"status": EvaluationJobModel.QUEUED, "available_at": {"$lte": now}},
+                # Lease of a crashed or hung worker ran out
+                {"status": EvaluationJobModel.LEASED, "lease_expires_at": {"$lte": now}}
+            ]},
+            {"$set": {"status": EvaluationJobModel.LEASED,
+                      "worker_id": worker_id,
+                      "lease_expires_at": now + timedelta(seconds=self.visibility_seconds),
+                      "updated_at": now},
+             "$inc": {"attempts": 1}},
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _owned(self, job: dict) -> dict:
+        """Filter matching a job only while this worker still holds its lease."""
+        return {"_id": job["_id"], "status": EvaluationJobModel.LEASED, "worker_id": job["worker_id"]}
+
+    async def extend_lease(self, job: dict) -> bool:
+        """Push the visibility timeout of a running job further out."""
+        now = datetime.utcnow()
+        result = await self.collection().update_one(
+            self._owned(job),
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.visibility_seconds), "updated_at": now}}
+        )
+        return result.modified_count == 1
+
+    async def complete(self, job: dict):
+        await self.collection().update_one(
+            self._owned(job),
+            {"$set": {"status": EvaluationJobModel.COMPLETED, "lease_expires_at": None,
+                      "last_error": None, "updated_at": datetime.utcnow()},
+             "$unset": {"active": ""}}
+        )
+
+    async def fail(self, job: dict, error: str) -> bool:
+        """
+        Record a failed attempt: retry later with backoff, or dead-letter.
+
+        Returns:
+            True if the job was dead-lettered
+        """
+        now = datetime.utcnow()
+        if job["attempts"] >= job.get("max_attempts", self.max_attempts):
+            update = {"status": EvaluationJobModel.DEAD}
+            dead = True
+        else:
+            delay = min(EVALUATION_JOB_MAX_BACKOFF_SECONDS,
+                        EVALUATION_JOB_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1))
+            # Jitter so jobs that failed together don't retry together
+            delay *= random.uniform(0.8, 1.2)
+            update = {"status": EvaluationJobModel.QUEUED, "available_at": now + timedelta(seconds=delay)}
+            dead = False
+
+        update.update({"lease_expires_at": None, "worker_id": None, "last_error": error, "updated_at": now})
+        # A dead job is no longer active, so the interview can be queued again
+        await self.collection().update_one(
+            self._owned(job), {"$set": update, **({"$unset": {"active": ""}} if dead else {})}
+        )
+        return dead
+
+    async def stalled_jobs(self, older_than_seconds: float) -> int:
+        """Queued jobs that have been available for longer than `older_than_seconds`."""
+        return await self.collection().count_documents({
+            "status": EvaluationJobModel.QUEUED,
+            "available_at": {"$lte": datetime.utcnow() - timedelta(seconds=older_than_seconds)}
+        })
+
+
+# Global evaluation job queue instance
+evaluation_queue = JobQueue()
@@ -0,0 +1,93 @@
+"""
+Background tasks for interview plan precomputation.
+
+When an interview is assigned, the opening question and a draft question plan
+are generated from the manager's instructions and the opening audio is
+rendered ahead of time. The first /interview/attend call then becomes a cache
+hit, and later turns adapt the stored plan.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from bson import ObjectId
+from langchain_community.chat_message_histories import ChatMessageHistory
+from app.database.mongo_db import get_database
+from app.services.attend_service import build_instructions_text, question_phrases
+from app.services.audio_service import render_audio
+from app.utils.llm_utils import generate_interview_plan, get_next_question
+
+logger = logging.getLogger(__name__)
+
+# Keep references so background tasks are not garbage collected mid-flight
+_background_tasks = set()
+
+
+class InterviewPlanTask:
+    """Precomputes the question plan and opening turn of an assigned interview."""
+
+    async def precompute(self, interview_id: str) -> bool:
+        """
+        Generate and store the plan for an interview.
+
+        Args:
+            interview_id: The interview's MongoDB _id
+
+        Returns:
+            True if the plan was stored, False otherwise
+        """
+        interviews_collection = get_database()["interviews"]
+        interview_oid = ObjectId(interview_id)
+
+        try:
+            interview = await interviews_collection.find_one({"_id": interview_oid})
+            if not interview:
+                logger.error(f"Cannot precompute plan, interview {interview_id} not found")
+                return False
+
+            instructions_text = build_instructions_text(interview)
+
+            # Plan and opening question are independent LLM calls
+            questions, opening_question = await asyncio.gather(
+                generate_interview_plan(instructions_text),
+                get_next_question(ChatMessageHistory(), instructions_text)
+            )
+
+            opening_audio_path = await render_audio(question_phrases(opening_question))
+
+            await interviews_collection.update_one(
+                {"_id": interview_oid},
+                {"$set": {"plan": {
+                    "status": "ready",
+                    "questions": questions,
+                    "opening_question": opening_question,
+                    "opening_audio_path": opening_audio_path,
+                    "created_at": datetime.utcnow().isoformat()
+                }}}
+            )
+
+            logger.info(f"✅ Plan precomputed for interview {interview_id} ({len(questions)} questions)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Plan precompute failed for interview {interview_id}: {e}", exc_info=True)
+            return False
+
+
+# Global plan task instance
+plan_task = InterviewPlanTask()
+
+
+async def trigger_plan_precompute(interview_id: str) -> None:
+    """
+    Trigger plan precomputation for a newly assigned interview.
+
+    Args:
+        interview_id: The interview's MongoDB _id
+    """
+    # Create background task (non-blocking)
+    task = asyncio.create_task(plan_task.precompute(interview_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    logger.info(f"Plan precompute queued for interview {interview_id}")
@@ -0,0 +1,139 @@
+"""
+Speech recognition engines.
+
+The engine is selected per deployment:
+
+    ASR_ENGINE        "whisper_timestamped" (default) or "faster_whisper"
+    ASR_MODEL_SIZE    Whisper model size, e.g. "tiny", "base", "small"
+    ASR_COMPUTE_TYPE  "float32" or "int8". int8 is only available with
+                      faster_whisper, where it selects the CTranslate2 int8
+                      kernels (its default). whisper_timestamped runs float32:
+                      torch dynamic quantization matches layers by exact type
+                      and skips Whisper's own Linear subclass, so it would
+                      leave the model in float32
+    ASR_THREADS       CPU threads used by the engine (0 keeps the library default)
+
+Every engine returns the whisper_timestamped result shape:
+
+    {"text": str,
+     "segments": [{"start", "end", "text",
+                   "words": [{"text", "start", "end", "confidence"}]}]}
+
+Audio is either a file path or 16 kHz mono float32 samples.
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ASR_ENGINE = os.getenv("ASR_ENGINE", "whisper_timestamped")
+ASR_MODEL_SIZE = os.getenv("ASR_MODEL_SIZE", "base")
+ASR_COMPUTE_TYPE = os.getenv("ASR_COMPUTE_TYPE", "")
+ASR_THREADS = int(os.getenv("ASR_THREADS", "0"))
+
+
+class ASREngine:
+    """Base class for speech recognition engines."""
+
+    name = "base"
+    default_compute_type = "float32"
+    compute_types = ("float32",)
+
+    def __init__(self, model_size: str = "base", compute_type: str = "", threads: int = 0):
+        self.model_size = model_size
+        self.compute_type = compute_type or self.default_compute_type
+        self.threads = threads
+        if self.compute_type not in self.compute_types:
+            hint = " Use ASR_ENGINE=faster_whisper for int8." if self.compute_type == "int8" else ""
+            raise ValueError(f"Unsupported compute type '{self.compute_type}' for {self.name}.{hint}")
+
+    def transcribe(self, audio, initial_prompt: str | None = None) -> dict:
+        raise NotImplementedError
+
+
+class WhisperTimestampedEngine(ASREngine):
+    """OpenAI Whisper through whisper_timestamped on torch."""
+
+    name = "whisper_timestamped"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        import torch
+        import whisper_timestamped as whisper
+
+        self._whisper = whisper
+        if self.threads:
+            torch.set_num_threads(self.threads)
+
+        self.model = whisper.load_model(self.model_size, device="cpu")
+
+    def transcribe(self, audio, initial_prompt: str | None = None) -> dict:
+        if isinstance(audio, str):
+            audio = self._whisper.load_audio(audio)
+        result = self._whisper.transcribe(self.model, audio, initial_prompt=initial_prompt)
+        return {"text": result["text"], "segments": result.get("segments", [])}
+
+
+class FasterWhisperEngine(ASREngine):
+    """CTranslate2 Whisper through faster_whisper, int8 on CPU by default."""
+
+    name = "faster_whisper"
+    default_compute_type = "int8"
+    compute_types = ("int8", "int8_float32", "float32")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("faster-whisper is not installed. Install it to use ASR_ENGINE=faster_whisper.")
+
+        self.model = WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.threads
+        )
+
+    def transcribe(self, audio, initial_prompt: str | None = None) -> dict:
+        segments, _ = self.model.transcribe(audio, word_timestamps=True, initial_prompt=initial_prompt)
+
+        result_segments = []
+        for segment in segments:
+            result_segments.append({
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "words": [
+                    {"text": w.word.strip(), "start": w.start, "end": w.end, "confidence": w.probability}
+                    for w in (segment.words or [])
+                ]
+            })
+
+        return {"text": "".join(s["text"] for s in result_segments), "segments": result_segments}
+
+
+ENGINES = {
+    WhisperTimestampedEngine.name: WhisperTimestampedEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+
+def create_asr_engine(name: str = ASR_ENGINE, model_size: str = ASR_MODEL_SIZE,
+                      compute_type: str = ASR_COMPUTE_TYPE, threads: int = ASR_THREADS) -> ASREngine:
+    """Create and load an ASR engine."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown ASR engine '{name}'. Available: {', '.join(ENGINES)}")
+    return ENGINES[name](model_size, compute_type, threads)
+
+
+# Load the engine once per process for better performance
+_asr_engine = None
+
+def get_asr_engine() -> ASREngine:
+    """Get or initialize the configured ASR engine (singleton pattern)"""
+    global _asr_engine
+    if _asr_engine is None:
+        _asr_engine = create_asr_engine()
+    return _asr_engine
@@ -0,0 +1,65 @@
+"""
+Answer audio ingest.
+
+Uploaded answers are decoded exactly once, in memory, into mono 16 kHz PCM.
+The same buffer feeds transcription and audio analysis, and a compact int16
+sidecar (`<answer path>.pcm16.npy`) is persisted next to the original upload
+so later readers (evaluation) can memory-map the samples instead of running
+ffmpeg again.
+"""
+
+import os
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+SIDECAR_SUFFIX = ".pcm16.npy"
+
+
+def decode_audio_bytes(data: bytes, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode any ffmpeg-readable audio held in memory to mono int16 PCM.
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode the data
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr),
+        "pipe:1"
+    ]
+    try:
+        out = subprocess.run(cmd, input=data, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, dtype=np.int16)
+
+
+def pcm16_to_float(pcm: np.ndarray) -> np.ndarray:
+    """Convert int16 samples to float32 in [-1, 1]."""
+    return pcm.astype(np.float32) / 32768.0
+
+
+def pcm_bytes_to_float(data: bytes) -> np.ndarray:
+    """Convert raw little-endian int16 PCM bytes to float32 samples."""
+    return pcm16_to_float(np.frombuffer(data, dtype=np.int16))
+
+
+def sidecar_path(audio_path: str) -> str:
+    return f"{audio_path}{SIDECAR_SUFFIX}"
+
+
+def write_sidecar(audio_path: str, pcm: np.ndarray) -> str:
+    """Persist int16 samples next to an answer file and return the sidecar path."""
+    path = sidecar_path(audio_path)
+    np.save(path, np.ascontiguousarray(pcm, dtype=np.int16))
+    return path
+
+
+def load_sidecar(audio_path: str) -> np.ndarray | None:
+    """Memory-map the int16 samples of an answer, or None if no sidecar exists."""
+    path = sidecar_path(audio_path)
+    if not audio_path or not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r")
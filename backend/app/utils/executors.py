@@ -0,0 +1,96 @@
+"""
+Bounded executors for blocking work.
+
+Whisper transcription is CPU-bound and runs in a small process pool so it
+never holds the GIL of the API worker. Background audio analysis gets its own
+process pool so it never queues in front of live transcription.
+Network/disk-bound helpers (gTTS, file writes) run in a bounded thread pool.
+All pools are created lazily and shut down from the application shutdown hook.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BLOCKING_THREAD_WORKERS = int(os.getenv("BLOCKING_THREAD_WORKERS", "8"))
+CPU_PROCESS_WORKERS = int(os.getenv("CPU_PROCESS_WORKERS", "2"))
+ANALYSIS_PROCESS_WORKERS = int(os.getenv("ANALYSIS_PROCESS_WORKERS", "1"))
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+_analysis_pool: ProcessPoolExecutor | None = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get or create the shared thread pool (singleton pattern)"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=BLOCKING_THREAD_WORKERS,
+            thread_name_prefix="blocking"
+        )
+    return _thread_pool
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get or create the shared process pool (singleton pattern)"""
+    global _process_pool
+    if _process_pool is None:
+        # Spawn instead of fork: torch is already imported in the parent
+        _process_pool = ProcessPoolExecutor(
+            max_workers=CPU_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+def get_analysis_pool() -> ProcessPoolExecutor:
+    """Get or create the background audio analysis pool (singleton pattern)"""
+    global _analysis_pool
+    if _analysis_pool is None:
+        _analysis_pool = ProcessPoolExecutor(
+            max_workers=ANALYSIS_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _analysis_pool
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """Run a blocking callable on the bounded thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(func, *args, **kwargs))
+
+
+async def run_in_process(func, *args, **kwargs):
+    """Run a CPU-bound, picklable callable on the bounded process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), functools.partial(func, *args, **kwargs))
+
+
+async def run_in_analysis_process(func, *args, **kwargs):
+    """Run a CPU-bound, picklable callable on the background analysis pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_analysis_pool(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Shut down all pools. Called on application shutdown."""
+    global _thread_pool, _process_pool, _analysis_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False, cancel_futures=True)
+        _analysis_pool = None
+    logger.info("Shut down blocking executors")
@@ -0,0 +1,211 @@
+"""
+Process-wide LLM client registry.
+
+Every agent gets its chat model from get_llm(role) instead of constructing a
+ChatOpenAI of its own. All models share one keep-alive HTTP connection pool,
+are created once per (role, model) and are warmed up at application startup,
+so no request pays for client construction or a fresh TLS handshake.
+
+Configuration (environment):
+    OPENAI_API_KEY, OPENAI_MODEL        key and default model for every role
+    LLM_<ROLE>_MODEL                    optional per-role model override
+    LLM_<ROLE>_TEMPERATURE              per-role temperature
+    LLM_<ROLE>_TIMEOUT_SECONDS          per-call timeout for the role
+    LLM_MAX_CONNECTIONS                 size of the shared connection pool
+    LLM_MAX_RETRIES                     retries per call on transient errors
+
+Roles: interviewer (live question generation), evaluator (answer scoring)
+and summarizer (evaluation summaries).
+
+Every call is admitted by the process-wide llm_scheduler (see
+app.utils.llm_scheduler) at its role's priority: interviewer calls are live
+turns, evaluator and summarizer calls are on-demand evaluation work. Its
+latency, token usage and cost are recorded in llm_metrics, tagged with the
+role as the agent (see app.utils.llm_metrics).
+"""
+
+import contextvars
+import logging
+import os
+import time
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from app.utils.llm_metrics import current_stage, llm_metrics
+from app.utils.llm_scheduler import LIVE, ON_DEMAND, effective_priority, llm_scheduler
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# Defaults match the temperatures each agent used before the registry existed
+ROLE_DEFAULTS = {
+    "interviewer": {"temperature": 0.7, "timeout": 20.0, "priority": LIVE},
+    "evaluator": {"temperature": 0.4, "timeout": 60.0, "priority": ON_DEMAND},
+    "summarizer": {"temperature": 0.5, "timeout": 60.0, "priority": ON_DEMAND},
+}
+
+# Token estimate used for admission, corrected with the reported usage afterwards
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 500
+
+_http_client: httpx.AsyncClient | None = None
+_models = {}
+
+# Set by _agenerate around its single awaited call, so a non-streaming call
+# that streams internally is not admitted twice. Never held across a yield:
+# the task consuming a stream must still admit its own other calls
+_admitted = contextvars.ContextVar("llm_admitted", default=False)
+
+
+def estimate_tokens(messages: list, max_tokens: int | None = None) -> int:
+    """Rough prompt plus completion tokens of a chat call."""
+    prompt_chars = sum(len(str(message.content)) for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or DEFAULT_OUTPUT_TOKENS)
+
+
+class ScheduledChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI whose calls wait for admission by the shared llm_scheduler
+    and are recorded in llm_metrics.
+    """
+
+    llm_role: str = "unknown"
+    llm_priority: int = ON_DEMAND
+
+    def _finish(self, stage: str, estimate: int, queue_wait: float, started: float, usage: dict,
+                error: str | None):
+        """Correct the scheduler's token estimate and record the call."""
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        llm_scheduler.record_usage(estimate, prompt_tokens + completion_tokens)
+        llm_metrics.record_call(
+            self.llm_role, stage, self.model_name, time.monotonic() - started, queue_wait,
+            prompt_tokens, completion_tokens, error
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if _admitted.get():
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        stage = current_stage()
+        estimate = estimate_tokens(messages, self.max_tokens)
+        queue_wait = await llm_scheduler.acquire(effective_priority(self.llm_priority), estimate)
+        token = _admitted.set(True)
+        started = time.monotonic()
+        try:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except Exception as e:
+            self._finish(stage, estimate, queue_wait, started, {}, str(e))
+            raise
+        finally:
+            _admitted.reset(token)
+        self._finish(stage, estimate, queue_wait, started, (result.llm_output or {}).get("token_usage") or {}, None)
+        return result
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if _admitted.get():
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+
+        stage = current_stage()
+        estimate = estimate_tokens(messages, self.max_tokens)
+        queue_wait = await llm_scheduler.acquire(effective_priority(self.llm_priority), estimate)
+        started = time.monotonic()
+        usage = {}
+        error = None
+        try:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                # With stream_usage the final chunk carries the call's usage
+                if getattr(chunk.message, "usage_metadata", None):
+                    usage = {"prompt_tokens": chunk.message.usage_metadata.get("input_tokens", 0),
+                             "completion_tokens": chunk.message.usage_metadata.get("output_tokens", 0)}
+                yield chunk
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            # Also runs when the consumer closes the stream early (client disconnect)
+            self._finish(stage, estimate, queue_wait, started, usage, error)
+
+
+def role_config(role: str) -> dict:
+    """Resolved model, temperature, timeout and scheduling priority for a role."""
+    if role not in ROLE_DEFAULTS:
+        raise ValueError(f"Unknown LLM role '{role}'. Available: {', '.join(ROLE_DEFAULTS)}")
+    prefix = f"LLM_{role.upper()}_"
+    defaults = ROLE_DEFAULTS[role]
+    return {
+        "model": os.getenv(f"{prefix}MODEL", OPENAI_MODEL),
+        "temperature": float(os.getenv(f"{prefix}TEMPERATURE", defaults["temperature"])),
+        "timeout": float(os.getenv(f"{prefix}TIMEOUT_SECONDS", defaults["timeout"])),
+        "priority": defaults["priority"],
+    }
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared keep-alive HTTP client (singleton pattern)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS
+            )
+        )
+    return _http_client
+
+
+def get_llm(role: str, model: str | None = None) -> ScheduledChatOpenAI:
+    """
+    Get the shared chat model for a role.
+
+    Args:
+        role: "interviewer", "evaluator" or "summarizer"
+        model: Optional model override; defaults to the role's configured model
+    """
+    config = role_config(role)
+    model = model or config["model"]
+    key = (role, model)
+    if key not in _models:
+        _models[key] = ScheduledChatOpenAI(
+            llm_role=role,
+            llm_priority=config["priority"],
+            model=model,
+            temperature=config["temperature"],
+            api_key=OPENAI_API_KEY,
+            timeout=config["timeout"],
+            max_retries=LLM_MAX_RETRIES,
+            # Report token usage on streamed calls too
+            stream_usage=True,
+            http_async_client=get_http_client()
+        )
+    return _models[key]
+
+
+async def warm_up_llm_clients():
+    """Create every role's model and open a pooled connection to the API."""
+    for role in ROLE_DEFAULTS:
+        get_llm(role)
+    try:
+        await get_llm("interviewer").root_async_client.models.list()
+        logger.info("LLM clients warmed up")
+    except Exception as e:
+        # A failed warm-up only means the first call opens the connection itself
+        logger.warning(f"LLM warm-up failed: {e}")
+
+
+async def close_llm_clients():
+    """Close the shared connection pool. Called on application shutdown."""
+    global _http_client
+    _models.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Closed LLM HTTP client")
@@ -0,0 +1,187 @@
+"""
+Per-call instrumentation of LLM calls.
+
+Every call made through a model from app.utils.llm_client is recorded here,
+tagged by agent (the model's role), stage and model:
+
+    latency        call latency histogram and admission wait in llm_scheduler
+    tokens         prompt and completion tokens reported by the API
+    cost           estimated from MODEL_PRICES (USD per million tokens)
+    failures       API errors and responses that could not be parsed
+
+The stage names what the call was for (e.g. "answer_evaluation") and is set
+around the call with `llm_stage(...)`. Each call is also written as one JSON
+log line on the `app.llm` logger, and the aggregates are served by
+GET /metrics/llm. Counters are per process.
+
+Configuration (environment):
+    LLM_MODEL_PRICES    JSON object overriding or adding prices, e.g.
+                        {"gpt-4o-mini": [0.15, 0.6]} (input, output per 1M tokens)
+"""
+
+import contextvars
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger("app.llm")
+
+# USD per million (prompt, completion) tokens; model names match by longest prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+MODEL_PRICES.update({model: tuple(price) for model, price in
+                     json.loads(os.getenv("LLM_MODEL_PRICES", "{}")).items()})
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, float("inf"))
+
+_stage = contextvars.ContextVar("llm_stage", default="unspecified")
+
+
+@contextmanager
+def llm_stage(name: str):
+    """Tag the LLM calls of a block with the stage `name`."""
+    token = _stage.set(name)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+def current_stage() -> str:
+    return _stage.get()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """Estimated USD cost of a call, or None if the model has no known price."""
+    matches = [name for name in MODEL_PRICES if model == name or model.startswith(name + "-")]
+    if not matches:
+        return None
+    prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class LLMMetrics:
+    """Latency histograms, token, cost and failure counters per (agent, stage, model)."""
+
+    def __init__(self):
+        self._series = {}
+
+    def _get(self, agent: str, stage: str, model: str) -> dict:
+        key = (agent, stage, model)
+        if key not in self._series:
+            self._series[key] = {
+                "calls": 0,
+                "errors": 0,
+                "parse_failures": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "latency_seconds_total": 0.0,
+                "latency_seconds_max": 0.0,
+                "latency_buckets": [0] * len(LATENCY_BUCKETS),
+                "queue_wait_seconds_total": 0.0
+            }
+        return self._series[key]
+
+    def record_call(self, agent: str, stage: str, model: str, latency: float, queue_wait: float = 0.0,
+                    prompt_tokens: int = 0, completion_tokens: int = 0, error: str | None = None):
+        """
+        Record one finished LLM call.
+
+        Args:
+            agent: Role of the model that made the call
+            stage: Stage the call was made in (current_stage() when it started)
+            model: Model name
+            latency: Seconds from admission to the complete response
+            queue_wait: Seconds the call waited for admission
+            prompt_tokens, completion_tokens: Usage reported by the API
+            error: Error message if the call failed
+        """
+        series = self._get(agent, stage, model)
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+        series["calls"] += 1
+        series["errors"] += 1 if error else 0
+        series["prompt_tokens"] += prompt_tokens
+        series["completion_tokens"] += completion_tokens
+        series["cost_usd"] += cost or 0.0
+        series["latency_seconds_total"] += latency
+        series["latency_seconds_max"] = max(series["latency_seconds_max"], latency)
+        series["latency_buckets"][next(i for i, bound in enumerate(LATENCY_BUCKETS) if latency <= bound)] += 1
+        series["queue_wait_seconds_total"] += queue_wait
+
+        logger.info(json.dumps({
+            "event": "llm_call",
+            "agent": agent,
+            "stage": stage,
+            "model": model,
+            "latency_seconds": round(latency, 4),
+            "queue_wait_seconds": round(queue_wait, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6) if cost is not None else None,
+            "error": error
+        }))
+
+    def record_parse_failure(self, agent: str, model: str, reason: str = ""):
+        """Record a response of the current stage that could not be parsed."""
+        stage = current_stage()
+        self._get(agent, stage, model)["parse_failures"] += 1
+        logger.warning(json.dumps({
+            "event": "llm_parse_failure",
+            "agent": agent,
+            "stage": stage,
+            "model": model,
+            "reason": reason[:200]
+        }))
+
+    def stats(self) -> dict:
+        """Aggregates per series plus totals."""
+        series = []
+        for (agent, stage, model), values in sorted(self._series.items()):
+            calls = values["calls"]
+            series.append({
+                "agent": agent,
+                "stage": stage,
+                "model": model,
+                "calls": calls,
+                "errors": values["errors"],
+                "parse_failures": values["parse_failures"],
+                "parse_failure_rate": round(values["parse_failures"] / calls, 4) if calls else 0.0,
+                "prompt_tokens": values["prompt_tokens"],
+                "completion_tokens": values["completion_tokens"],
+                "cost_usd": round(values["cost_usd"], 6),
+                "latency_seconds": {
+                    "avg": round(values["latency_seconds_total"] / calls, 4) if calls else 0.0,
+                    "max": round(values["latency_seconds_max"], 4),
+                    "buckets": {("+Inf" if bound == float("inf") else str(bound)): count
+                                for bound, count in zip(LATENCY_BUCKETS, values["latency_buckets"])}
+                },
+                "queue_wait_seconds_avg": round(values["queue_wait_seconds_total"] / calls, 4) if calls else 0.0
+            })
+        return {
+            "totals": {
+                "calls": sum(s["calls"] for s in series),
+                "errors": sum(s["errors"] for s in series),
+                "parse_failures": sum(s["parse_failures"] for s in series),
+                "prompt_tokens": sum(s["prompt_tokens"] for s in series),
+                "completion_tokens": sum(s["completion_tokens"] for s in series),
+                "cost_usd": round(sum(s["cost_usd"] for s in series), 6)
+            },
+            "series": series
+        }
+
+
+# Global LLM metrics instance
+llm_metrics = LLMMetrics()
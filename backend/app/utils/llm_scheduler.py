@@ -0,0 +1,156 @@
+"""
+Process-wide admission scheduler for LLM calls.
+
+Every chat model handed out by app.utils.llm_client passes through
+llm_scheduler before calling the API. The scheduler keeps a requests-per-
+minute and a tokens-per-minute bucket for the shared OpenAI quota and admits
+waiting calls strictly by priority class:
+
+    LIVE       live interview turns (question generation, rolling summaries)
+    ON_DEMAND  evaluations a user is waiting for, turn scoring
+    BULK       bulk re-evaluation
+
+Lower classes may not dip into the last LLM_LIVE_RESERVE fraction of either
+bucket, so a burst of evaluations never leaves a candidate mid-interview
+waiting for quota. The priority of a call comes from its model's role and can
+be lowered for a whole block of work with `llm_priority(BULK)`.
+
+Queue depth, admissions and wait times are tracked per class (stats(),
+served by GET /metrics/llm).
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from app.utils.rate_limit import TokenBucket
+
+load_dotenv()
+
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+LLM_LIVE_RESERVE = float(os.getenv("LLM_LIVE_RESERVE", "0.1"))
+
+LIVE = 0
+ON_DEMAND = 1
+BULK = 2
+PRIORITY_NAMES = {LIVE: "live", ON_DEMAND: "on_demand", BULK: "bulk"}
+
+# Priority forced on every call made inside an llm_priority() block
+_priority_override = contextvars.ContextVar("llm_priority_override", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run the LLM calls of a block (and the tasks it spawns) at `priority`."""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def effective_priority(default: int) -> int:
+    override = _priority_override.get()
+    return default if override is None else override
+
+
+class LLMScheduler:
+    """Priority admission in front of a request and a token bucket."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 live_reserve: float = 0.0, enabled: bool = True):
+        self.enabled = enabled
+        self.live_reserve = live_reserve
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._waiters = []  # heap of (priority, seq, tokens, enqueued_at, future)
+        self._seq = itertools.count()
+        self._timer = None
+        self._metrics = {
+            name: {"waiting": 0, "admitted": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    async def acquire(self, priority: int, tokens: float) -> float:
+        """
+        Wait until a call of `priority` using about `tokens` tokens may run.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, time.monotonic(), future))
+        self._metrics[PRIORITY_NAMES[priority]]["waiting"] += 1
+        self._dispatch()
+        # A cancelled caller cancels its future; the dispatcher drops it
+        return await future
+
+    def record_usage(self, estimated: float, actual: float):
+        """Correct the token bucket once a call reports its real usage."""
+        if self.enabled and actual:
+            self.tokens.take(actual - estimated)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            priority, _, tokens, enqueued_at, future = self._waiters[0]
+            metrics = self._metrics[PRIORITY_NAMES[priority]]
+            if future.done():
+                heapq.heappop(self._waiters)
+                metrics["waiting"] -= 1
+                continue
+
+            # Strict priority: nothing overtakes the head of the queue
+            reserve = 0.0 if priority == LIVE else self.live_reserve
+            delay = max(self.requests.wait_time(1, reserve), self.tokens.wait_time(tokens, reserve))
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            waited = time.monotonic() - enqueued_at
+            metrics["waiting"] -= 1
+            metrics["admitted"] += 1
+            metrics["wait_seconds_total"] += waited
+            metrics["wait_seconds_max"] = max(metrics["wait_seconds_max"], waited)
+            future.set_result(waited)
+
+    def stats(self) -> dict:
+        """Queue depth and wait-time metrics per priority class."""
+        classes = {}
+        for name, metrics in self._metrics.items():
+            admitted = metrics["admitted"]
+            classes[name] = {
+                "queue_depth": metrics["waiting"],
+                "admitted": admitted,
+                "wait_seconds_avg": round(metrics["wait_seconds_total"] / admitted, 4) if admitted else 0.0,
+                "wait_seconds_max": round(metrics["wait_seconds_max"], 4)
+            }
+        return {
+            "enabled": self.enabled,
+            "requests_available": round(self.requests.level, 2),
+            "tokens_available": round(self.tokens.level, 2),
+            "classes": classes
+        }
+
+
+# Global LLM scheduler instance
+llm_scheduler = LLMScheduler(
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+    live_reserve=LLM_LIVE_RESERVE,
+    enabled=LLM_SCHEDULER_ENABLED
+)
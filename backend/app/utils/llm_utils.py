@@ -1,15 +1,10 @@
-from langchain_openai import ChatOpenAI
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.prompts import ChatPromptTemplate
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-
-llm = ChatOpenAI(model=OPENAI_MODEL, api_key=OPENAI_API_KEY)
+from app.utils.llm_client import get_llm
+from app.utils.llm_metrics import llm_metrics, llm_stage
+from app.utils.llm_scheduler import LIVE, llm_priority
+import json
+import re
 
 SYSTEM_PROMPT = """You are a professional, conversational AI interviewer conducting a technical interview.
 
@@ -43,17 +38,91 @@ Manager's Instructions:
 {interview_instructions}
 """
 
-def get_next_question(chat_history: ChatMessageHistory, interview_instructions: str):
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
-        ("placeholder", "{chat_history}"),
-        ("user", "Based on the previous conversation, ask the next interview question.")
-    ])
+PLAN_PROMPT = """You are preparing a technical interview before it starts.
+
+Based on the manager's instructions below, draft an ordered plan of interview questions.
+- Respect the number of questions if the manager specifies one; otherwise plan 5 to 8 questions
+- Start with fundamentals and gradually increase difficulty
+- Cover every listed tech stack
+- Keep each question clear and concise (1-2 sentences)
+
+Manager's Instructions:
+{interview_instructions}
+
+Your response must be valid JSON only, with no explanations outside the JSON:
+{{"questions": ["...", "..."]}}
+"""
+
+SUMMARY_PROMPT = """You maintain a running summary of a technical interview for the interviewer.
 
-    messages = prompt.format_messages(
+Current summary of the earlier conversation:
+{summary}
+
+New exchanges to fold into the summary:
+{transcript}
+
+Write the updated summary in at most 200 words. Keep every topic and question already covered,
+the candidate's demonstrated strengths and weaknesses, any questions they skipped, and how many
+questions have been asked so far. Return only the summary text.
+"""
+
+# Templates are compiled once at import instead of on every call
+INTERVIEWER_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    ("placeholder", "{conversation_summary}"),
+    ("placeholder", "{chat_history}"),
+    ("user", "Based on the previous conversation, ask the next interview question.")
+])
+PLAN_TEMPLATE = ChatPromptTemplate.from_template(PLAN_PROMPT)
+SUMMARY_TEMPLATE = ChatPromptTemplate.from_template(SUMMARY_PROMPT)
+
+def _build_messages(chat_history: ChatMessageHistory, interview_instructions: str, summary: str | None = None):
+    # Older turns are represented by a rolling summary when one is provided
+    conversation_summary = []
+    if summary:
+        conversation_summary = [("system", f"Summary of the earlier part of the interview:\n{summary}")]
+
+    return INTERVIEWER_TEMPLATE.format_messages(
         interview_instructions=interview_instructions,
+        conversation_summary=conversation_summary,
         chat_history=chat_history.messages
     )
 
-    response = llm.invoke(messages)
-    return response.content
\ No newline at end of file
+async def get_next_question(chat_history: ChatMessageHistory, interview_instructions: str, summary: str | None = None):
+    messages = _build_messages(chat_history, interview_instructions, summary)
+    with llm_stage("next_question"):
+        response = await get_llm("interviewer").ainvoke(messages)
+    return response.content
+
+async def stream_next_question(chat_history: ChatMessageHistory, interview_instructions: str, summary: str | None = None):
+    """Yield the next question as text deltas while the model produces it."""
+    messages = _build_messages(chat_history, interview_instructions, summary)
+    with llm_stage("next_question"):
+        async for chunk in get_llm("interviewer").astream(messages):
+            if chunk.content:
+                yield chunk.content
+
+async def generate_interview_plan(interview_instructions: str) -> list:
+    """Draft an ordered list of planned questions for an interview."""
+    llm = get_llm("interviewer")
+    with llm_stage("interview_plan"):
+        response = await llm.ainvoke(PLAN_TEMPLATE.format_messages(interview_instructions=interview_instructions))
+        response_text = re.sub(r'^```json|```$', '', response.content.strip()).strip()
+        try:
+            questions = json.loads(response_text).get("questions", [])
+        except (json.JSONDecodeError, AttributeError) as e:
+            llm_metrics.record_parse_failure(llm.llm_role, llm.model_name, str(e))
+            return []
+    return [q for q in questions if isinstance(q, str) and q.strip()]
+
+async def summarize_conversation(summary: str | None, messages: list) -> str:
+    """Fold interview messages into the rolling conversation summary."""
+    transcript = "\n".join(
+        f"{'Interviewer' if m.type == 'ai' else 'Candidate'}: {m.content}" for m in messages
+    )
+    # Part of a running interview, so it is scheduled like a live turn
+    with llm_priority(LIVE), llm_stage("conversation_summary"):
+        response = await get_llm("summarizer").ainvoke(
+            SUMMARY_TEMPLATE.format_messages(summary=summary or "(none yet)", transcript=transcript)
+        )
+    return response.content.strip()
@@ -0,0 +1,105 @@
+"""
+Rate budgets for calls to rate-limited APIs.
+
+RateBudget holds two token buckets, one for requests per minute and one for
+tokens per minute, refilled continuously. acquire() waits until both can pay
+for a unit of work, so a batch of work never exceeds the provider's limits
+no matter how many tasks share the budget.
+
+AdaptiveLimiter bounds concurrency and adapts it (additive increase,
+multiplicative decrease): every `limit` successes it allows one more task in
+flight, and a throttling signal from the provider halves it.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Continuously refilled bucket; `capacity` units per `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until `amount` units are available (0 if they are now).
+
+        Args:
+            amount: Units needed
+            reserve: Fraction of the capacity that must stay in the bucket
+                afterwards (held back for higher-priority work)
+        """
+        self._refill()
+        # Work larger than the whole bucket may run once the bucket is full
+        needed = min(amount + reserve * self.capacity, self.capacity)
+        return max(0.0, (needed - self.level) / self.rate)
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+
+class RateBudget:
+    """Requests-per-minute and tokens-per-minute budget shared by many tasks."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, requests: float = 1, tokens: float = 0):
+        """Wait until the budget can pay for `requests` calls using `tokens` tokens."""
+        # One waiter at a time, so large work is not starved by small work
+        async with self._lock:
+            while True:
+                delay = max(self.requests.wait_time(requests), self.tokens.wait_time(tokens))
+                if delay <= 0:
+                    self.requests.take(requests)
+                    self.tokens.take(tokens)
+                    return
+                await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that grows on success and halves on throttling."""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 32):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    async def on_success(self):
+        async with self._condition:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    async def on_throttle(self):
+        async with self._condition:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
@@ -1,26 +1,19 @@
-import os
-import tempfile
-import whisper_timestamped as whisper
-from gtts import gTTS
-import torch
+from app.utils.asr import get_asr_engine
+from app.utils.vad import VAD_ENABLED, compact_speech
 
-# Load Whisper model once at module level for better performance
-_whisper_model = None
+def transcribe_samples(samples, initial_prompt: str | None = None) -> str:
+    """Transcribe 16 kHz mono float32 samples already held in memory."""
+    return get_asr_engine().transcribe(samples, initial_prompt=initial_prompt)["text"]
 
-def get_whisper_model():
-    """Get or initialize the Whisper model (singleton pattern)"""
-    global _whisper_model
-    if _whisper_model is None:
-        _whisper_model = whisper.load_model("base", device="cpu")
-    return _whisper_model
+def transcribe_speech(samples, initial_prompt: str | None = None, sr: int = 16000) -> str | None:
+    """
+    Transcribe samples after trimming non-speech with VAD.
 
-def transcribe_audio(audio_path: str) -> str:
-    model = get_whisper_model()  # Reuse loaded model
-    audio = whisper.load_audio(audio_path)
-    result = whisper.transcribe(model, audio)
-    return result["text"]
-
-def text_to_speech(text: str, output_path: str):
-    tts = gTTS(text)
-    tts.save(output_path)
-    return output_path
\ No newline at end of file
+    Returns:
+        The transcript, or None if the samples hold no speech.
+    """
+    if VAD_ENABLED:
+        samples = compact_speech(samples, sr)
+        if samples is None:
+            return None
+    return transcribe_samples(samples, initial_prompt=initial_prompt)
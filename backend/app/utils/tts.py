@@ -0,0 +1,195 @@
+"""
+Text-to-speech engines and a content-addressed audio cache.
+
+The engine is selected with TTS_ENGINE ("gtts" by default, or "pyttsx3" for
+a local offline engine) and TTS_VOICE (a gTTS language code, or a pyttsx3
+voice id). Rendered audio is stored under TTS_CACHE_DIR with a file name
+derived from a hash of (engine, voice, phrases), so identical text is only
+ever synthesized once. Multi-phrase audio is assembled from individually
+cached phrases, so fixed phrases such as the skip transition are rendered a
+single time and reused in front of every new question.
+
+Next to each scheduled render, a `<file>.phrases.json` manifest records the
+phrases it is made of, so any process sharing TTS_CACHE_DIR can render a
+file on demand, also after a restart.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import uuid
+import wave
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TTS_ENGINE = os.getenv("TTS_ENGINE", "gtts")
+TTS_VOICE = os.getenv("TTS_VOICE", "")
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join("audios", "tts"))
+
+
+class TTSEngine:
+    """Base class for text-to-speech engines."""
+
+    name = "base"
+    extension = "mp3"
+    media_type = "audio/mpeg"
+
+    def __init__(self, voice: str = ""):
+        self.voice = voice
+
+    def synthesize(self, text: str) -> bytes:
+        raise NotImplementedError
+
+    def concat(self, parts: list) -> bytes:
+        # MP3 is a sequence of self-contained frames, so byte concatenation plays back in order
+        return b"".join(parts)
+
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS (network)."""
+
+    name = "gtts"
+
+    def synthesize(self, text: str) -> bytes:
+        from gtts import gTTS
+
+        tts = gTTS(text, lang=self.voice or "en")
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class Pyttsx3Engine(TTSEngine):
+    """Local offline TTS through pyttsx3 (espeak/SAPI/NSSpeech)."""
+
+    name = "pyttsx3"
+    extension = "wav"
+    media_type = "audio/wav"
+
+    # pyttsx3 drives a single native engine and is not thread-safe
+    _lock = threading.Lock()
+
+    def synthesize(self, text: str) -> bytes:
+        try:
+            import pyttsx3
+        except ImportError:
+            raise RuntimeError("pyttsx3 is not installed. Install it to use TTS_ENGINE=pyttsx3.")
+
+        with self._lock:
+            engine = pyttsx3.init()
+            if self.voice:
+                engine.setProperty("voice", self.voice)
+            fd, tmp_path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                engine.save_to_file(text, tmp_path)
+                engine.runAndWait()
+                with open(tmp_path, "rb") as f:
+                    return f.read()
+            finally:
+                os.remove(tmp_path)
+
+    def concat(self, parts: list) -> bytes:
+        output = io.BytesIO()
+        with wave.open(output, "wb") as out:
+            for i, part in enumerate(parts):
+                with wave.open(io.BytesIO(part), "rb") as wav:
+                    if i == 0:
+                        out.setparams(wav.getparams())
+                    out.writeframes(wav.readframes(wav.getnframes()))
+        return output.getvalue()
+
+
+ENGINES = {
+    GTTSEngine.name: GTTSEngine,
+    Pyttsx3Engine.name: Pyttsx3Engine,
+}
+
+
+def get_tts_engine(name: str = TTS_ENGINE, voice: str = TTS_VOICE) -> TTSEngine:
+    """Create the configured TTS engine."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine '{name}'. Available: {', '.join(ENGINES)}")
+    return ENGINES[name](voice)
+
+
+class AudioCache:
+    """Content-addressed store of rendered audio."""
+
+    def __init__(self, engine: TTSEngine, directory: str = TTS_CACHE_DIR):
+        self.engine = engine
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def filename(self, phrases: list) -> str:
+        """File name for a sequence of phrases under the current engine and voice."""
+        payload = json.dumps([self.engine.name, self.engine.voice, phrases], ensure_ascii=False)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{digest}.{self.engine.extension}"
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory, os.path.basename(filename))
+
+    def _write(self, path: str, data: bytes):
+        # Write to a temporary name first so readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def manifest_path(self, filename: str) -> str:
+        return f"{self.path(filename)}.phrases.json"
+
+    def remember(self, phrases: list) -> str:
+        """Record the phrases behind a file name and return the file name."""
+        filename = self.filename(phrases)
+        manifest = self.manifest_path(filename)
+        if not os.path.exists(manifest):
+            self._write(manifest, json.dumps(phrases, ensure_ascii=False).encode("utf-8"))
+        return filename
+
+    def phrases(self, filename: str) -> list | None:
+        """Phrases recorded for a file name, or None if it was never scheduled."""
+        try:
+            return json.loads(self._read(self.manifest_path(filename)))
+        except (OSError, ValueError):
+            return None
+
+    def synthesize(self, text: str) -> bytes:
+        """Audio bytes for a single phrase, synthesized at most once."""
+        path = self.path(self.filename([text]))
+        if os.path.exists(path):
+            return self._read(path)
+        data = self.engine.synthesize(text)
+        self._write(path, data)
+        return data
+
+    def render(self, phrases: list) -> str:
+        """Render phrases into one cached file and return its file name."""
+        filename = self.filename(phrases)
+        path = self.path(filename)
+        if not os.path.exists(path):
+            if len(phrases) == 1:
+                self.synthesize(phrases[0])
+            else:
+                self._write(path, self.engine.concat([self.synthesize(p) for p in phrases]))
+        return filename
+
+
+# Load the cache once at module level
+_audio_cache = None
+
+def get_audio_cache() -> AudioCache:
+    """Get or initialize the audio cache for the configured engine (singleton pattern)"""
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = AudioCache(get_tts_engine())
+    return _audio_cache
@@ -0,0 +1,116 @@
+"""
+Energy-based voice activity detection on 16 kHz mono float32 samples.
+
+All per-frame work is vectorized with NumPy: samples are framed into 20 ms
+windows, frame energy is compared against an adaptive threshold (the noise
+floor estimated from the quietest frames plus a margin, when the recording
+has enough dynamic range to tell pauses from speech), and the speech mask
+is dilated by a short hangover so word edges are not clipped. Speech regions
+separated by pauses longer than VAD_MAX_PAUSE_SECONDS are split apart, and
+compact_speech() joins them with a short gap, so Whisper only sees speech.
+"""
+
+import os
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_MAX_PAUSE_SECONDS = float(os.getenv("VAD_MAX_PAUSE_SECONDS", "1.0"))
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("VAD_MIN_SPEECH_SECONDS", "0.3"))
+
+FRAME_SECONDS = 0.02
+HANGOVER_SECONDS = 0.2
+JOIN_GAP_SECONDS = 0.3
+NOISE_PERCENTILE = 10
+LOUD_PERCENTILE = 90
+MARGIN_DB = 12.0
+ABSOLUTE_FLOOR_DB = -50.0
+
+
+def frame_energy_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    """Mean energy of each full frame, in dB."""
+    n_frames = len(samples) // frame
+    frames = np.asarray(samples[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    return 10.0 * np.log10(energy + 1e-10)
+
+
+def speech_threshold(db: np.ndarray) -> float:
+    """Frame energy (dB) above which a frame counts as speech."""
+    noise, loud = np.percentile(db, [NOISE_PERCENTILE, LOUD_PERCENTILE])
+    if loud - noise < MARGIN_DB:
+        # No pauses to estimate the noise floor from (continuous speech, or
+        # silence throughout): only the absolute floor separates the two
+        return ABSOLUTE_FLOOR_DB
+    return max(ABSOLUTE_FLOOR_DB, float(noise) + MARGIN_DB)
+
+
+def speech_mask(samples: np.ndarray, sr: int) -> np.ndarray:
+    """Boolean speech flag per FRAME_SECONDS frame."""
+    frame = int(FRAME_SECONDS * sr)
+    db = frame_energy_db(samples, frame)
+    if len(db) == 0:
+        return np.zeros(0, dtype=bool)
+
+    mask = db > speech_threshold(db)
+
+    # Hangover: extend speech by a few frames on both sides
+    hangover = int(HANGOVER_SECONDS / FRAME_SECONDS)
+    if hangover and mask.any():
+        mask = np.convolve(mask, np.ones(2 * hangover + 1), mode="same") > 0
+    return mask
+
+
+def speech_segments(samples: np.ndarray, sr: int) -> list:
+    """
+    Speech regions as (start, end) sample indices.
+
+    Regions separated by less than VAD_MAX_PAUSE_SECONDS are merged, so the
+    result is split only on long pauses.
+    """
+    mask = speech_mask(samples, sr)
+    if not mask.any():
+        return []
+
+    frame = int(FRAME_SECONDS * sr)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+
+    max_pause = int(VAD_MAX_PAUSE_SECONDS / FRAME_SECONDS)
+    segments = [[starts[0], ends[0]]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - segments[-1][1] < max_pause:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+
+    return [(int(s) * frame, min(len(samples), int(e) * frame)) for s, e in segments]
+
+
+def compact_speech(samples: np.ndarray, sr: int) -> np.ndarray | None:
+    """
+    Speech-only samples: leading/trailing silence trimmed and long pauses
+    shortened to JOIN_GAP_SECONDS.
+
+    Returns:
+        The compacted samples; the full samples if no clear speech region was
+        found but the audio is not silent (better a transcript than a lost
+        answer); None only if the audio is silent throughout.
+    """
+    segments = speech_segments(samples, sr)
+    speech = sum(end - start for start, end in segments)
+    if speech < VAD_MIN_SPEECH_SECONDS * sr:
+        db = frame_energy_db(samples, int(FRAME_SECONDS * sr))
+        if len(db) == 0 or db.max() <= ABSOLUTE_FLOOR_DB:
+            return None
+        return np.asarray(samples, dtype=np.float32)
+
+    gap = np.zeros(int(JOIN_GAP_SECONDS * sr), dtype=np.float32)
+    parts = []
+    for i, (start, end) in enumerate(segments):
+        if i:
+            parts.append(gap)
+        parts.append(np.asarray(samples[start:end], dtype=np.float32))
+    return np.concatenate(parts)
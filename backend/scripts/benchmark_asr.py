@@ -0,0 +1,77 @@
+"""
+Benchmark ASR engine configurations against each other.
+
+Each configuration is given as engine:model_size:compute_type, for example:
+
+    python scripts/benchmark_asr.py audios/*.wav \
+        --config whisper_timestamped:base:float32 \
+        --config faster_whisper:base:float32 \
+        --config faster_whisper:base:int8 \
+        --threads 4
+
+For every configuration the script reports the model load time, the total
+transcription time, the real-time factor (processing time / audio duration)
+and the transcripts, so a speed/accuracy point can be chosen per deployment.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.asr import create_asr_engine
+
+SAMPLE_RATE = 16000
+
+
+def load_samples(path: str):
+    import whisper_timestamped as whisper
+
+    return whisper.load_audio(path)
+
+
+def benchmark(config: str, files: list, samples: list, threads: int):
+    name, model_size, compute_type = (config.split(":") + ["", ""])[:3]
+
+    start = time.perf_counter()
+    engine = create_asr_engine(name, model_size or "base", compute_type, threads)
+    load_time = time.perf_counter() - start
+
+    audio_seconds = sum(len(s) for s in samples) / SAMPLE_RATE
+    transcripts = []
+    start = time.perf_counter()
+    for audio in samples:
+        transcripts.append(engine.transcribe(audio)["text"].strip())
+    total = time.perf_counter() - start
+
+    print(f"\n=== {config} ===")
+    print(f"Load time:        {load_time:.2f}s")
+    print(f"Transcribe time:  {total:.2f}s for {audio_seconds:.1f}s of audio")
+    print(f"Real-time factor: {total / audio_seconds:.3f}" if audio_seconds else "Real-time factor: n/a")
+    for path, text in zip(files, transcripts):
+        print(f"  {Path(path).name}: {text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ASR engines")
+    parser.add_argument("files", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--config", action="append", required=True,
+                        help="engine:model_size:compute_type (repeatable)")
+    parser.add_argument("--threads", type=int, default=0, help="CPU threads per engine")
+    args = parser.parse_args()
+
+    # Decode once so every engine sees identical input and decode time is excluded
+    samples = [load_samples(f) for f in args.files]
+
+    for config in args.config:
+        try:
+            benchmark(config, args.files, samples, args.threads)
+        except Exception as e:
+            print(f"\n❌ {config} failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Re-evaluate stored interviews in bulk, e.g. after an evaluation prompt or model change.
+
+    python scripts/bulk_reevaluate.py --status completed --since 2025-01-01 \
+        --rpm 300 --tpm 150000 --concurrency 8
+
+    # Continue an interrupted run from its last checkpoint (a run whose
+    # process died can be resumed once its lease has expired)
+    python scripts/bulk_reevaluate.py --resume <run_id>
+
+Progress is checkpointed after every batch in the bulk_reevaluation_runs
+collection; the run id is printed at the start.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.mongo_db import connect_to_mongo, close_mongo_connection, get_database
+from app.operations.bulk_reevaluation_service import (
+    BulkReevaluationService,
+    BULK_REQUESTS_PER_MINUTE,
+    BULK_TOKENS_PER_MINUTE,
+    BULK_MAX_CONCURRENCY,
+    BULK_BATCH_SIZE,
+)
+from app.utils.executors import shutdown_executors
+from app.utils.llm_client import warm_up_llm_clients, close_llm_clients
+
+
+async def main(args):
+    await connect_to_mongo()
+    await warm_up_llm_clients()
+    try:
+        service = BulkReevaluationService(
+            get_database(),
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            max_concurrency=args.concurrency,
+            batch_size=args.batch_size
+        )
+        run_id = args.resume or await service.create_run({
+            "since": args.since,
+            "until": args.until,
+            "manager_id": args.manager,
+            "status": args.status
+        })
+        print(f"Bulk re-evaluation run: {run_id}")
+
+        try:
+            run = await service.run(run_id)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print(f"\nRun {run['status']}: {run['processed']} processed, "
+              f"{run['succeeded']} succeeded, {run['failed']} failed, {run.get('skipped', 0)} skipped")
+        if run["failed_interviews"]:
+            print("Failed interviews: " + ", ".join(run["failed_interviews"]))
+        if run["status"] != "completed":
+            sys.exit(1)
+    finally:
+        shutdown_executors()
+        await close_llm_clients()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-evaluate stored interviews in bulk")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Interviews created at or after (ISO date)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Interviews created before (ISO date)")
+    parser.add_argument("--manager", help="Only interviews assigned by this manager id")
+    parser.add_argument("--status", help="Only interviews with this status, e.g. completed")
+    parser.add_argument("--rpm", type=float, default=BULK_REQUESTS_PER_MINUTE, help="LLM requests per minute")
+    parser.add_argument("--tpm", type=float, default=BULK_TOKENS_PER_MINUTE, help="LLM tokens per minute")
+    parser.add_argument("--concurrency", type=int, default=BULK_MAX_CONCURRENCY,
+                        help="Maximum interviews evaluated at the same time")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="Interviews per checkpoint")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted run")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main(args))
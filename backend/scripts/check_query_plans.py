@@ -0,0 +1,48 @@
+"""
+Check that the service layer's hot queries are served by indexes.
+
+    python scripts/check_query_plans.py
+
+Connecting applies the index registry (app/database/indexes.py), then every
+canonical query is explained. Exits with status 1 if any winning plan is a
+collection scan or a registry index is missing (e.g. a unique index that
+could not be built over duplicates), so it can run as a deployment check.
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.indexes import check_query_plans
+from app.database.mongo_db import connect_to_mongo, close_mongo_connection, get_database
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        report = await check_query_plans(get_database())
+    finally:
+        await close_mongo_connection()
+
+    for query in report["queries"]:
+        marker = "COLLSCAN" if query["collscan"] else "ok"
+        print(f"{marker:9} {query['collection']:20} {query['name']:28} {' > '.join(query['stages'])}")
+    if report["missing_indexes"]:
+        print(f"\nIndexes missing or with other options: {', '.join(report['missing_indexes'])}")
+    if report["collscans"]:
+        print(f"\n{len(report['collscans'])} queries scan a whole collection: {', '.join(report['collscans'])}")
+    if report["collscans"] or report["missing_indexes"]:
+        sys.exit(1)
+    print("\nAll queries use an index")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+Standalone evaluation worker.
+
+Processes the durable evaluation job queue outside the API process, so
+evaluation can be scaled independently of the API nodes:
+
+    python scripts/evaluation_worker.py --concurrency 4
+
+Run as many workers as needed; jobs are leased atomically, and the jobs of a
+worker that dies are picked up by the others once their lease expires. This
+is how evaluations are processed in deployment; the API only enqueues them
+(EVALUATION_WORKER_IN_PROCESS=true runs a worker inside the API for local
+development instead).
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.mongo_db import connect_to_mongo, close_mongo_connection
+from app.tasks.evaluation_worker import EvaluationWorker, EVALUATION_WORKER_CONCURRENCY
+from app.utils.executors import shutdown_executors
+from app.utils.llm_client import warm_up_llm_clients, close_llm_clients
+
+
+async def main(concurrency: int):
+    await connect_to_mongo()
+    await warm_up_llm_clients()
+
+    worker = EvaluationWorker(concurrency=concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.create_task(worker.stop()))
+
+    try:
+        await worker.run()
+    finally:
+        shutdown_executors()
+        await close_llm_clients()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run an evaluation worker")
+    parser.add_argument("--concurrency", type=int, default=EVALUATION_WORKER_CONCURRENCY,
+                        help="Evaluation jobs processed at the same time")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main(args.concurrency))
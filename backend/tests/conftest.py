@@ -0,0 +1,12 @@
+import os
+
+# Settings requires these; tests never reach the real services
+for name, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "DATABASE_NAME": "interview_test",
+    "OPENAI_API_KEY": "test",
+    "OPENAI_MODEL": "gpt-4o-mini",
+    "LIVEKIT_API_KEY": "test",
+    "LIVEKIT_API_SECRET": "test",
+}.items():
+    os.environ.setdefault(name, value)
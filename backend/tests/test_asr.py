@@ -0,0 +1,47 @@
+import sys
+from types import ModuleType, SimpleNamespace
+import pytest
+
+asr = pytest.importorskip("app.utils.asr")
+
+
+class FakeWhisperModel:
+    def __init__(self, model_size, device, compute_type, cpu_threads):
+        self.options = {"model_size": model_size, "device": device, "compute_type": compute_type,
+                        "cpu_threads": cpu_threads}
+
+    def transcribe(self, audio, word_timestamps, initial_prompt):
+        words = [SimpleNamespace(word=" Hello", start=0.0, end=0.4, probability=0.9),
+                 SimpleNamespace(word=" world", start=0.5, end=0.9, probability=0.8)]
+        return iter([SimpleNamespace(start=0.0, end=0.9, text=" Hello world", words=words)]), None
+
+
+@pytest.fixture
+def faster_whisper(monkeypatch):
+    module = ModuleType("faster_whisper")
+    module.WhisperModel = FakeWhisperModel
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+
+
+def test_faster_whisper_loads_int8_by_default(faster_whisper):
+    engine = asr.create_asr_engine("faster_whisper", "base", "", 2)
+    assert isinstance(engine, asr.FasterWhisperEngine)
+    assert engine.model.options == {"model_size": "base", "device": "cpu", "compute_type": "int8",
+                                    "cpu_threads": 2}
+
+    result = engine.transcribe("answer.wav")
+    assert result["text"] == " Hello world"
+    assert result["segments"][0]["words"][0] == {"text": "Hello", "start": 0.0, "end": 0.4, "confidence": 0.9}
+
+
+def test_int8_is_rejected_for_whisper_timestamped():
+    # Dynamic quantization would silently leave Whisper's Linear subclass in float32
+    with pytest.raises(ValueError, match="faster_whisper"):
+        asr.create_asr_engine("whisper_timestamped", "base", "int8")
+
+
+def test_unknown_engine_and_compute_type(faster_whisper):
+    with pytest.raises(ValueError, match="Unknown ASR engine"):
+        asr.create_asr_engine("wav2vec", "base")
+    with pytest.raises(ValueError, match="Unsupported compute type"):
+        asr.create_asr_engine("faster_whisper", "base", "int4")
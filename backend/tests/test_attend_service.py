@@ -0,0 +1,242 @@
+import asyncio
+import numpy as np
+import pytest
+
+attend = pytest.importorskip("app.services.attend_service")
+from langchain_community.chat_message_histories import ChatMessageHistory
+from app.services.session_cache import SessionCache
+from app.utils.llm_utils import _build_messages
+
+INTERVIEW = {"_id": "i1", "interview_instructions": {"tech_stacks": ["Python"], "time": "30 minutes"}}
+
+
+class FakeCollection:
+    def __init__(self, events, doc=None):
+        self.events = events
+        self.doc = doc
+        self.updates = []
+
+    async def find_one(self, query):
+        return self.doc
+
+    async def update_one(self, query, update, upsert=False):
+        self.events.append("update started")
+        await asyncio.sleep(0.01)
+        self.updates.append(update)
+        self.events.append("update finished")
+
+
+@pytest.fixture
+def conversations(monkeypatch):
+    """A fresh session cache and a conversations collection that records writes."""
+    conversations = FakeCollection([])
+
+    async def resolve_interview(interview_id):
+        return INTERVIEW
+
+    monkeypatch.setattr(attend, "session_cache", SessionCache(ttl_seconds=60, max_entries=10, max_chars=10**6))
+    monkeypatch.setattr(attend, "get_database", lambda: {"conversations": conversations})
+    monkeypatch.setattr(attend, "resolve_interview", resolve_interview)
+    monkeypatch.setattr(attend, "trigger_turn_evaluation", lambda *args: None)
+    return conversations
+
+
+def make_context(messages=(), question="What is a closure?"):
+    history = ChatMessageHistory()
+    for i, content in enumerate(messages):
+        (history.add_ai_message if i % 2 == 0 else history.add_user_message)(content)
+    return attend.TurnContext("i1", "u1", INTERVIEW, "Time: 30 minutes", history, question, "t1")
+
+
+def test_answer_turn_runs_blocking_stages_off_the_loop(monkeypatch, conversations):
+    events = conversations.events
+    off_loop = []
+    results = {"decode_audio_bytes": np.zeros(1600, dtype=np.int16),
+               "transcribe_speech": "A function that captures its scope."}
+
+    def executor(kind):
+        async def run(func, *args, **kwargs):
+            off_loop.append((kind, func.__name__))
+            return results.get(func.__name__)
+        return run
+
+    async def get_next_question(history, instructions, summary=None):
+        events.append("question started")
+        await asyncio.sleep(0.01)
+        events.append("question finished")
+        return "How would you test it?"
+
+    async def render_audio(phrases):
+        return "/interview/audio/next.mp3"
+
+    monkeypatch.setattr(attend, "AUDIO_DIR", "/tmp")
+    monkeypatch.setattr(attend, "run_in_thread", executor("thread"))
+    monkeypatch.setattr(attend, "run_in_process", executor("process"))
+    monkeypatch.setattr(attend, "get_next_question", get_next_question)
+    monkeypatch.setattr(attend, "TTS_LAZY_AUDIO", False)
+    monkeypatch.setattr(attend, "render_audio", render_audio)
+    conversations.doc = {"conversation": [{"turn_id": "t1", "question": "What is a closure?", "answer_transcript": ""}]}
+
+    response = asyncio.run(attend.attend_interview_service("u1", "i1", b"audio", False))
+
+    assert response == {"ai_question": "How would you test it?", "audio_path": "/interview/audio/next.mp3"}
+    assert ("process", "transcribe_speech") in off_loop
+    assert {("thread", "_write_bytes"), ("thread", "decode_audio_bytes")} <= set(off_loop)
+    # The transcript write overlaps next-question generation
+    assert events[:2] == ["update started", "question started"]
+    answer = conversations.updates[0]["$set"]
+    assert answer["conversation.$.answer_transcript"] == "A function that captures its scope."
+    assert conversations.updates[1]["$push"]["conversation"]["question"] == "How would you test it?"
+
+
+END_OF_STREAM = object()
+
+
+@pytest.fixture
+def streaming(monkeypatch, conversations):
+    """Stream a fixed question; earlier sentences take longer to synthesize than later ones."""
+    deltas = ["Tell me about ", "your last project. ", "How did you", " scale it?"]
+    started = []
+
+    async def stream_next_question(history, instructions, summary=None):
+        for delta in deltas:
+            await asyncio.sleep(0)
+            yield delta
+        started.append(END_OF_STREAM)
+
+    async def synthesize_phrase(text):
+        started.append(text)
+        await asyncio.sleep(0.03 / len(started))
+        return text.encode()
+
+    monkeypatch.setattr(attend, "stream_next_question", stream_next_question)
+    monkeypatch.setattr(attend, "synthesize_phrase", synthesize_phrase)
+    return started
+
+
+def collect(stream):
+    async def main():
+        return [event async for event in stream]
+    return asyncio.run(main())
+
+
+def audio_text(data):
+    return attend.base64.b64decode(data["audio"]).decode()
+
+
+def test_stream_emits_audio_in_sentence_order(streaming):
+    started = streaming
+    ctx = make_context()
+    events = collect(attend.stream_turn(ctx, "u1", "i1", ("It captures its scope.", "/tmp/a.wav", False)))
+
+    names = [name for name, _ in events]
+    assert names[0] == "transcript" and names[-1] == "done"
+    assert "".join(data["text"] for name, data in events if name == "token") == \
+        "Tell me about your last project. How did you scale it?"
+    audio = [data for name, data in events if name == "audio"]
+    assert [data["index"] for data in audio] == [0, 1]
+    assert [audio_text(data) for data in audio] == ["Tell me about your last project.", "How did you scale it?"]
+    # The first sentence is synthesized while the model is still streaming
+    assert started.index("Tell me about your last project.") < started.index(END_OF_STREAM)
+    assert events[-1][1] == {"ai_question": "Tell me about your last project. How did you scale it?"}
+    assert ctx.current_question == events[-1][1]["ai_question"]
+
+
+def test_skipped_answer_streams_the_transition_first(streaming):
+    ctx = make_context()
+    events = collect(attend.stream_attend_interview_service(ctx, "u1", "i1", None, True))
+
+    assert events[0] == ("transcript", {"answer_transcript": attend.SKIP_ANSWER, "skipped": True})
+    assert events[1] == ("token", {"text": f"{attend.SKIP_TRANSITION} "})
+    audio = [data for name, data in events if name == "audio"]
+    assert [data["index"] for data in audio] == [0, 1, 2]
+    assert audio_text(audio[0]) == attend.SKIP_TRANSITION
+    assert events[-1][1]["ai_question"].startswith(attend.SKIP_TRANSITION)
+
+
+def test_closed_stream_cancels_pending_synthesis(streaming):
+    ctx = make_context()
+
+    async def main():
+        stream = attend.stream_turn(ctx, "u1", "i1", ("It captures its scope.", "/tmp/a.wav", False))
+        async for name, _ in stream:
+            if name == "audio":
+                break
+        await stream.aclose()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.sleep(0)
+        return tasks
+
+    assert all(task.done() for task in asyncio.run(main()))
+    # The turn did not finish, so the context is rebuilt next time
+    assert attend.session_cache.get(ctx.key) is None
+
+
+@pytest.fixture
+def rolling(monkeypatch, conversations):
+    monkeypatch.setattr(attend, "CONTEXT_MODE", "rolling")
+    monkeypatch.setattr(attend, "CONTEXT_RECENT_TURNS", 1)
+    monkeypatch.setattr(attend, "SUMMARY_BATCH_TURNS", 1)
+    folded = []
+
+    async def summarize_conversation(summary, messages):
+        folded.append((summary, [m.content for m in messages]))
+        return f"summary of {len(messages)} messages"
+
+    monkeypatch.setattr(attend, "summarize_conversation", summarize_conversation)
+    return folded
+
+
+def test_older_turns_are_folded_into_the_summary(rolling, conversations):
+    ctx = make_context(["q1", "a1", "q2", "a2"])
+    # Nothing is summarized yet, so the full history is sent
+    assert attend.question_context(ctx) == (ctx.history, None)
+
+    async def main():
+        attend.schedule_summary_update(ctx)
+        await ctx.summary_task
+
+    asyncio.run(main())
+    assert rolling == [(None, ["q1", "a1"])]
+    assert conversations.updates == [{"$set": {"context_summary": {"text": "summary of 2 messages", "messages": 2}}}]
+    history, summary = attend.question_context(ctx)
+    assert [m.content for m in history.messages] == ["q2", "a2"]
+    assert summary == "summary of 2 messages"
+
+
+def test_summary_waits_for_a_full_batch(rolling):
+    ctx = make_context(["q1", "a1"])
+    attend.schedule_summary_update(ctx)
+    assert ctx.summary_task is None
+
+
+def test_failed_summary_keeps_turns_verbatim(rolling, monkeypatch):
+    async def summarize_conversation(summary, messages):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(attend, "summarize_conversation", summarize_conversation)
+    ctx = make_context(["q1", "a1", "q2", "a2"])
+    asyncio.run(attend.update_summary(ctx, 2))
+    assert ctx.summary_task is None
+    assert attend.question_context(ctx) == (ctx.history, None)
+
+
+def test_stored_summary_is_restored_only_if_it_matches_the_history(rolling, conversations):
+    turns = [{"question": "q1", "answer_transcript": "a1"}, {"question": "q2", "answer_transcript": ""}]
+    conversations.doc = {"conversation": turns, "context_summary": {"text": "earlier", "messages": 2}}
+    ctx = asyncio.run(attend.load_turn_context("i1", "u1"))
+    assert (ctx.summary_text, ctx.summarized_messages) == ("earlier", 2)
+
+    # The summary covers turns the conversation no longer has
+    conversations.doc["context_summary"]["messages"] = 4
+    attend.session_cache.invalidate(ctx.key)
+    ctx = asyncio.run(attend.load_turn_context("i1", "u1"))
+    assert (ctx.summary_text, ctx.summarized_messages) == (None, 0)
+
+
+def test_summary_is_sent_ahead_of_the_recent_turns():
+    recent = make_context(["q2", "a2"]).history
+    messages = _build_messages(recent, "Time: 30 minutes", "Asked about closures.")
+    assert [m.type for m in messages] == ["system", "system", "ai", "human", "human"]
+    assert "Asked about closures." in messages[1].content
+    assert len(_build_messages(recent, "Time: 30 minutes")) == 4
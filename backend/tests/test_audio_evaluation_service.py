@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+audio_evaluation_service = pytest.importorskip("app.operations.audio_evaluation_service")
+from test_vad import SR, noise, voiced
+
+
+def analyze(samples: np.ndarray) -> dict:
+    return audio_evaluation_service.AudioEvaluationService().analyze_samples(samples, SR)
+
+
+def test_continuous_speech_is_analyzed():
+    result = analyze(voiced(5.0))
+    assert result["status"] == "success"
+    assert result["pause_ratio"] == 0.0
+    assert result["voiced_fraction"] > 0.9
+    assert result["speech_rate"] > 0
+    assert 0 < result["confidence_score"] <= 10
+
+
+def test_silence_has_no_speech():
+    assert analyze(np.zeros(3 * SR, dtype=np.float32))["status"] == "no_speech"
+    assert analyze(np.zeros(10, dtype=np.float32))["status"] == "no_audio"
+
+
+def test_pauses_raise_pause_ratio_and_lower_confidence():
+    fluent = analyze(voiced(4.0))
+    halting = analyze(np.concatenate([voiced(1.0), noise(1.5, 0.0005), voiced(1.0), noise(1.5, 0.0005), voiced(1.0)]))
+    assert halting["status"] == "success"
+    # 3 s of pauses in a 6 s answer, less the hangover around speech
+    assert 0.25 < halting["pause_ratio"] < 0.5
+    assert halting["confidence_score"] < fluent["confidence_score"]
+
+
+def test_int16_samples_match_float_samples():
+    samples = voiced(2.0)
+    pcm = (samples * 32767).astype(np.int16)
+    assert analyze(pcm)["pause_ratio"] == analyze(samples)["pause_ratio"]
+    assert analyze(pcm)["speech_rate"] == pytest.approx(analyze(samples)["speech_rate"], rel=0.05)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+audio_ingest = pytest.importorskip("app.utils.audio_ingest")
+
+
+def test_pcm_conversion_range():
+    pcm = np.array([-32768, 0, 16384, 32767], dtype=np.int16)
+    samples = audio_ingest.pcm16_to_float(pcm)
+    assert samples.dtype == np.float32
+    assert samples[0] == -1.0 and samples[1] == 0.0 and samples[2] == 0.5
+    assert np.array_equal(audio_ingest.pcm_bytes_to_float(pcm.tobytes()), samples)
+
+
+def test_sidecar_round_trip_is_memory_mapped(tmp_path):
+    answer = str(tmp_path / "answer.webm")
+    assert audio_ingest.load_sidecar(answer) is None
+    assert audio_ingest.load_sidecar("") is None
+
+    pcm = (np.arange(1600) % 200 - 100).astype(np.int16)
+    audio_ingest.write_sidecar(answer, pcm)
+    loaded = audio_ingest.load_sidecar(answer)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, pcm)
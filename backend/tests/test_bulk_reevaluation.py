@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+
+bulk = pytest.importorskip("app.operations.bulk_reevaluation_service")
+from app.utils.rate_limit import AdaptiveLimiter, RateBudget
+
+
+def test_interview_query():
+    assert bulk.interview_query({}) is None
+    query = bulk.interview_query({"since": datetime(2025, 1, 1), "status": "completed"})
+    assert query == {"created_at": {"$gte": "2025-01-01T00:00:00"}, "status": "completed"}
+
+
+def test_crashed_run_can_be_resumed():
+    now = datetime.utcnow()
+    assert bulk.run_active({"status": "running", "lease_expires_at": now + timedelta(minutes=1)})
+    # The process holding the run died and its lease expired
+    assert not bulk.run_active({"status": "running", "lease_expires_at": now - timedelta(seconds=1)})
+    # Runs started before runs carried a lease
+    assert not bulk.run_active({"status": "running"})
+    assert not bulk.run_active({"status": "interrupted", "lease_expires_at": None})
+
+
+def test_usage_estimate_and_throttle_detection():
+    requests, tokens = bulk.estimate_usage([{"question": "q" * 40, "answer_transcript": "a" * 360}] * 2)
+    assert requests == 5
+    assert tokens == 200 + 2 * 800
+    assert bulk.is_rate_limited("Error code: 429 - Rate limit reached")
+    assert not bulk.is_rate_limited("invalid api key")
+
+
+class FakeEvaluationService:
+    def __init__(self, events, errors=None):
+        self.events = events
+        self.errors = list(errors or [])
+
+    async def evaluate(self, interview_id, reuse_turn_results=True):
+        self.events.append(("evaluate", interview_id))
+        await asyncio.sleep(0.01)
+        if self.errors:
+            raise RuntimeError(self.errors.pop(0))
+        return {"status": "success", "interview_result": {"technical_scores": {"1": {"overall_score": 80}}}}
+
+
+def make_service(monkeypatch, events, leased_elsewhere=(), previous_status="completed", errors=None):
+    async def acquire_lease(interview_id, user_id, owner):
+        events.append(("lease", interview_id))
+        if interview_id in leased_elsewhere:
+            return None
+        return {"interview_id": interview_id, "status": previous_status}
+
+    async def keep_lease_alive(interview_id, owner):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(bulk, "acquire_lease", acquire_lease)
+    monkeypatch.setattr(bulk, "keep_lease_alive", keep_lease_alive)
+    service = bulk.BulkReevaluationService.__new__(bulk.BulkReevaluationService)
+    service.budget = RateBudget(1e6, 1e9)
+    service.limiter = AdaptiveLimiter(initial=1, maximum=1)
+    service.evaluation_service = FakeEvaluationService(events, errors)
+    return service
+
+
+def evaluate_all(service, interview_ids):
+    async def main():
+        return await asyncio.gather(*(service._evaluate_leased({"interview_id": interview_id, "conversation": []})
+                                      for interview_id in interview_ids))
+    return asyncio.run(main())
+
+
+def test_lease_is_taken_only_when_the_evaluation_starts(monkeypatch):
+    events = []
+    outcomes = evaluate_all(make_service(monkeypatch, events), ["a", "b"])
+
+    # With one slot, b is not leased while a is still evaluating
+    assert events == [("lease", "a"), ("evaluate", "a"), ("lease", "b"), ("evaluate", "b")]
+    assert [outcome for outcome, _ in outcomes] == ["succeeded", "succeeded"]
+    operation = outcomes[0][1]._doc
+    assert outcomes[0][1]._filter["lease_owner"]
+    assert operation["$set"]["lease_owner"] is None
+    assert operation["$set"]["status"] == "completed"
+
+
+def test_interview_leased_elsewhere_is_skipped(monkeypatch):
+    events = []
+    outcomes = evaluate_all(make_service(monkeypatch, events, leased_elsewhere={"a"}), ["a"])
+    assert outcomes == [("skipped", None)]
+    assert ("evaluate", "a") not in events
+
+
+def test_throttled_attempt_is_retried_under_the_same_lease(monkeypatch):
+    events = []
+    service = make_service(monkeypatch, events, errors=["Error code: 429"])
+    outcomes = evaluate_all(service, ["a"])
+    assert events == [("lease", "a"), ("evaluate", "a"), ("evaluate", "a")]
+    assert outcomes[0][0] == "succeeded"
+
+
+def test_failure_keeps_the_previous_result(monkeypatch):
+    events = []
+    service = make_service(monkeypatch, events, errors=["invalid api key"])
+    outcome, operation = evaluate_all(service, ["a"])[0]
+    assert outcome == "failed"
+    assert operation._doc["$set"]["status"] == "completed"
+    assert "interview_result" not in operation._doc["$set"]
+
+    service = make_service(monkeypatch, events, previous_status="in_progress", errors=["invalid api key"])
+    outcome, operation = evaluate_all(service, ["a"])[0]
+    assert operation._doc["$set"]["status"] == "failed"
+    assert operation._doc["$set"]["error"] == "invalid api key"
@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+
+evaluation_cache = pytest.importorskip("app.services.evaluation_cache")
+
+
+def test_key_covers_model_prompt_and_content():
+    key = evaluation_cache.evaluation_key("gpt-4o-mini", "v1", "What is a mutex?", "A lock.")
+    assert key == evaluation_cache.evaluation_key("gpt-4o-mini", "v1", "What is a mutex?", "A lock.")
+    assert key != evaluation_cache.evaluation_key("gpt-4o", "v1", "What is a mutex?", "A lock.")
+    assert key != evaluation_cache.evaluation_key("gpt-4o-mini", "v2", "What is a mutex?", "A lock.")
+    assert key != evaluation_cache.evaluation_key("gpt-4o-mini", "v1", "What is a mutex?", "A lock")
+    # Fields cannot bleed into each other
+    assert (evaluation_cache.evaluation_key("m", "v", "ab", "c")
+            != evaluation_cache.evaluation_key("m", "v", "a", "bc"))
+    assert evaluation_cache.evaluation_key("m", "v", None, None) == evaluation_cache.evaluation_key("m", "v", "", "")
+
+
+def test_disabled_cache_never_touches_the_database():
+    cache = evaluation_cache.EvaluationCache(ttl_seconds=0, max_entries=10)
+    assert not cache.enabled
+    assert asyncio.run(cache.get("key")) is None
+    asyncio.run(cache.set("key", {"score": 1}, "model", "v1"))
+    assert cache.stats() == {"enabled": False, "hits": 0, "misses": 0, "hit_rate": 0.0}
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+
+evaluation_runner = pytest.importorskip("app.services.evaluation_runner")
+
+
+def test_concurrent_callers_share_one_evaluation(monkeypatch):
+    calls = []
+
+    async def fake_evaluate_or_wait(interview_id, user_id, reuse_turn_results):
+        calls.append(interview_id)
+        await asyncio.sleep(0.01)
+        return {"status": "success", "interview_result": {"interview_id": interview_id}}
+
+    monkeypatch.setattr(evaluation_runner, "_evaluate_or_wait", fake_evaluate_or_wait)
+
+    async def main():
+        results = await asyncio.gather(*(evaluation_runner.evaluate_once("a") for _ in range(5)),
+                                       evaluation_runner.evaluate_once("b"))
+        # Finished evaluations leave the in-flight map; a later call runs again
+        assert evaluation_runner._in_flight == {}
+        await evaluation_runner.evaluate_once("a")
+        return results
+
+    results = asyncio.run(main())
+    assert calls == ["a", "b", "a"]
+    assert all(result is results[0] for result in results[:5])
+
+
+def test_cancelled_caller_does_not_cancel_the_evaluation(monkeypatch):
+    finished = []
+
+    async def fake_evaluate_or_wait(interview_id, user_id, reuse_turn_results):
+        await asyncio.sleep(0.02)
+        finished.append(interview_id)
+        return {"status": "success"}
+
+    monkeypatch.setattr(evaluation_runner, "_evaluate_or_wait", fake_evaluate_or_wait)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(evaluation_runner.evaluate_once("a"), 0.005)
+        assert (await evaluation_runner.evaluate_once("a"))["status"] == "success"
+
+    asyncio.run(main())
+    assert finished == ["a"]
+
+
+def test_lease_active():
+    assert evaluation_runner.lease_active({"lease_expires_at": datetime.utcnow() + timedelta(seconds=30)})
+    assert not evaluation_runner.lease_active({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    assert not evaluation_runner.lease_active({"lease_expires_at": None})
+    assert not evaluation_runner.lease_active(None)
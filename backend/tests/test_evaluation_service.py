@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+
+evaluation_service = pytest.importorskip("app.operations.evaluation_service")
+from app.operations.score_evaluation_service import ScoringService
+from app.schemas.evaluation_result_schemas import QuestionEvaluation, WholeInterviewEvaluation
+
+
+class FakeTextEvaluator:
+    async def evaluate_interview(self, qa_pairs):
+        return WholeInterviewEvaluation(
+            questions=[
+                QuestionEvaluation(question_number=i, technical_score=8, depth_score=7, clarity_score=9,
+                                   practical_score=6, feedback="ok", strengths=["a"], improvements=["b"])
+                for i in range(1, len(qa_pairs) + 1)
+            ],
+            strengths="s",
+            improvement_areas="i",
+            combined_feedback="f"
+        )
+
+
+def make_service():
+    # Built without __init__, which would create LLM clients
+    service = evaluation_service.InterviewEvaluationService.__new__(evaluation_service.InterviewEvaluationService)
+    service.evaluation_service = FakeTextEvaluator()
+    service.scoring_service = ScoringService.__new__(ScoringService)
+    return service
+
+
+def test_single_request_reports_every_question():
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    conversation = [{"question": f"q{i}", "answer_transcript": f"a{i}"} for i in range(3)]
+    result = asyncio.run(make_service()._evaluate_single_request("interview", conversation, on_progress))
+
+    assert [event["question"] for event in events] == [1, 2, 3]
+    assert events[0]["result"] == result["technical_scores"]["1"]
+    assert result["technical_scores"]["1"]["overall_score"] == 75.0
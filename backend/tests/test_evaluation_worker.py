@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+evaluation_worker = pytest.importorskip("app.tasks.evaluation_worker")
+from app.services import evaluation_runner
+
+
+class FakeQueue:
+    visibility_seconds = 60
+
+    def __init__(self):
+        self.jobs = [{"_id": "job", "interview_id": "interview", "user_id": "user", "attempts": 1,
+                      "max_attempts": 3}]
+
+    async def acquire(self, worker_id):
+        return self.jobs.pop() if self.jobs else None
+
+    async def extend_lease(self, job):
+        return True
+
+
+def test_run_returns_after_cancelled_jobs_unwound(monkeypatch):
+    events = []
+
+    async def fake_evaluate_or_wait(interview_id, user_id, reuse_turn_results):
+        events.append("started")
+        try:
+            await asyncio.sleep(60)
+        finally:
+            # e.g. releasing a lease: still needs the database
+            await asyncio.sleep(0.01)
+            events.append("unwound")
+
+    monkeypatch.setattr(evaluation_runner, "_evaluate_or_wait", fake_evaluate_or_wait)
+
+    async def main():
+        worker = evaluation_worker.EvaluationWorker(queue=FakeQueue(), concurrency=1, poll_seconds=0.01)
+        run = asyncio.create_task(worker.run())
+        while "started" not in events:
+            await asyncio.sleep(0.001)
+        asyncio.create_task(worker.stop())
+        await run
+        # Only now would the caller close the Mongo client
+        events.append("run returned")
+
+    asyncio.run(main())
+    assert events == ["started", "unwound", "run returned"]
+    assert evaluation_runner._in_flight == {}
+
+
+def test_startup_warns_when_jobs_are_not_picked_up(caplog):
+    class StalledQueue:
+        def __init__(self, stalled):
+            self.stalled = stalled
+
+        async def stalled_jobs(self, older_than_seconds):
+            return self.stalled
+
+    asyncio.run(evaluation_worker.warn_if_no_worker(StalledQueue(0)))
+    assert not caplog.records
+    asyncio.run(evaluation_worker.warn_if_no_worker(StalledQueue(2)))
+    assert "scripts/evaluation_worker.py" in caplog.records[-1].getMessage()
+    assert caplog.records[-1].levelname == "WARNING"
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+
+indexes = pytest.importorskip("app.database.indexes")
+from pymongo.errors import OperationFailure
+
+
+def test_plan_stages_walks_nested_and_sharded_plans():
+    plan = {
+        "stage": "SHARD_MERGE",
+        "shards": [
+            {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}},
+            {"winningPlan": {"stage": "COLLSCAN"}}
+        ]
+    }
+    assert indexes._plan_stages(plan) == ["SHARD_MERGE", "FETCH", "IXSCAN", "COLLSCAN"]
+
+
+def test_enqueue_key_is_unique_only_while_active():
+    jobs = {index.document["name"]: index.document for index in indexes.INDEXES["evaluation_jobs"]}
+    index = jobs["interview_id_user_id_active_unique"]
+    assert index["unique"] is True
+    assert index["partialFilterExpression"] == {"active": True}
+
+
+class FakeCollection:
+    def __init__(self, existing=None, conflicts=()):
+        self.existing = existing or {}
+        self.conflicts = conflicts
+
+    async def create_indexes(self, models):
+        name = models[0].document["name"]
+        if name in self.conflicts:
+            raise OperationFailure("Index already exists with different options", code=self.conflicts[name])
+        self.existing.setdefault(name, {key: value for key, value in models[0].document.items()
+                                        if key in indexes.CHECKED_OPTIONS})
+
+    async def index_information(self):
+        return self.existing
+
+
+class FakeDatabase:
+    def __init__(self, collections):
+        self.collections = collections
+        self.commands = []
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    async def command(self, command):
+        self.commands.append(command)
+
+
+def test_changed_ttl_is_applied_with_collmod():
+    ttl_index = indexes.INDEXES["evaluation_cache"][0].document
+    db = FakeDatabase({"evaluation_cache": FakeCollection(conflicts={ttl_index["name"]: 85})})
+    asyncio.run(indexes.ensure_indexes(db))
+    assert db.commands == [{"collMod": "evaluation_cache",
+                            "index": {"name": ttl_index["name"],
+                                      "expireAfterSeconds": ttl_index["expireAfterSeconds"]}}]
+
+
+def test_index_that_failed_to_build_is_reported_missing():
+    db = FakeDatabase({"evaluation_results": FakeCollection(conflicts={"interview_id_1": 11000})})
+    asyncio.run(indexes.ensure_indexes(db))
+    assert asyncio.run(indexes.missing_indexes(db)) == ["evaluation_results.interview_id_1"]
+
+
+def test_index_with_other_options_is_reported_missing():
+    db = FakeDatabase({"evaluation_results": FakeCollection(existing={"interview_id_1": {}})})
+    asyncio.run(indexes.ensure_indexes(db))
+    # Exists, but not unique
+    assert asyncio.run(indexes.missing_indexes(db)) == ["evaluation_results.interview_id_1"]
@@ -0,0 +1,122 @@
+"""
+Job queue state machine against a real MongoDB.
+
+Runs only when MONGODB_TEST_URL points at a server the tests may write to;
+each test uses a throwaway database.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+
+MONGODB_TEST_URL = os.getenv("MONGODB_TEST_URL")
+if not MONGODB_TEST_URL:
+    pytest.skip("MONGODB_TEST_URL is not set", allow_module_level=True)
+
+motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+from app.database.indexes import INDEXES
+from app.models.evaluation_job_model import EvaluationJobModel
+from app.tasks import job_queue as job_queue_module
+from app.tasks.job_queue import JobQueue
+
+
+def run(scenario, monkeypatch, **queue_options):
+    """Run scenario(queue, collection) on a fresh database with the registry's indexes."""
+    async def main():
+        client = motor_asyncio.AsyncIOMotorClient(MONGODB_TEST_URL)
+        db = client[f"test_job_queue_{uuid.uuid4().hex[:8]}"]
+        monkeypatch.setattr(job_queue_module, "get_database", lambda: db)
+        collection = db[EvaluationJobModel.collection_name]
+        await collection.create_indexes(INDEXES[EvaluationJobModel.collection_name])
+        try:
+            return await scenario(JobQueue(**queue_options), collection)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_enqueues_share_one_job(monkeypatch):
+    async def scenario(queue, collection):
+        jobs = await asyncio.gather(*(queue.enqueue("interview", "user") for _ in range(10)))
+        assert len({job["_id"] for job in jobs}) == 1
+        assert await collection.count_documents({}) == 1
+
+    run(scenario, monkeypatch)
+
+
+def test_full_rescore_wins_when_joining(monkeypatch):
+    async def scenario(queue, collection):
+        await queue.enqueue("interview", "user", reuse_turn_results=True)
+        job = await queue.enqueue("interview", "user", reuse_turn_results=False)
+        assert job["reuse_turn_results"] is False
+
+    run(scenario, monkeypatch)
+
+
+def test_lease_complete_and_requeue(monkeypatch):
+    async def scenario(queue, collection):
+        first = await queue.enqueue("interview", "user")
+        job = await queue.acquire("worker-1")
+        assert job["_id"] == first["_id"]
+        assert job["status"] == EvaluationJobModel.LEASED
+        assert job["attempts"] == 1
+        # Leased jobs are not handed out twice, and enqueue joins them
+        assert await queue.acquire("worker-2") is None
+        assert (await queue.enqueue("interview", "user"))["_id"] == first["_id"]
+
+        await queue.complete(job)
+        done = await collection.find_one({"_id": job["_id"]})
+        assert done["status"] == EvaluationJobModel.COMPLETED
+        assert "active" not in done
+        # A finished interview can be queued again
+        assert (await queue.enqueue("interview", "user"))["_id"] != first["_id"]
+
+    run(scenario, monkeypatch)
+
+
+def test_failures_back_off_then_dead_letter(monkeypatch):
+    async def scenario(queue, collection):
+        await queue.enqueue("interview", "user")
+        job = await queue.acquire("worker-1")
+        assert not await queue.fail(job, "boom")
+
+        retry = await collection.find_one({"_id": job["_id"]})
+        assert retry["status"] == EvaluationJobModel.QUEUED
+        assert retry["available_at"] > datetime.utcnow()
+        # Not available again until the backoff has passed
+        assert await queue.acquire("worker-1") is None
+
+        await collection.update_one({"_id": job["_id"]}, {"$set": {"available_at": datetime.utcnow()}})
+        job = await queue.acquire("worker-1")
+        assert job["attempts"] == 2
+        assert await queue.fail(job, "boom again")
+
+        dead = await collection.find_one({"_id": job["_id"]})
+        assert dead["status"] == EvaluationJobModel.DEAD
+        assert dead["last_error"] == "boom again"
+        assert "active" not in dead
+
+    run(scenario, monkeypatch, max_attempts=2)
+
+
+def test_expired_lease_is_taken_over(monkeypatch):
+    async def scenario(queue, collection):
+        await queue.enqueue("interview", "user")
+        job = await queue.acquire("worker-1")
+        await collection.update_one(
+            {"_id": job["_id"]}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+
+        taken = await queue.acquire("worker-2")
+        assert taken["_id"] == job["_id"]
+        assert taken["worker_id"] == "worker-2"
+        # The first worker lost its lease and can no longer touch the job
+        assert not await queue.extend_lease(job)
+        await queue.complete(job)
+        assert (await collection.find_one({"_id": job["_id"]}))["status"] == EvaluationJobModel.LEASED
+
+    run(scenario, monkeypatch)
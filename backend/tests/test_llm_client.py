@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+
+llm_client = pytest.importorskip("app.utils.llm_client")
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from app.utils.llm_metrics import LLMMetrics
+from app.utils.llm_scheduler import LLMScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Fresh scheduler and metrics, and an OpenAI client that never hits the network."""
+    scheduler = LLMScheduler(6000, 1e9)
+    monkeypatch.setattr(llm_client, "llm_scheduler", scheduler)
+    monkeypatch.setattr(llm_client, "llm_metrics", LLMMetrics())
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))],
+                          llm_output={"token_usage": {"prompt_tokens": 5, "completion_tokens": 1}})
+
+    async def fake_astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for word in ["one ", "two"]:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", fake_agenerate)
+    monkeypatch.setattr(ChatOpenAI, "_astream", fake_astream)
+    return scheduler
+
+
+def make_model():
+    return llm_client.ScheduledChatOpenAI(llm_role="interviewer", model="gpt-4o-mini", api_key="test")
+
+
+def admitted(scheduler) -> int:
+    return sum(values["admitted"] for values in scheduler.stats()["classes"].values())
+
+
+def test_calls_made_while_a_stream_is_open_are_admitted(scheduler):
+    model = make_model()
+
+    async def main():
+        chunks = []
+        async for chunk in model._astream([HumanMessage(content="hi")]):
+            # e.g. a summary update started by the consumer mid-stream
+            assert not llm_client._admitted.get()
+            await model._agenerate([HumanMessage(content="summarize")])
+            chunks.append(chunk.message.content)
+        return chunks
+
+    assert asyncio.run(main()) == ["one ", "two"]
+    assert admitted(scheduler) == 3
+    assert llm_client.llm_metrics.stats()["totals"]["calls"] == 3
+
+
+def test_stream_closed_early_is_recorded(scheduler):
+    model = make_model()
+
+    async def main():
+        stream = model._astream([HumanMessage(content="hi")])
+        await stream.__anext__()
+        # A disconnecting client closes the stream from another task
+        await asyncio.create_task(stream.aclose())
+
+    asyncio.run(main())
+    assert admitted(scheduler) == 1
+    assert llm_client.llm_metrics.stats()["totals"]["calls"] == 1
@@ -0,0 +1,39 @@
+import pytest
+
+llm_metrics = pytest.importorskip("app.utils.llm_metrics")
+
+
+def test_cost_matches_the_longest_model_prefix():
+    # gpt-4o-mini, not gpt-4o
+    assert llm_metrics.estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert llm_metrics.estimate_cost("gpt-4o", 1000, 0) == pytest.approx(0.0025)
+    assert llm_metrics.estimate_cost("gpt-4odd", 1000, 0) is None
+    assert llm_metrics.estimate_cost("unknown-model", 1000, 1000) is None
+
+
+def test_calls_are_aggregated_per_agent_stage_and_model():
+    metrics = llm_metrics.LLMMetrics()
+    with llm_metrics.llm_stage("answer_evaluation"):
+        assert llm_metrics.current_stage() == "answer_evaluation"
+        metrics.record_call("evaluator", llm_metrics.current_stage(), "gpt-4o-mini", latency=0.3, queue_wait=0.1,
+                            prompt_tokens=1000, completion_tokens=200)
+        metrics.record_call("evaluator", llm_metrics.current_stage(), "gpt-4o-mini", latency=45.0, error="timeout")
+        metrics.record_parse_failure("evaluator", "gpt-4o-mini", "invalid json")
+    assert llm_metrics.current_stage() == "unspecified"
+    metrics.record_call("interviewer", "next_question", "unknown-model", latency=1.0, prompt_tokens=10)
+
+    stats = metrics.stats()
+    assert stats["totals"]["calls"] == 3
+    assert stats["totals"]["errors"] == 1
+    assert stats["totals"]["prompt_tokens"] == 1010
+    # Unknown models add tokens but no cost
+    assert stats["totals"]["cost_usd"] == pytest.approx((1000 * 0.15 + 200 * 0.60) / 1_000_000)
+
+    evaluator = next(s for s in stats["series"] if s["agent"] == "evaluator")
+    assert evaluator["stage"] == "answer_evaluation"
+    assert evaluator["parse_failure_rate"] == 0.5
+    assert evaluator["queue_wait_seconds_avg"] == pytest.approx(0.05)
+    assert evaluator["latency_seconds"]["max"] == 45.0
+    assert evaluator["latency_seconds"]["buckets"]["0.5"] == 1
+    assert evaluator["latency_seconds"]["buckets"]["60.0"] == 1
+    assert evaluator["latency_seconds"]["buckets"]["+Inf"] == 0
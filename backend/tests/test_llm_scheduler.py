@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+
+llm_scheduler = pytest.importorskip("app.utils.llm_scheduler")
+from app.utils.llm_scheduler import BULK, LIVE, ON_DEMAND
+
+# 100 requests per second, so refills in tests take milliseconds
+RPM = 6000
+
+
+def test_priority_override_applies_to_the_block():
+    assert llm_scheduler.effective_priority(LIVE) == LIVE
+    with llm_scheduler.llm_priority(BULK):
+        assert llm_scheduler.effective_priority(LIVE) == BULK
+    assert llm_scheduler.effective_priority(ON_DEMAND) == ON_DEMAND
+
+
+def test_waiters_are_admitted_by_priority():
+    async def main():
+        scheduler = llm_scheduler.LLMScheduler(RPM, 1e9)
+        scheduler.requests.level = 0
+        order = []
+
+        async def call(priority):
+            await scheduler.acquire(priority, 10)
+            order.append(priority)
+
+        tasks = [asyncio.create_task(call(priority)) for priority in (BULK, ON_DEMAND, BULK, LIVE)]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["classes"]["bulk"]["queue_depth"] == 2
+        await asyncio.gather(*tasks)
+        return order, scheduler.stats()["classes"]
+
+    order, classes = asyncio.run(main())
+    assert order == [LIVE, ON_DEMAND, BULK, BULK]
+    assert classes["bulk"]["admitted"] == 2
+    assert classes["bulk"]["queue_depth"] == 0
+    assert classes["bulk"]["wait_seconds_max"] >= classes["live"]["wait_seconds_max"] > 0
+
+
+def test_live_reserve_is_kept_from_lower_classes():
+    async def main():
+        scheduler = llm_scheduler.LLMScheduler(RPM, 1e9, live_reserve=0.5)
+        # Less than the reserve is left: about 0.2 s of refill short of it
+        scheduler.requests.level = RPM * 0.5 - 20
+        assert await asyncio.wait_for(scheduler.acquire(LIVE, 10), 0.05) < 0.05
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.acquire(BULK, 10), 0.05)
+        # The cancelled waiter no longer blocks the queue
+        await asyncio.wait_for(scheduler.acquire(LIVE, 10), 0.05)
+        return scheduler.stats()["classes"]
+
+    classes = asyncio.run(main())
+    assert classes["live"]["admitted"] == 2
+    assert classes["bulk"]["admitted"] == 0
+    assert classes["bulk"]["queue_depth"] == 0
+
+
+def test_usage_correction_and_disabled_scheduler():
+    async def main():
+        scheduler = llm_scheduler.LLMScheduler(RPM, 1000)
+        await scheduler.acquire(ON_DEMAND, 100)
+        scheduler.record_usage(estimated=100, actual=400)
+        assert scheduler.tokens.level == pytest.approx(600, abs=5)
+
+        disabled = llm_scheduler.LLMScheduler(RPM, 1000, enabled=False)
+        disabled.requests.level = 0
+        assert await disabled.acquire(BULK, 10**6) == 0.0
+
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import asyncio
+import gc
+import pytest
+
+plan_tasks = pytest.importorskip("app.tasks.plan_tasks")
+
+
+def test_precompute_runs_to_completion_in_background(monkeypatch):
+    finished = []
+
+    async def precompute(interview_id):
+        await asyncio.sleep(0.01)
+        # Only the scheduler's reference would be left without _background_tasks
+        gc.collect()
+        await asyncio.sleep(0.01)
+        finished.append(interview_id)
+        return True
+
+    monkeypatch.setattr(plan_tasks.plan_task, "precompute", precompute)
+
+    async def main():
+        await plan_tasks.trigger_plan_precompute("interview")
+        assert len(plan_tasks._background_tasks) == 1
+        await asyncio.gather(*plan_tasks._background_tasks)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert finished == ["interview"]
+    assert plan_tasks._background_tasks == set()
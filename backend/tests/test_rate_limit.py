@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+rate_limit = pytest.importorskip("app.utils.rate_limit")
+from app.utils.rate_limit import AdaptiveLimiter, RateBudget, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # Only the module's clock; the event loop keeps the real one
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(60, period=60)
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(10) == pytest.approx(10)
+
+    clock.now = 5
+    assert bucket.wait_time(10) == pytest.approx(5)
+    clock.now = 1000
+    # Never refills above its capacity
+    bucket.take(0)
+    assert bucket.level == 60
+
+
+def test_bucket_reserve_and_oversized_work(clock):
+    bucket = TokenBucket(100, period=100)
+    bucket.take(85)
+    assert bucket.wait_time(10) == 0
+    # 10% of the capacity is held back for higher-priority work
+    assert bucket.wait_time(10, reserve=0.1) == pytest.approx(5)
+    # Work larger than the bucket runs once it is full instead of never
+    assert bucket.wait_time(500) == pytest.approx(85)
+
+
+def test_budget_waits_for_the_scarcer_bucket(clock, monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+        clock.now += delay
+
+    monkeypatch.setattr(rate_limit, "asyncio", SimpleNamespace(sleep=fake_sleep, Lock=asyncio.Lock))
+    budget = RateBudget(requests_per_minute=60, tokens_per_minute=600)
+
+    async def main():
+        await budget.acquire(requests=1, tokens=600)
+        await budget.acquire(requests=1, tokens=300)
+
+    asyncio.run(main())
+    # The requests bucket has room; the tokens bucket needs 30 s for 300 tokens
+    assert delays == [pytest.approx(30)]
+
+
+def test_limiter_grows_on_success_and_halves_on_throttle():
+    async def main():
+        limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=5)
+        for _ in range(4):
+            await limiter.on_success()
+        assert limiter.limit == 5
+        for _ in range(10):
+            await limiter.on_success()
+        assert limiter.limit == 5
+
+        await limiter.on_throttle()
+        assert limiter.limit == 2
+        await limiter.on_throttle()
+        await limiter.on_throttle()
+        assert limiter.limit == 1
+
+    asyncio.run(main())
+
+
+def test_limiter_bounds_concurrency():
+    async def main():
+        limiter = AdaptiveLimiter(initial=2)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
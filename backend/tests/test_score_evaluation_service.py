@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+score_evaluation_service = pytest.importorskip("app.operations.score_evaluation_service")
+
+TECHNICAL_SCORES = {
+    "1": {"technical_score": 8, "depth_score": 6, "clarity_score": 7, "practical_score": 9, "overall_score": 75,
+          "strengths": ["clear"], "improvements": ["depth"], "feedback": "good"},
+    "2": {"technical_score": 6, "depth_score": 8, "clarity_score": 9, "practical_score": 7, "overall_score": 65,
+          "strengths": ["clear", "fast"], "improvements": [], "feedback": "ok"},
+}
+
+
+class FakeSummaryService:
+    def __init__(self, model_name="gpt-4o-mini"):
+        self.llm = SimpleNamespace(model_name=model_name)
+        self.calls = 0
+
+    async def summarize_strengths(self, strengths):
+        self.calls += 1
+        return ", ".join(strengths)
+
+    async def summarize_improvements(self, improvements):
+        return ", ".join(improvements)
+
+    async def summarize_feedback(self, feedback):
+        return feedback
+
+    async def summarize_all(self, strengths, improvements, feedback):
+        self.calls += 1
+        return {"strengths": "all", "improvement_areas": "all", "combined_feedback": "all"}
+
+
+def aggregate(summary_service, previous=None):
+    service = score_evaluation_service.ScoringService.__new__(score_evaluation_service.ScoringService)
+    service.summary_service = summary_service
+    return asyncio.run(service.aggregate(TECHNICAL_SCORES, previous))
+
+
+def test_scores_and_summaries():
+    result = aggregate(FakeSummaryService())
+    assert result["overall_score"] == 70.0
+    assert result["criteria_scores"] == {"technical_score": 70.0, "depth_score": 70.0,
+                                         "clarity_score": 80.0, "practical_score": 80.0}
+    assert result["strengths"] == "clear, fast"
+
+
+def test_unchanged_inputs_reuse_summaries():
+    first = aggregate(FakeSummaryService())
+    summaries = FakeSummaryService()
+    second = aggregate(summaries, previous=first)
+    assert summaries.calls == 0
+    assert second["summary_input_hash"] == first["summary_input_hash"]
+
+
+def test_model_prompt_or_mode_change_recomputes(monkeypatch):
+    first = aggregate(FakeSummaryService())
+
+    summaries = FakeSummaryService("gpt-4o")
+    aggregate(summaries, previous=first)
+    assert summaries.calls == 1
+
+    monkeypatch.setattr(score_evaluation_service, "SUMMARY_PROMPT_VERSION", "2")
+    summaries = FakeSummaryService()
+    aggregate(summaries, previous=first)
+    assert summaries.calls == 1
+    monkeypatch.undo()
+
+    monkeypatch.setattr(score_evaluation_service, "SUMMARY_MODE", "single_request")
+    summaries = FakeSummaryService()
+    assert aggregate(summaries, previous=first)["strengths"] == "all"
+    assert summaries.calls == 1
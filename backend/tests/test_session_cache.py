@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+import pytest
+
+session_cache_module = pytest.importorskip("app.services.session_cache")
+from app.services.session_cache import SessionCache
+
+
+class Session:
+    def __init__(self, size: int):
+        self.size = size
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(session_cache_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_setdefault_keeps_the_live_entry(clock):
+    cache = SessionCache(ttl_seconds=60, max_entries=10, max_chars=1000)
+    first = Session(10)
+    assert cache.setdefault(("i1", "u1"), first) is first
+    assert cache.setdefault(("i1", "u1"), Session(10)) is first
+    assert cache.get(("i1", "u1")) is first
+
+
+def test_entries_expire_after_inactivity(clock):
+    cache = SessionCache(ttl_seconds=60, max_entries=10, max_chars=1000)
+    session = cache.setdefault(("i1", "u1"), Session(10))
+
+    clock.now = 50
+    assert cache.get(("i1", "u1")) is session
+    # Access refreshed the entry
+    clock.now = 100
+    assert cache.get(("i1", "u1")) is session
+    clock.now = 161
+    assert cache.get(("i1", "u1")) is None
+    assert cache._total_chars == 0
+
+
+def test_least_recently_used_is_evicted_by_count(clock):
+    cache = SessionCache(ttl_seconds=60, max_entries=2, max_chars=1000)
+    cache.setdefault("a", Session(1))
+    cache.setdefault("b", Session(1))
+    cache.get("a")
+    cache.setdefault("c", Session(1))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_touch_tracks_growth_and_evicts_by_size(clock):
+    cache = SessionCache(ttl_seconds=60, max_entries=10, max_chars=100)
+    old = cache.setdefault("old", Session(40))
+    new = cache.setdefault("new", Session(40))
+
+    # The chat history of "new" grew past the size bound
+    new.size = 70
+    cache.touch("new", new)
+    assert cache.get("old") is None
+    assert cache.get("new") is new
+    assert cache._total_chars == 70
+
+    # A stale object for the key does not change the accounting
+    cache.touch("new", old)
+    assert cache._total_chars == 70
+
+
+def test_invalidate_interview_drops_all_its_sessions(clock):
+    cache = SessionCache(ttl_seconds=60, max_entries=10, max_chars=1000)
+    for key in [("i1", "u1"), ("i1", "u2"), ("i2", "u1")]:
+        cache.setdefault(key, Session(5))
+
+    cache.invalidate_interview("i1")
+    assert cache.get(("i1", "u1")) is None
+    assert cache.get(("i1", "u2")) is None
+    assert cache.get(("i2", "u1")) is not None
+    assert cache._total_chars == 5
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = SessionCache(ttl_seconds=0, max_entries=10, max_chars=1000)
+    session = Session(5)
+    assert cache.setdefault("a", session) is session
+    assert cache.get("a") is None
@@ -0,0 +1,175 @@
+import asyncio
+import numpy as np
+import pytest
+
+session_service = pytest.importorskip("app.services.session_service")
+
+SAMPLE_RATE = session_service.SAMPLE_RATE
+
+
+def pcm(seconds: float, amplitude: int = 3000) -> bytes:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16).tobytes()
+
+
+def test_find_cut_picks_quiet_frame():
+    samples = np.full(SAMPLE_RATE, 0.5, dtype=np.float32)
+    quiet = SAMPLE_RATE - 8000
+    samples[quiet:quiet + 320] = 0.0
+    assert session_service.find_cut(samples) == quiet
+
+
+def test_failed_window_is_decoded_by_finish(monkeypatch):
+    calls = []
+
+    async def transcribe(self, start, end):
+        calls.append((start, end))
+        if len(calls) == 1:
+            raise RuntimeError("decoder crashed")
+        return "full answer"
+
+    monkeypatch.setattr(session_service.AnswerBuffer, "_transcribe", transcribe)
+
+    async def scenario():
+        buffer = session_service.AnswerBuffer()
+        buffer.append(pcm(session_service.PARTIAL_WINDOW_SECONDS + 1))
+        assert buffer.window_ready()
+
+        async def on_partial(text):
+            pass
+
+        buffer.start_window(on_partial)
+        await buffer._task
+        # The failed window is not committed and no more windows are started
+        assert buffer.committed == 0
+        assert not buffer.window_ready()
+        return await buffer.finish(), buffer
+
+    transcript, buffer = asyncio.run(scenario())
+    assert transcript == "full answer"
+    assert calls[-1] == (0, len(buffer.pcm))
+
+
+def test_successful_window_commits_after_transcription(monkeypatch):
+    async def transcribe(self, start, end):
+        return f"{start}-{end}"
+
+    monkeypatch.setattr(session_service.AnswerBuffer, "_transcribe", transcribe)
+    partials = []
+
+    async def scenario():
+        buffer = session_service.AnswerBuffer()
+        buffer.append(pcm(session_service.PARTIAL_WINDOW_SECONDS + 1))
+
+        async def on_partial(text):
+            partials.append(text)
+
+        buffer.start_window(on_partial)
+        assert buffer.committed == 0
+        await buffer._task
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert buffer.committed > 0
+    assert partials == [f"0-{buffer.committed}"]
+
+
+def test_append_caps_answer_length(monkeypatch):
+    monkeypatch.setattr(session_service, "MAX_ANSWER_SECONDS", 1.0)
+    buffer = session_service.AnswerBuffer()
+    buffer.append(pcm(0.8))
+    buffer.append(pcm(0.8))
+    assert len(buffer.pcm) == SAMPLE_RATE * session_service.SAMPLE_WIDTH
+    assert buffer.truncated
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append((message["event"], message["data"]))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """A session whose turns and transcription are stubbed; records what each turn received."""
+    turns = []
+
+    async def load_turn_context(interview_id, user_id):
+        return "ctx"
+
+    async def stream_turn(ctx, user_id, interview_id, answer):
+        turns.append(answer)
+        yield "token", {"text": "Next question?"}
+        yield "done", {"ai_question": "Next question?"}
+
+    async def run_in_thread(func, *args):
+        pass
+
+    async def transcribe(self, start, end):
+        return f"words {start}-{end}"
+
+    monkeypatch.setattr(session_service, "load_turn_context", load_turn_context)
+    monkeypatch.setattr(session_service, "stream_turn", stream_turn)
+    monkeypatch.setattr(session_service, "run_in_thread", run_in_thread)
+    monkeypatch.setattr(session_service.AnswerBuffer, "_transcribe", transcribe)
+    monkeypatch.setattr(session_service, "PARTIAL_WINDOW_SECONDS", 1.0)
+    websocket = FakeWebSocket()
+    return session_service.InterviewSession(websocket, "ctx", "i1", "u1"), websocket, turns
+
+
+def text(message_type):
+    return {"type": "websocket.receive", "text": f'{{"type": "{message_type}"}}'}
+
+
+def test_session_lifecycle(session):
+    interview, websocket, turns = session
+
+    async def scenario():
+        await interview.handle(text("begin"))
+        for _ in range(3):
+            await interview.handle({"type": "websocket.receive", "bytes": pcm(0.6)})
+            await asyncio.sleep(0)
+        await interview.handle(text("end_answer"))
+        await interview.handle(text("skip"))
+
+    asyncio.run(scenario())
+
+    assert turns[0] is None
+    user_answer, audio_path, skipped = turns[1]
+    assert not skipped and audio_path.endswith(".wav")
+    # Partial windows were sent while speaking; the tail completes the answer
+    partials = [data["text"] for event, data in websocket.sent if event == "partial_transcript"]
+    assert partials and partials[0].startswith("words 0-")
+    assert user_answer.startswith(partials[-1]) and user_answer != partials[-1]
+    assert turns[2] == (session_service.SKIP_ANSWER, "", True)
+    assert [event for event, _ in websocket.sent].count("done") == 3
+
+
+def test_answer_without_speech_is_a_skip(session, monkeypatch):
+    interview, websocket, turns = session
+
+    async def transcribe(self, start, end):
+        return ""
+
+    monkeypatch.setattr(session_service.AnswerBuffer, "_transcribe", transcribe)
+
+    async def scenario():
+        await interview.handle({"type": "websocket.receive", "bytes": pcm(0.5)})
+        await interview.handle(text("end_answer"))
+
+    asyncio.run(scenario())
+    user_answer, audio_path, skipped = turns[0]
+    assert (user_answer, skipped) == (session_service.SKIP_ANSWER, True)
+    # The recording is still kept for evaluation
+    assert audio_path.endswith(".wav")
+
+
+def test_unknown_message_is_reported(session):
+    interview, websocket, turns = session
+    asyncio.run(interview.handle(text("pause")))
+    asyncio.run(interview.handle({"type": "websocket.receive", "text": "not json"}))
+    assert websocket.sent == [("error", {"detail": "Unknown message type: pause"}),
+                              ("error", {"detail": "Unknown message type: None"})]
+    assert turns == []
@@ -0,0 +1,39 @@
+import pytest
+
+tts = pytest.importorskip("app.utils.tts")
+
+
+class FakeEngine(tts.TTSEngine):
+    name = "fake"
+
+    def __init__(self):
+        super().__init__("test")
+        self.calls = []
+
+    def synthesize(self, text: str) -> bytes:
+        self.calls.append(text)
+        return text.encode("utf-8")
+
+
+def test_render_synthesizes_each_phrase_once(tmp_path):
+    engine = FakeEngine()
+    cache = tts.AudioCache(engine, str(tmp_path))
+
+    first = cache.render(["Okay.", "What is a closure?"])
+    second = cache.render(["Okay.", "What is a mutex?"])
+
+    assert first != second
+    assert engine.calls == ["Okay.", "What is a closure?", "What is a mutex?"]
+    with open(cache.path(first), "rb") as f:
+        assert f.read() == b"Okay.What is a closure?"
+
+
+def test_phrases_are_persisted_for_other_processes(tmp_path):
+    phrases = ["Let's move on.", "Explain recursion."]
+    filename = tts.AudioCache(FakeEngine(), str(tmp_path)).remember(phrases)
+
+    # A fresh cache over the same directory, e.g. another worker or after a restart
+    other = tts.AudioCache(FakeEngine(), str(tmp_path))
+    assert other.phrases(filename) == phrases
+    assert other.phrases("unknown.mp3") is None
+    assert other.render(other.phrases(filename)) == filename
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+vad = pytest.importorskip("app.utils.vad")
+
+SR = 16000
+
+
+def voiced(seconds: float, amplitude: float = 0.2) -> np.ndarray:
+    """Harmonic signal with a syllable-rate envelope, like sustained speech."""
+    t = np.arange(int(seconds * SR)) / SR
+    tone = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (amplitude * envelope * tone / 2).astype(np.float32)
+
+
+def noise(seconds: float, level: float) -> np.ndarray:
+    return (level * np.random.default_rng(0).standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_continuous_speech_is_speech():
+    samples = voiced(3.0)
+    assert vad.speech_mask(samples, SR).mean() > 0.95
+    compacted = vad.compact_speech(samples, SR)
+    assert compacted is not None
+    assert len(compacted) >= 0.9 * len(samples)
+
+
+def test_continuous_speech_with_noise_is_speech():
+    samples = voiced(3.0) + noise(3.0, 0.01)
+    assert vad.speech_mask(samples, SR).mean() > 0.95
+    assert vad.compact_speech(samples, SR) is not None
+
+
+def test_silence_has_no_speech():
+    samples = np.zeros(3 * SR, dtype=np.float32)
+    assert not vad.speech_mask(samples, SR).any()
+    assert vad.speech_segments(samples, SR) == []
+    assert vad.compact_speech(samples, SR) is None
+
+
+def test_low_noise_floor_has_no_speech():
+    assert vad.compact_speech(noise(3.0, 0.0005), SR) is None
+
+
+def test_long_pause_is_shortened():
+    silence = noise(2.0, 0.0005)
+    samples = np.concatenate([voiced(1.0), silence, voiced(1.0)])
+
+    segments = vad.speech_segments(samples, SR)
+    assert len(segments) == 2
+    compacted = vad.compact_speech(samples, SR)
+    # Both speech regions kept, the 2 s pause cut down to the join gap
+    assert 2.0 * SR <= len(compacted) < 3.2 * SR
+
+
+def test_short_pause_is_kept():
+    samples = np.concatenate([voiced(1.0), noise(0.5, 0.0005), voiced(1.0)])
+    assert len(vad.speech_segments(samples, SR)) == 1
+
+
+def test_short_audio_falls_back_to_full_signal():
+    # Less speech than VAD_MIN_SPEECH_SECONDS, but the recording is not silent
+    samples = voiced(0.2)
+    compacted = vad.compact_speech(samples, SR)
+    assert compacted is not None
+    assert len(compacted) == len(samples)
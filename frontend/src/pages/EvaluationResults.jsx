@@ -27,7 +27,7 @@ const EvaluationResults = () => {
       console.log('Evaluation results data:', data);
 
       // Check evaluation status
-      if (data.status === 'in_progress') {
+      if (data.status === 'in_progress' || response.status === 202) {
         setError('Evaluation is currently in progress. Please wait a few moments and refresh the page.');
         setResults(null);
       } else if (data.status === 'failed') {
@@ -612,9 +612,25 @@ const InterviewRoom = () => {
         throw new Error('Evaluation failed');
       }
 
-      const evalData = await evalResponse.json();
+      let evalData = await evalResponse.json();
       console.log('Evaluation response:', evalData);
 
+      // 202 Accepted: the evaluation was queued; follow its progress until done
+      if (evalResponse.status === 202) {
+        evalData = await new Promise((resolve, reject) => {
+          const events = new EventSource(`http://192.168.5.99:8000${evalData.events_url}`);
+          events.addEventListener('done', (event) => {
+            events.close();
+            resolve(JSON.parse(event.data));
+          });
+          events.addEventListener('error', () => {
+            events.close();
+            reject(new Error('Lost connection while waiting for evaluation'));
+          });
+        });
+        console.log('Evaluation finished:', evalData);
+      }
+
       // Check if evaluation was successful
       if (evalData.status === 'completed' || evalData.interview_result) {
         // Evaluation completed successfully